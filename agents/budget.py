@@ -0,0 +1,84 @@
+"""Token and byte budget of each agent's session payloads.
+
+Counts tokens with tiktoken when it is installed and falls back to a
+four-characters-per-token estimate otherwise.
+"""
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - depends on the environment
+    tiktoken = None
+
+from handlers import codec
+
+# Tokenizer used by the gpt-4o family of Realtime models
+TOKENIZER_ENCODING = "o200k_base"
+
+if tiktoken is not None:
+    TOKEN_COUNTER = f"tiktoken {TOKENIZER_ENCODING}"
+    _encoding = tiktoken.get_encoding(TOKENIZER_ENCODING)
+
+    def count_tokens(text: str) -> int:
+        return len(_encoding.encode(text))
+
+else:
+    TOKEN_COUNTER = "estimate (4 chars/token)"
+
+    def count_tokens(text: str) -> int:
+        return (len(text) + 3) // 4
+
+
+def _measure(text: str) -> dict:
+    return {"tokens": count_tokens(text), "bytes": len(text.encode("utf-8"))}
+
+
+def session_payload_budget(agent_manager) -> dict:
+    """Per-agent token/byte counts for instructions, tools and the transfer tool.
+
+    Also reports how the agent's prompt is delivered ("delivery", see
+    AgentManager.delivery_mode), the serialized size of what
+    initialize_session sends ("init_bytes") and of the in-session switch update.
+    """
+    report = {}
+    for name, agent in agent_manager.agents.items():
+        tools = [tool for tool in agent["tools"] if tool["name"] != "transferAgents"]
+        transfer = [tool for tool in agent["tools"] if tool["name"] == "transferAgents"]
+        payloads = agent_manager.session_payloads[name]
+        init = payloads["session_update"] + (payloads["context_message"] or "")
+        report[name] = {
+            "delivery": agent_manager.delivery_mode(name),
+            "instructions": _measure(agent["instructions"]),
+            "tools": _measure(codec.dumps(tools) if tools else ""),
+            "transfer_tool": _measure(codec.dumps(transfer) if transfer else ""),
+            "init_bytes": len(init.encode("utf-8")),
+            "switch_bytes": len(payloads["switch_update"].encode("utf-8")),
+        }
+    return report
+
+
+def print_session_payload_report(agent_manager):
+    """Print session_payload_budget as a table."""
+    report = session_payload_budget(agent_manager)
+    print(f"Session payload budget (tokens: {TOKEN_COUNTER})")
+    print(
+        f"{'agent':22s} {'delivery':8s} {'instr tok':>9s} {'instr B':>8s} {'tools tok':>9s} "
+        f"{'tools B':>8s} {'xfer tok':>8s} {'xfer B':>7s} {'init B':>7s} {'switch B':>8s}"
+    )
+    for name, row in report.items():
+        print(
+            f"{name:22s} {row['delivery']:8s} {row['instructions']['tokens']:>9,} {row['instructions']['bytes']:>8,} "
+            f"{row['tools']['tokens']:>9,} {row['tools']['bytes']:>8,} "
+            f"{row['transfer_tool']['tokens']:>8,} {row['transfer_tool']['bytes']:>7,} "
+            f"{row['init_bytes']:>7,} {row['switch_bytes']:>8,}"
+        )
+    twice = [
+        name
+        for name, payloads in agent_manager.session_payloads.items()
+        if payloads["context_message"]
+    ]
+    if twice:
+        print(
+            f"Instructions are sent twice per session for {', '.join(twice)} "
+            "(session.update and a system item); SESSION_PAYLOAD_MODE=dedup "
+            "sends them once."
+        )
@@ -6,6 +6,7 @@ from config import CURRENT_OFFER_ROLE
 from config import CURRENT_OFFER_SALARY
 from config import CURRENT_OFFER_EQUITY
 from config import CURRENT_OFFER_SIGNING_BONUS
+from config import OPENAI_AUDIO_FORMAT
 
 ALLOWED_CAREER_FIELDS = [
     "role",
@@ -24,6 +25,7 @@ ALLOWED_CAREER_FIELDS = [
 
 # Base agent definitions
 # First, define base agents without downstream relationships
+# Tool schemas live in tools/__init__.py and are attached by AgentManager
 MAIN_AGENT = {
     "name": "main_agent",
     "publicDescription": "The initial agent that greets the user, does authentication and routes them to the correct downstream agent.",
@@ -39,11 +41,10 @@ Let the user know you're about to transfer them before doing so.
 """,
     "voice": VOICE,
     "modalities": ["text", "audio"],
-    "input_audio_format": "g711_ulaw",
-    "output_audio_format": "g711_ulaw",
+    "input_audio_format": OPENAI_AUDIO_FORMAT,
+    "output_audio_format": OPENAI_AUDIO_FORMAT,
     "turn_detection": {"type": "server_vad"},
     "input_audio_transcription": {"model": "whisper-1"},
-    "tools": [],
 }
 
 AUTHENTICATION_AGENT = {
@@ -138,8 +139,8 @@ AUTHENTICATION_AGENT = {
             "instructions": [
                 "Call verifyRecruiterCredentials",
                 "Process verification result",
-                "if verified (return True), transfer to recruiterInfo agent",
-                "if not verified (return False), answer 'I'm sorry, I'm not able to verify your identities. Please try again.'"
+                "if verified (\"verified\": true), transfer to recruiterInfo agent",
+                "if not verified (\"verified\": false), answer 'I'm sorry, I'm not able to verify your identities. Please try again.'"
             ],
             "transitions": [{
                 "next_step": "transferAgents",
@@ -150,35 +151,10 @@ AUTHENTICATION_AGENT = {
     """,
     "voice": VOICE,
     "modalities": ["text", "audio"],
-    "input_audio_format": "g711_ulaw",
-    "output_audio_format": "g711_ulaw",
+    "input_audio_format": OPENAI_AUDIO_FORMAT,
+    "output_audio_format": OPENAI_AUDIO_FORMAT,
     "turn_detection": {"type": "server_vad"},
     "input_audio_transcription": {"model": "whisper-1"},
-    "tools": [
-        {
-            "type": "function",
-            "name": "verifyRecruiterCredentials",
-            "description": "Verifies the recruiter's credentials against our database",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "fullName": {
-                        "type": "string",
-                        "description": "Recruiter's full name",
-                    },
-                    "company": {
-                        "type": "string",
-                        "description": "Recruiting company name",
-                    },
-                    "position": {
-                        "type": "string",
-                        "description": "Job position being discussed",
-                    },
-                },
-                "required": ["fullName", "company", "position"],
-            },
-        }
-    ],
 }
 
 INFO_DESK_AGENT = {
@@ -241,79 +217,10 @@ INFO_DESK_AGENT = {
     """,
     "voice": VOICE,
     "modalities": ["text", "audio"],
-    "input_audio_format": "g711_ulaw",
-    "output_audio_format": "g711_ulaw",
+    "input_audio_format": OPENAI_AUDIO_FORMAT,
+    "output_audio_format": OPENAI_AUDIO_FORMAT,
     "turn_detection": {"type": "server_vad"},
     "input_audio_transcription": {"model": "whisper-1"},
-    "tools": [
-        # The above code defines two functions in Python:
-        {
-            "type": "function",
-            "name": "lookupCareerInfo",
-            "description": "Retrieves career aspirations, workexperience, education, skills, and availability for verified recruiters",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "requestedFields": {
-                        "type": "array",
-                        "items": {
-                            "type": "string",
-                            "enum": ALLOWED_CAREER_FIELDS,
-                        },
-                        "description": "List of information fields being requested",
-                    },
-                },
-                "required": ["requestedFields"],
-            },
-        },
-        {
-            "type": "function",
-            "name": "logRecruiterRequest",
-            "description": "Logs the recruiter's and the potential role information request to a text file",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "recruiterName": {
-                        "type": "string",
-                        "description": "Verified recruiter's name",
-                    },
-                    "company": {
-                        "type": "string",
-                        "description": "The company the recruiter is representing",
-                    },
-                    "potentialRole": {
-                        "type": "string",
-                        "description": "The role the recruiter is looking for",
-                    },
-                    "potentialRoleDescription": {
-                        "type": "string",
-                        "description": "A description of the role the recruiter is looking for",
-                    },
-                    "expectedSalaryRange": {
-                        "type": "string",
-                        "description": "The expected salary range the recruiter is looking for",
-                    },
-                    "expectedLocation": {
-                        "type": "string",
-                        "description": "The location the recruiter is looking for",
-                    },
-                    "sponsorVisa": {
-                        "type": "boolean",
-                        "description": "Whether the company is sponsoring a visa",
-                    },
-                    "interviewTimeline": {
-                        "type": "string",
-                        "description": "The timeline for the interview process",
-                    },
-                    "interviewProcess": {
-                        "type": "string",
-                        "description": "The interview process for the role",
-                    },
-                },
-                "required": ["recruiterName", "company", "potentialRole"],
-            },
-        },
-    ],
 }
 
 SCHEDULING_AGENT = {
@@ -376,99 +283,10 @@ SCHEDULING_AGENT = {
     """,
     "voice": VOICE,
     "modalities": ["text", "audio"],
-    "input_audio_format": "g711_ulaw",
-    "output_audio_format": "g711_ulaw",
+    "input_audio_format": OPENAI_AUDIO_FORMAT,
+    "output_audio_format": OPENAI_AUDIO_FORMAT,
     "turn_detection": {"type": "server_vad"},
     "input_audio_transcription": {"model": "whisper-1"},
-    "tools": [
-        {
-            "type": "function",
-            "name": "returnAvailableDateTime",
-            "description": "Returns available dates/times for the next two weeks.",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "suggestedDates": {
-                        "type": "array",
-                        "items": {
-                            "type": "string",
-                            "description": "Date and time in ISO format",
-                        },
-                        "description": "Optional list of interview dates/times suggested",
-                    },
-                    "duration": {
-                        "type": "number",
-                        "description": "Meeting duration in minutes",
-                    },
-                    "timeZone": {
-                        "type": "string",
-                        "description": "Meeting time zone",
-                    },
-                },
-                "required": ["duration", "timeZone"],
-            },
-        },
-        {
-            "type": "function",
-            "name": "scheduleMeeting",
-            "description": "Creates a calendar invite for the meeting",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "dateTime": {
-                        "type": "string",
-                        "description": "Meeting start time in ISO format",
-                    },
-                    "duration": {
-                        "type": "number",
-                        "description": "Meeting duration in minutes",
-                    },
-                    "format": {
-                        "type": "string",
-                        "enum": ["video", "phone"],
-                        "description": "Meeting format",
-                    },
-                    "participantName": {
-                        "type": "string",
-                        "description": "Meeting participant's name",
-                    },
-                    "participantOrg": {
-                        "type": "string",
-                        "description": "Meeting participant's organization (if applicable)",
-                    },
-                    "participantEmail": {
-                        "type": "string",
-                        "description": "Meeting participant's email",
-                    },
-                    "meetingType": {
-                        "type": "string",
-                        "enum": [
-                            "general_meeting",
-                            "initial_screening",
-                            "technical_discussion",
-                            "team_interview",
-                            "final_round",
-                            "follow_up",
-                        ],
-                        "description": "Type of meeting",
-                    },
-                    "notes": {
-                        "type": "string",
-                        "description": "Additional meeting notes or agenda",
-                    },
-                },
-                "required": [
-                    "dateTime",
-                    "duration",
-                    "format",
-                    "participantName",
-                    "participantOrg",
-                    "participantEmail",
-                    "meetingType",
-                ],
-            },
-        },
-    ],
 }
 
 NEGOTIATION_AGENT = {
@@ -668,69 +486,10 @@ NEGOTIATION_AGENT = {
     ]""",
     "voice": VOICE,
     "modalities": ["text", "audio"],
-    "input_audio_format": "g711_ulaw",
-    "output_audio_format": "g711_ulaw",
+    "input_audio_format": OPENAI_AUDIO_FORMAT,
+    "output_audio_format": OPENAI_AUDIO_FORMAT,
     "turn_detection": {"type": "server_vad"},
     "input_audio_transcription": {"model": "whisper-1"},
-    "tools": [
-        {
-            "type": "function",
-            "name": "checkCurrentOffer",
-            "description": "Checks the details of the current offer",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "role": {"type": "string"},
-                    "company": {"type": "string"},
-                },
-                "required": ["role", "company"],
-            },
-        },
-        {
-            "type": "function",
-            "name": "checkIndustrySalary",
-            "description": "Checks the industry salary range for comparison",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "role": {"type": "string"},
-                    "location": {"type": "string"},
-                    "yearsOfExperience": {"type": "number"},
-                },
-                "required": ["role", "location", "yearsOfExperience"],
-            },
-        },
-        {
-            "type": "function",
-            "name": "logFinalOffer",
-            "description": "Records the final negotiated terms",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "originalOffer": {
-                        "type": "object",
-                        "properties": {
-                            "baseSalary": {"type": "number"},
-                            "equity": {"type": "string"},
-                            "signOnBonus": {"type": "number"},
-                            "title": {"type": "string"},
-                        },
-                    },
-                    "finalOffer": {
-                        "type": "object",
-                        "properties": {
-                            "baseSalary": {"type": "number"},
-                            "equity": {"type": "string"},
-                            "signOnBonus": {"type": "number"},
-                            "title": {"type": "string"},
-                        },
-                    },
-                    "nextSteps": {"type": "string"},
-                },
-                "required": ["originalOffer", "finalOffer", "nextSteps"],
-            },
-        },
-    ],
 }
 
 # Update AGENTS registry to include the outbound caller agent
@@ -1,5 +1,7 @@
 """Agent management and initialization logic."""
 
+import copy
+from types import MappingProxyType
 from agents.definitions import (
     MAIN_AGENT,
     AUTHENTICATION_AGENT,
@@ -7,16 +9,77 @@ from agents.definitions import (
     SCHEDULING_AGENT,
     NEGOTIATION_AGENT,
 )
+from agents.session import CallSession
 from tools import get_tools_for_agent
-import json
-from config import VOICE
+from handlers import codec
+from collections import Counter, defaultdict
+from config import VOICE, AGENT_TRANSFER_MODE, SESSION_PAYLOAD_MODE
+
+# Expected handoffs, used to seed transfer predictions before any are observed
+TRANSFER_PRIORS = [
+    ("main_agent", "authentication_agent"),
+    ("authentication_agent", "info_desk_agent"),
+    ("info_desk_agent", "scheduling_agent"),
+    ("negotiation_agent", "scheduling_agent"),
+]
+
+
+class TransferStats:
+    """Counts of observed agent transfers, used to predict the next agent.
+
+    Also aggregates how long each phase of a transfer took, per agent pair.
+    """
+
+    def __init__(self, priors=TRANSFER_PRIORS):
+        self.counts = defaultdict(Counter)
+        for from_agent, to_agent in priors:
+            self.counts[from_agent][to_agent] += 1
+        # (from_agent, to_agent) -> phase -> [count, total_ms, max_ms]
+        self.timings = defaultdict(dict)
+
+    def record(self, from_agent: str, to_agent: str):
+        """Record a completed transfer."""
+        self.counts[from_agent][to_agent] += 1
+
+    def record_timing(self, from_agent: str, to_agent: str, phases: dict):
+        """Add one transfer's phase durations (milliseconds) to the aggregates."""
+        pair = self.timings[(from_agent, to_agent)]
+        for phase, ms in phases.items():
+            count, total, worst = pair.get(phase, (0, 0.0, 0.0))
+            pair[phase] = (count + 1, total + ms, max(worst, ms))
+
+    def timing_summary(self) -> dict:
+        """Mean and max milliseconds per phase, keyed by "from->to"."""
+        return {
+            f"{from_agent}->{to_agent}": {
+                phase: {"count": count, "mean_ms": round(total / count), "max_ms": round(worst)}
+                for phase, (count, total, worst) in phases.items()
+            }
+            for (from_agent, to_agent), phases in self.timings.items()
+        }
+
+    def most_likely(self, from_agent: str, candidates):
+        """The candidate most often transferred to from from_agent, or None."""
+        counts = self.counts.get(from_agent)
+        if not counts:
+            return None
+        best = max(candidates, key=lambda name: counts[name], default=None)
+        return best if best is not None and counts[best] else None
 
 
 class AgentManager:
-    def __init__(self):
-        self.agents = {}
-        self.current_agent_name = "main_agent"
-        self.current_conversation_context = None
+    """Shared, read-only agent catalog plus process-wide transfer statistics.
+
+    One instance serves every call in the process, so it holds no per-call
+    state; that lives in the CallSession returned by new_call_session.
+    """
+
+    def __init__(self, payload_mode: str = SESSION_PAYLOAD_MODE):
+        self.agents = MappingProxyType({})
+        self.transfer_stats = TransferStats()
+        self.payload_mode = payload_mode
+        # agent name -> serialized events, built once by setup_agents
+        self.session_payloads = {}
         self.setup_agents()
 
     def setup_agents(self):
@@ -30,51 +93,78 @@ class AgentManager:
             NEGOTIATION_AGENT,
         ]
 
-        # Create initial agent dictionary for reference
-        self.agents = {agent["name"]: agent for agent in base_agents}
+        # Work on copies so the module-level definitions and tool lists are
+        # never modified
+        agents = {agent["name"]: copy.deepcopy(agent) for agent in base_agents}
 
         # Setup relationships
-        self._setup_agent_relationships()
+        self._setup_agent_relationships(agents)
 
         # Add tools to agents
-        for agent in base_agents:
-            agent["tools"] = get_tools_for_agent(agent["name"])
+        for name, agent in agents.items():
+            agent["tools"] = copy.deepcopy(get_tools_for_agent(name))
 
-        # Inject transfer tools and update agents dictionary
-        self.agents = {
-            agent["name"]: agent for agent in self._inject_transfer_tools(base_agents)
+        # Inject transfer tools
+        self._inject_transfer_tools(agents)
+
+        self.agents = MappingProxyType(
+            {name: MappingProxyType(agent) for name, agent in agents.items()}
+        )
+        self.session_payloads = {
+            name: self._compile_session_payloads(agent, self.delivery_mode(name))
+            for name, agent in agents.items()
         }
 
-    def _setup_agent_relationships(self):
+    def delivery_mode(self, agent_name: str) -> str:
+        """How agent_name's prompt is delivered: payload_mode, except "dedup"
+        for an agent that can hand off in-session.
+
+        An in-session switch only replaces session.instructions, so a system
+        context item carrying the outgoing agent's prompt would stay in the
+        conversation and contradict the next agent on every later turn.
+        """
+        if self.payload_mode == "dedup":
+            return "dedup"
+        agent = self.agents[agent_name]
+        if any(
+            self.get_transfer_mode(agent_name, downstream) == "session_update"
+            for downstream in agent.get("downstream_agents", [])
+        ):
+            return "dedup"
+        return self.payload_mode
+
+    @staticmethod
+    def _setup_agent_relationships(agents):
         """Define downstream relationships between agents."""
-        MAIN_AGENT["downstream_agents"] = [
+        agents["main_agent"]["downstream_agents"] = [
             "authentication_agent",
             "info_desk_agent",
             "scheduling_agent",
             "negotiation_agent",
         ]
-        AUTHENTICATION_AGENT["downstream_agents"] = [
+        agents["authentication_agent"]["downstream_agents"] = [
             "main_agent",
             "info_desk_agent",
             "scheduling_agent",
         ]
-        INFO_DESK_AGENT["downstream_agents"] = [
+        agents["info_desk_agent"]["downstream_agents"] = [
             "main_agent",
             "scheduling_agent",
         ]
-        NEGOTIATION_AGENT["downstream_agents"] = [
+        agents["negotiation_agent"]["downstream_agents"] = [
             "scheduling_agent",  # TODO: if there is follow up conversation
         ]
 
-    def _inject_transfer_tools(self, agent_defs):
+    @staticmethod
+    def _inject_transfer_tools(agents):
         """Inject transfer tools into each agent based on their downstream agents."""
-        for agent in agent_defs:
+        for agent in agents.values():
             downstream_agents = agent.get("downstream_agents", [])
             if downstream_agents:
-                # Build available agents list for the prompt using self.agents
+                # Build available agents list for the prompt
                 available_agents_list = "\n".join(
                     [
-                        f"- {name}: {self.agents[name].get('publicDescription', 'No description')}"
+                        f"- {name}: {agents[name].get('publicDescription', 'No description')}"
                         for name in downstream_agents
                     ]
                 )
@@ -123,19 +213,15 @@ Available Agents:
                     agent["tools"] = []
                 agent["tools"].append(transfer_tool)
 
-        return agent_defs
-
-    def get_agent(self, agent_name):
-        """Get agent configuration by name."""
-        return self.agents.get(agent_name)
+    @staticmethod
+    def _compile_session_payloads(agent_config, payload_mode="full"):
+        """Serialize the per-agent session events once.
 
-    async def initialize_session(self, openai_ws, agent_name: str):
-        """Initialize an OpenAI session for an agent."""
-        agent_config = self.get_agent(agent_name)
-        if not agent_config:
-            raise ValueError(f"Agent {agent_name} not found")
-
-        # First, send the basic session update
+        Nothing in them varies per call, so initialize_session and
+        switch_session_agent send these strings as they are. In "dedup" mode
+        there is no system context item; the instructions go out only in
+        session.update.
+        """
         session_update = {
             "type": "session.update",
             "session": {
@@ -159,10 +245,7 @@ Available Agents:
                 "tools": agent_config["tools"],
             },
         }
-        print("Sending voice session update:", json.dumps(session_update))
-        await openai_ws.send(json.dumps(session_update))
-
-        # Then, immediately send an initial conversation item to set context
+        # Initial conversation item to set context
         context_message = {
             "type": "conversation.item.create",
             "item": {
@@ -176,35 +259,79 @@ Available Agents:
                 ],
             },
         }
-        await openai_ws.send(json.dumps(context_message))
+        # In-session handoff keeps audio settings and swaps only the agent
+        switch_update = {
+            "type": "session.update",
+            "session": {
+                "instructions": agent_config["instructions"],
+                "tool_choice": "auto",
+                "tools": agent_config["tools"],
+            },
+        }
+        return {
+            "session_update": codec.dumps(session_update),
+            "context_message": (
+                codec.dumps(context_message) if payload_mode == "full" else None
+            ),
+            "switch_update": codec.dumps(switch_update),
+        }
 
-        # Send a commit message to ensure the context is processed
-        await openai_ws.send(json.dumps({"type": "response.create"}))
-
-        # If there's transfer context, send it after initialization
-        if self.current_conversation_context:
-            transfer_message = {
-                "type": "conversation.item.create",
-                "item": {
-                    "type": "message",
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "input_text",
-                            "text": self.current_conversation_context,
-                        }
-                    ],
-                },
-            }
-            await openai_ws.send(json.dumps(transfer_message))
-            await openai_ws.send(json.dumps({"type": "response.create"}))
-            self.current_conversation_context = None
+    def get_agent(self, agent_name):
+        """Get agent configuration by name."""
+        return self.agents.get(agent_name)
 
-    async def get_openai_connection(self, agent_name: str):
-        """Get a new OpenAI connection for an agent."""
+    def new_call_session(self, agent_name: str) -> CallSession:
+        """Per-call state for a call starting with agent_name."""
         agent = self.get_agent(agent_name)
         if not agent:
             raise ValueError(f"Agent {agent_name} not found")
+        return CallSession(agent)
+
+    async def initialize_session(
+        self,
+        openai_ws,
+        agent_name: str,
+        start_response: bool = True,
+    ):
+        """Initialize an OpenAI session for an agent.
 
-        self.current_agent_name = agent_name
-        return agent
+        With start_response=False the session is configured but no response is
+        requested (used for speculative pre-connection).
+        """
+        payloads = self.session_payloads.get(agent_name)
+        if not payloads:
+            raise ValueError(f"Agent {agent_name} not found")
+
+        # First, send the basic session update
+        print(f"Sending voice session update for {agent_name}")
+        await openai_ws.send(payloads["session_update"])
+
+        # Then, immediately send an initial conversation item to set context
+        if payloads["context_message"]:
+            await openai_ws.send(payloads["context_message"])
+
+        if not start_response:
+            return
+
+        # Send a commit message to ensure the context is processed
+        await openai_ws.send(codec.response_create())
+
+    def get_transfer_mode(self, from_agent_name: str, to_agent_name: str) -> str:
+        """How to hand a call to to_agent_name: "session_update" or "new_socket".
+
+        An agent can set its own "transfer_mode"; otherwise AGENT_TRANSFER_MODE
+        applies. Switching in-session needs both agents on the same model.
+        """
+        from_agent = self.get_agent(from_agent_name)
+        to_agent = self.get_agent(to_agent_name)
+        mode = to_agent.get("transfer_mode", AGENT_TRANSFER_MODE)
+        if mode == "session_update" and from_agent["model"] != to_agent["model"]:
+            return "new_socket"
+        return mode
+
+    async def switch_session_agent(self, openai_ws, agent_name: str):
+        """Re-point an existing session at another agent, keeping its conversation."""
+        payloads = self.session_payloads.get(agent_name)
+        if not payloads:
+            raise ValueError(f"Agent {agent_name} not found")
+        await openai_ws.send(payloads["switch_update"])
@@ -0,0 +1,35 @@
+"""Per-call agent state, kept apart from the shared agent catalog."""
+
+import time
+
+
+class CallSession:
+    """Which agent a single call is talking to and how it got there.
+
+    One is created per call by AgentManager.new_call_session; the agent
+    catalog it points into is shared and read-only.
+    """
+
+    __slots__ = ("agent", "history")
+
+    def __init__(self, agent):
+        self.agent = agent
+        # (from_agent, to_agent, rationale, context, monotonic time) per
+        # completed transfer; the last entry holds the current transfer context
+        self.history = []
+
+    @property
+    def agent_name(self) -> str:
+        return self.agent["name"]
+
+    @property
+    def transfer_context(self):
+        """Context handed over by the most recent transfer, or None."""
+        return self.history[-1][3] if self.history else None
+
+    def record_transfer(self, new_agent, rationale: str, context: str):
+        """Make new_agent current after a completed transfer."""
+        self.history.append(
+            (self.agent["name"], new_agent["name"], rationale, context, time.monotonic())
+        )
+        self.agent = new_agent
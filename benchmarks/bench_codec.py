@@ -0,0 +1,114 @@
+"""Microbenchmark for the media hot path JSON handling.
+
+Compares the original stdlib path (json.loads + dict + send_json-style
+json.dumps) with handlers.codec (orjson when installed + pre-serialized
+envelopes). Reports messages per second on a single core.
+
+Run from the repository root:
+    python -m benchmarks.bench_codec
+"""
+
+import json
+import time
+import base64
+import argparse
+from handlers import codec
+from handlers.codec import TwilioEnvelopes
+
+STREAM_SID = "MZ18ad3ab5a668481ce02b83e7395059f0"
+# One 20 ms g711_ulaw frame, the size Twilio and OpenAI exchange
+PAYLOAD = base64.b64encode(bytes(range(160))).decode("ascii")
+
+OPENAI_AUDIO_DELTA = json.dumps(
+    {
+        "type": "response.audio.delta",
+        "event_id": "event_AIt1wI3TS8hMSgFxOWnaD",
+        "response_id": "resp_AIt1w0dZRYkY1ztyUkDIX",
+        "item_id": "item_AIt1wiBvwO8LJeXpZLUUF",
+        "output_index": 0,
+        "content_index": 0,
+        "delta": PAYLOAD,
+    }
+)
+TWILIO_MEDIA = json.dumps(
+    {
+        "event": "media",
+        "sequenceNumber": "4",
+        "media": {
+            "track": "inbound",
+            "chunk": "2",
+            "timestamp": "5",
+            "payload": PAYLOAD,
+        },
+        "streamSid": STREAM_SID,
+    }
+)
+
+
+def _stdlib_dumps(obj):
+    # Mirrors starlette's WebSocket.send_json
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+def baseline_downstream():
+    """OpenAI audio delta -> Twilio media event, as originally implemented."""
+    response = json.loads(OPENAI_AUDIO_DELTA)
+    payload = base64.b64encode(base64.b64decode(response["delta"])).decode("utf-8")
+    return _stdlib_dumps(
+        {"event": "media", "streamSid": STREAM_SID, "media": {"payload": payload}}
+    )
+
+
+def baseline_upstream():
+    """Twilio media event -> OpenAI input_audio_buffer.append, as originally implemented."""
+    data = json.loads(TWILIO_MEDIA)
+    return json.dumps(
+        {"type": "input_audio_buffer.append", "audio": data["media"]["payload"]}
+    )
+
+
+_ENVELOPES = TwilioEnvelopes(STREAM_SID)
+
+
+def codec_downstream():
+    response = codec.loads(OPENAI_AUDIO_DELTA)
+    return _ENVELOPES.media(response["delta"])
+
+
+def codec_upstream():
+    data = codec.loads(TWILIO_MEDIA)
+    return codec.input_audio_append(data["media"]["payload"])
+
+
+def _rate(fn, iterations):
+    fn()  # warm up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200_000)
+    args = parser.parse_args()
+
+    # Sanity check: both paths produce equivalent messages
+    assert json.loads(baseline_downstream()) == json.loads(codec_downstream())
+    assert json.loads(baseline_upstream()) == json.loads(codec_upstream())
+
+    print(f"codec: {codec.CODEC_NAME}, iterations: {args.iterations}")
+    for label, before, after in (
+        ("downstream (audio.delta -> media)", baseline_downstream, codec_downstream),
+        ("upstream (media -> audio.append)", baseline_upstream, codec_upstream),
+    ):
+        before_rate = _rate(before, args.iterations)
+        after_rate = _rate(after, args.iterations)
+        print(
+            f"{label:36s} before: {before_rate:>10,.0f} msg/s  "
+            f"after: {after_rate:>10,.0f} msg/s  ({after_rate / before_rate:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
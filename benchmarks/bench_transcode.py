@@ -0,0 +1,75 @@
+"""Throughput benchmark for µ-law <-> pcm16 transcoding and resampling.
+
+Measures handlers.audio.PcmTranscoder in both directions on one core, using
+the frame sizes the media path actually sees: 60 ms batches of caller audio
+going up and typical Realtime API pcm16 deltas coming down.
+
+Run from the repository root:
+    python -m benchmarks.bench_transcode
+"""
+
+import time
+import base64
+import argparse
+import numpy as np
+from handlers.audio import PcmTranscoder, pcm16_to_ulaw
+
+
+def _speech_like(seconds: float, rate: int, seed: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    tone = sum(np.sin(2 * np.pi * f * t) for f in (220, 660, 1320, 2400))
+    return (2000 * tone + rng.normal(0, 300, len(t))).astype(np.int16)
+
+
+def _measure(fn, payloads, audio_ms, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for payload in payloads:
+            fn(payload)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    per_second = len(payloads) / best
+    realtime_calls = len(payloads) * audio_ms / 1000 / best
+    return per_second, realtime_calls, best / len(payloads) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--batch-ms", type=int, default=60)
+    parser.add_argument("--delta-ms", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ulaw = pcm16_to_ulaw(_speech_like(args.seconds, 8000)).tobytes()
+    up_bytes = args.batch_ms * 8
+    upstream = [
+        base64.b64encode(ulaw[i : i + up_bytes]).decode("ascii")
+        for i in range(0, len(ulaw) - up_bytes + 1, up_bytes)
+    ]
+
+    pcm = _speech_like(args.seconds, 24000).tobytes()
+    down_bytes = args.delta_ms * 48  # 24 kHz * 2 bytes per sample
+    downstream = [
+        base64.b64encode(pcm[i : i + down_bytes]).decode("ascii")
+        for i in range(0, len(pcm) - down_bytes + 1, down_bytes)
+    ]
+
+    transcoder = PcmTranscoder()
+    for label, fn, payloads, audio_ms in (
+        (f"upstream µ-law 8k -> pcm16 24k ({args.batch_ms} ms)", transcoder.ulaw_to_pcm16, upstream, args.batch_ms),
+        (f"downstream pcm16 24k -> µ-law 8k ({args.delta_ms} ms)", transcoder.pcm16_to_ulaw, downstream, args.delta_ms),
+    ):
+        per_second, realtime_calls, per_frame_us = _measure(
+            fn, payloads, audio_ms, args.repeat
+        )
+        print(
+            f"{label:44s} {per_second:>9,.0f} frames/s  {per_frame_us:6.1f} µs/frame  "
+            f"~{realtime_calls:,.0f} real-time calls per core"
+        )
+
+
+if __name__ == "__main__":
+    main()
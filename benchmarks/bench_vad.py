@@ -0,0 +1,90 @@
+"""Benchmark for the local voice activity gate on call audio.
+
+Feeds 20 ms µ-law frames through handlers.vad.VoiceActivityGate and reports
+throughput (frames per second on one core) and how many upstream frames the
+gate suppresses.
+
+Pass a recording as raw 8 kHz µ-law, e.g. converted with
+    ffmpeg -i call.wav -ar 8000 -ac 1 -f mulaw call.ulaw
+Without --ulaw a synthetic call (speech bursts over line noise) is used.
+
+Run from the repository root:
+    python -m benchmarks.bench_vad [--ulaw call.ulaw]
+"""
+
+import time
+import base64
+import argparse
+import numpy as np
+from handlers.audio import ULAW_TO_PCM16
+from handlers.vad import VoiceActivityGate
+
+FRAME_BYTES = 160  # 20 ms at 8 kHz, as Twilio sends it
+
+
+def encode_ulaw(pcm: np.ndarray) -> np.ndarray:
+    """Nearest µ-law code word for each PCM16 sample (benchmark input only)."""
+    order = np.argsort(ULAW_TO_PCM16)
+    sorted_pcm = ULAW_TO_PCM16[order].astype(np.int32)
+    pcm = np.clip(pcm, -32768, 32767).astype(np.int32)
+    idx = np.clip(np.searchsorted(sorted_pcm, pcm), 1, len(sorted_pcm) - 1)
+    nearer_left = (pcm - sorted_pcm[idx - 1]) < (sorted_pcm[idx] - pcm)
+    return order[idx - nearer_left].astype(np.uint8)
+
+
+def synthetic_call(seconds: int = 120, seed: int = 7) -> bytes:
+    """Alternating talk spurts and listening pauses over low-level line noise."""
+    rng = np.random.default_rng(seed)
+    rate = 8000
+    pcm = rng.normal(0, 10, seconds * rate)  # about -70 dBFS line noise
+    t = 0
+    while t < seconds:
+        pause = rng.uniform(2.0, 6.0)
+        talk = rng.uniform(1.0, 4.0)
+        start, end = int((t + pause) * rate), int((t + pause + talk) * rate)
+        n = len(pcm[start:end])
+        envelope = 0.5 + 0.5 * np.sin(np.linspace(0, talk * 2 * np.pi * 4, n))
+        pcm[start:end] += rng.normal(0, 3000, n) * envelope  # about -20 dBFS speech
+        t += pause + talk
+    return encode_ulaw(pcm).tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ulaw", help="raw 8 kHz µ-law recording")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.ulaw:
+        with open(args.ulaw, "rb") as f:
+            audio = f.read()
+        source = args.ulaw
+    else:
+        audio = synthetic_call()
+        source = "synthetic call"
+
+    frames = [
+        base64.b64encode(audio[i : i + FRAME_BYTES]).decode("ascii")
+        for i in range(0, len(audio) - FRAME_BYTES + 1, FRAME_BYTES)
+    ]
+    print(f"source: {source}, {len(frames)} frames ({len(frames) / 50:.0f} s)")
+
+    best = None
+    for _ in range(args.repeat):
+        gate = VoiceActivityGate()
+        start = time.perf_counter()
+        for frame in frames:
+            gate.process(frame)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    print(f"throughput: {len(frames) / best:,.0f} frames/s per core")
+    print(f"real-time calls per core: {len(frames) / best / 50:,.0f}")
+    print(
+        f"forwarded {gate.frames_out} of {gate.frames_in} frames "
+        f"({gate.suppression_ratio:.0%} suppressed)"
+    )
+
+
+if __name__ == "__main__":
+    main()
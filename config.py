@@ -39,6 +39,134 @@ DOMAIN = re.sub(r"(^\w+:|^)\/\/|\/+$", "", raw_domain)
 INBOUND_PORT = int(os.getenv("INBOUND_PORT", 5050))
 OUTBOUND_PORT = int(os.getenv("OUTBOUND_PORT", 6060))
 
+# Media Stream Settings
+# Audio format of the OpenAI Realtime session. Twilio always uses 8 kHz g711_ulaw;
+# with "pcm16" the handler transcodes to/from 24 kHz PCM16 in process.
+OPENAI_AUDIO_FORMAT = os.getenv("OPENAI_AUDIO_FORMAT", "g711_ulaw")
+if OPENAI_AUDIO_FORMAT not in ("g711_ulaw", "pcm16"):
+    raise ValueError("OPENAI_AUDIO_FORMAT must be 'g711_ulaw' or 'pcm16'.")
+# With g711_ulaw on both sides audio deltas are forwarded to Twilio as-is.
+# Enable to base64-validate every delta (debugging only).
+VALIDATE_AUDIO_DELTAS = os.getenv("VALIDATE_AUDIO_DELTAS", "false").lower() == "true"
+# Inbound Twilio frames (20 ms each) are coalesced into one input_audio_buffer.append
+# per window. Set to 0 to forward every frame individually.
+INPUT_AUDIO_BATCH_MS = int(os.getenv("INPUT_AUDIO_BATCH_MS", 60))
+# A Twilio mark is placed every MARK_INTERVAL_MS of assistant audio and at the end
+# of each response. Set to 0 to mark after every audio delta.
+MARK_INTERVAL_MS = int(os.getenv("MARK_INTERVAL_MS", 200))
+
+# Bounded queues between the Twilio and OpenAI sides of a call, in audio messages.
+# On overflow the oldest queued audio is dropped; control events never are.
+UPSTREAM_QUEUE_MAX_FRAMES = int(os.getenv("UPSTREAM_QUEUE_MAX_FRAMES", 50))
+DOWNSTREAM_QUEUE_MAX_FRAMES = int(os.getenv("DOWNSTREAM_QUEUE_MAX_FRAMES", 250))
+
+# Local voice activity gate: drops silent caller frames before they reach OpenAI.
+# The hangover must stay above the server_vad silence_duration_ms (500 ms default)
+# so the server still detects the end of each turn.
+VAD_GATE_ENABLED = os.getenv("VAD_GATE_ENABLED", "false").lower() == "true"
+VAD_THRESHOLD_DBFS = float(os.getenv("VAD_THRESHOLD_DBFS", -45))
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", 800))
+VAD_PREROLL_MS = int(os.getenv("VAD_PREROLL_MS", 100))
+# Forward one in every N silent frames (0 drops all silence after the hangover)
+VAD_SILENCE_KEEP_EVERY = int(os.getenv("VAD_SILENCE_KEEP_EVERY", 0))
+
+# Local barge-in: stop assistant playback as soon as the caller starts talking,
+# without waiting for the server's input_audio_buffer.speech_started.
+LOCAL_BARGE_IN_ENABLED = os.getenv("LOCAL_BARGE_IN_ENABLED", "false").lower() == "true"
+LOCAL_BARGE_IN_THRESHOLD_DBFS = float(os.getenv("LOCAL_BARGE_IN_THRESHOLD_DBFS", -35))
+LOCAL_BARGE_IN_MIN_SPEECH_MS = int(os.getenv("LOCAL_BARGE_IN_MIN_SPEECH_MS", 60))
+# A local barge-in the server doesn't confirm with speech_started within this
+# window is treated as a false positive (cough, line noise) and the assistant resumes
+LOCAL_BARGE_IN_CONFIRM_MS = int(os.getenv("LOCAL_BARGE_IN_CONFIRM_MS", 1500))
+
+# Realtime connection pool: warm, authenticated sockets kept per model so calls
+# and agent transfers skip the TLS handshake and session creation.
+REALTIME_POOL_SIZE = int(os.getenv("REALTIME_POOL_SIZE", 2))
+REALTIME_POOL_IDLE_TTL_S = float(os.getenv("REALTIME_POOL_IDLE_TTL_S", 300))
+REALTIME_POOL_HEALTH_INTERVAL_S = float(os.getenv("REALTIME_POOL_HEALTH_INTERVAL_S", 30))
+
+# Agent transfers: "new_socket" hands the call to a fresh session (drawn from the
+# pool, or pre-connected speculatively); "session_update" re-points the current
+# Realtime session at the new agent and keeps the conversation. An agent
+# definition may override this with its own "transfer_mode".
+AGENT_TRANSFER_MODE = os.getenv("AGENT_TRANSFER_MODE", "new_socket")
+if AGENT_TRANSFER_MODE not in ("session_update", "new_socket"):
+    raise ValueError("AGENT_TRANSFER_MODE must be 'session_update' or 'new_socket'.")
+
+# Speculative pre-connection: while an agent talks, a session for its most likely
+# next agent is opened and initialized in the background. Max sessions per call.
+SPECULATIVE_PRECONNECT_BUDGET = int(os.getenv("SPECULATIVE_PRECONNECT_BUDGET", 2))
+
+# How each session's prompt is delivered: "full" sends the agent's instructions
+# in session.update and again as a system conversation item; "dedup" sends them
+# once, in session.update only. Agents that can hand off in-session
+# (AGENT_TRANSFER_MODE=session_update) always use "dedup": the system item would
+# outlive the switch and contradict the next agent.
+SESSION_PAYLOAD_MODE = os.getenv("SESSION_PAYLOAD_MODE", "full")
+if SESSION_PAYLOAD_MODE not in ("full", "dedup"):
+    raise ValueError("SESSION_PAYLOAD_MODE must be 'full' or 'dedup'.")
+
+# Transfers wait on server events rather than fixed sleeps. Upper bounds (seconds)
+# for the outgoing agent's handoff line (response.done) and for a new session to
+# be ready (session.created / session.updated). A transfer carries on when the
+# handoff or session.updated wait times out; a pooled socket without
+# session.created is dropped.
+TRANSFER_HANDOFF_TIMEOUT_S = float(os.getenv("TRANSFER_HANDOFF_TIMEOUT_S", 5))
+SESSION_READY_TIMEOUT_S = float(os.getenv("SESSION_READY_TIMEOUT_S", 5))
+
+# Tool execution: default per-tool timeout (seconds; overrides in tools.TOOL_TIMEOUTS)
+# and threads for tools that do blocking I/O
+TOOL_TIMEOUT_S = float(os.getenv("TOOL_TIMEOUT_S", 10))
+TOOL_EXECUTOR_THREADS = int(os.getenv("TOOL_EXECUTOR_THREADS", 8))
+
+# Start prefetch-safe tools (tools.PREFETCH_SAFE_TOOLS) as soon as their required
+# arguments have streamed in, instead of waiting for function_call_arguments.done
+TOOL_PREFETCH_ENABLED = os.getenv("TOOL_PREFETCH_ENABLED", "true").lower() == "true"
+
+# Memoization of idempotent tools (checkCurrentOffer, checkIndustrySalary)
+TOOL_CACHE_TTL_S = float(os.getenv("TOOL_CACHE_TTL_S", 300))
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", 256))
+
+# Compensation dataset behind checkIndustrySalary (CSV or JSONL; see tools/salary_index.py).
+# Unset by default: with no dataset the tool reports benchmarks as unavailable.
+SALARY_DATASET_PATH = os.getenv("SALARY_DATASET_PATH", "")
+
+# Candidate calendar behind returnAvailableDateTime: comma-separated ICS/JSON files
+# of busy blocks, reloaded when they change. Slots are offered within working hours
+# (candidate's time zone, weekdays) over a rolling window, with a minimum notice.
+CALENDAR_PATHS = [
+    path.strip()
+    for path in os.getenv("CALENDAR_PATHS", "data/candidate_calendar.ics").split(",")
+    if path.strip()
+]
+CANDIDATE_TIMEZONE = os.getenv("CANDIDATE_TIMEZONE", "America/Los_Angeles")
+CANDIDATE_WORKING_HOURS = os.getenv("CANDIDATE_WORKING_HOURS", "09:00-17:00")
+AVAILABILITY_WINDOW_DAYS = int(os.getenv("AVAILABILITY_WINDOW_DAYS", 14))
+AVAILABILITY_MIN_NOTICE_HOURS = float(os.getenv("AVAILABILITY_MIN_NOTICE_HOURS", 12))
+
+# Meetings booked by scheduleMeeting (SQLite, WAL mode; shared by both services)
+MEETINGS_DB_PATH = os.getenv("MEETINGS_DB_PATH", "data/meetings.db")
+
+# Known recruiters behind verifyRecruiterCredentials (CSV or JSONL with full_name,
+# company and optionally position), re-indexed when the file changes. A recruiter
+# is verified when the name/company match confidence (0-1) reaches the threshold.
+# Unset by default: with no directory, nobody is verified.
+RECRUITER_DIRECTORY_PATH = os.getenv("RECRUITER_DIRECTORY_PATH", "")
+RECRUITER_DIRECTORY_POLL_S = float(os.getenv("RECRUITER_DIRECTORY_POLL_S", 30))
+RECRUITER_MATCH_THRESHOLD = float(os.getenv("RECRUITER_MATCH_THRESHOLD", 0.8))
+
+# Recruiter/negotiation JSONL logs: written in batches by a background task.
+# LOG_SINK_FSYNC is "always" (every batch), "periodic" or "never".
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+LOG_SINK_QUEUE_MAX = int(os.getenv("LOG_SINK_QUEUE_MAX", 1000))
+LOG_SINK_BATCH_SIZE = int(os.getenv("LOG_SINK_BATCH_SIZE", 100))
+LOG_SINK_FLUSH_INTERVAL_S = float(os.getenv("LOG_SINK_FLUSH_INTERVAL_S", 0.5))
+LOG_SINK_FSYNC = os.getenv("LOG_SINK_FSYNC", "periodic")
+if LOG_SINK_FSYNC not in ("always", "periodic", "never"):
+    raise ValueError("LOG_SINK_FSYNC must be 'always', 'periodic' or 'never'.")
+LOG_SINK_FSYNC_INTERVAL_S = float(os.getenv("LOG_SINK_FSYNC_INTERVAL_S", 1))
+LOG_SINK_MAX_BYTES = int(os.getenv("LOG_SINK_MAX_BYTES", 10 * 1024 * 1024))
+
 # Event Logging
 LOG_EVENT_TYPES = [
     "error",
@@ -0,0 +1,162 @@
+"""Vectorized G.711 µ-law / PCM16 transcoding and 8 kHz <-> 24 kHz resampling.
+
+Twilio media streams are 8 kHz µ-law; the Realtime API's pcm16 format is
+24 kHz little-endian 16-bit PCM. Everything here works on whole frame
+batches with NumPy lookup tables and polyphase FIR filters.
+"""
+
+import base64
+import numpy as np
+
+ULAW_BIAS = 0x84
+ULAW_CLIP = 32635
+TWILIO_SAMPLE_RATE = 8000
+PCM16_SAMPLE_RATE = 24000
+RESAMPLE_FACTOR = PCM16_SAMPLE_RATE // TWILIO_SAMPLE_RATE
+
+
+def _build_ulaw_to_pcm16():
+    """Decode table for all 256 µ-law code words (ITU-T G.711)."""
+    codes = ~np.arange(256, dtype=np.uint8)
+    exponent = (codes >> 4) & 0x07
+    mantissa = codes & 0x0F
+    magnitude = ((mantissa.astype(np.int32) << 3) + ULAW_BIAS) << exponent
+    magnitude -= ULAW_BIAS
+    return np.where(codes & 0x80, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_pcm16_to_ulaw():
+    """Encode table indexed by the unsigned 16-bit view of every PCM16 sample."""
+    pcm = np.arange(-32768, 32768, dtype=np.int32)
+    sign = np.where(pcm < 0, 0x80, 0x00)
+    magnitude = np.minimum(np.abs(pcm), ULAW_CLIP) + ULAW_BIAS
+    exponent = np.floor(np.log2(magnitude)).astype(np.int32) - 7
+    mantissa = (magnitude >> (exponent + 3)) & 0x0F
+    codes = ~(sign | (exponent << 4) | mantissa) & 0xFF
+    table = np.empty(65536, dtype=np.uint8)
+    table[pcm.astype(np.int16).view(np.uint16)] = codes
+    return table
+
+
+ULAW_TO_PCM16 = _build_ulaw_to_pcm16()
+PCM16_TO_ULAW = _build_pcm16_to_ulaw()
+# Squared sample values, so frame energy is a single gather + mean
+ULAW_TO_SQUARED = ULAW_TO_PCM16.astype(np.float64) ** 2
+
+# Full-scale reference for dBFS
+_PCM16_FULL_SCALE_SQUARED = 32768.0**2
+
+
+def ulaw_bytes(payload: str) -> np.ndarray:
+    """View a base64 µ-law payload as an array of code words."""
+    return np.frombuffer(base64.b64decode(payload), dtype=np.uint8)
+
+
+def ulaw_to_pcm16(ulaw: np.ndarray) -> np.ndarray:
+    """Decode µ-law code words to PCM16 samples."""
+    return ULAW_TO_PCM16[ulaw]
+
+
+def pcm16_to_ulaw(pcm: np.ndarray) -> np.ndarray:
+    """Encode PCM16 samples to µ-law code words."""
+    return PCM16_TO_ULAW[pcm.astype(np.int16, copy=False).view(np.uint16)]
+
+
+def ulaw_energy_dbfs(ulaw: np.ndarray) -> float:
+    """Mean energy of a µ-law frame in dBFS (-inf for digital silence)."""
+    if not len(ulaw):
+        return float("-inf")
+    mean_square = ULAW_TO_SQUARED[ulaw].mean()
+    if mean_square <= 0:
+        return float("-inf")
+    return 10.0 * np.log10(mean_square / _PCM16_FULL_SCALE_SQUARED)
+
+
+def _lowpass_taps(num_taps: int, cutoff: float) -> np.ndarray:
+    """Hann-windowed sinc low-pass filter; cutoff is a fraction of the sample rate."""
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hanning(num_taps)
+    return taps / taps.sum()
+
+
+# Covers the 300-3400 Hz telephone band at 24 kHz; 97 taps add 2 ms of delay
+# per direction, which is a whole number of 8 kHz samples.
+_RESAMPLE_TAPS = _lowpass_taps(32 * RESAMPLE_FACTOR + 1, 3700 / PCM16_SAMPLE_RATE)
+
+
+class Upsampler:
+    """Streaming 8 kHz -> 24 kHz polyphase interpolator.
+
+    Keeps filter history between calls, so consecutive frames join without
+    clicks.
+    """
+
+    def __init__(self, taps: np.ndarray = _RESAMPLE_TAPS, factor: int = RESAMPLE_FACTOR):
+        self.factor = factor
+        # Zero-pad so every polyphase branch has the same length
+        taps = np.concatenate((taps, np.zeros(-len(taps) % factor)))
+        self._phases = [taps[p::factor] * factor for p in range(factor)]
+        self._history = np.zeros(len(self._phases[0]) - 1)
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if not len(samples):
+            return np.zeros(0)
+        buffer = np.concatenate((self._history, samples))
+        out = np.empty(len(samples) * self.factor)
+        for phase, phase_taps in enumerate(self._phases):
+            out[phase :: self.factor] = np.convolve(buffer, phase_taps, "valid")
+        self._history = buffer[len(buffer) - len(self._history) :]
+        return out
+
+
+class Downsampler:
+    """Streaming 24 kHz -> 8 kHz low-pass decimator."""
+
+    def __init__(self, taps: np.ndarray = _RESAMPLE_TAPS, factor: int = RESAMPLE_FACTOR):
+        self.factor = factor
+        self._taps = taps
+        self._history = np.zeros(len(taps) - 1)
+        self._phase = 0
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        if not len(samples):
+            return np.zeros(0)
+        buffer = np.concatenate((self._history, samples))
+        filtered = np.convolve(buffer, self._taps, "valid")
+        out = filtered[self._phase :: self.factor]
+        self._phase = (self._phase - len(filtered)) % self.factor
+        self._history = buffer[len(buffer) - len(self._history) :]
+        return out
+
+
+def _to_pcm16(samples: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(samples), -32768, 32767).astype("<i2")
+
+
+class PcmTranscoder:
+    """Per-call transcoder between Twilio µ-law and Realtime API pcm16.
+
+    Both directions take and return base64 payloads and keep their own
+    resampler state.
+    """
+
+    def __init__(self):
+        self._upsampler = Upsampler()
+        self._downsampler = Downsampler()
+        self._odd_byte = b""
+
+    def ulaw_to_pcm16(self, payload: str) -> str:
+        """8 kHz µ-law (from Twilio) -> 24 kHz pcm16 (to OpenAI)."""
+        pcm_8k = ULAW_TO_PCM16[ulaw_bytes(payload)].astype(np.float64)
+        pcm_24k = _to_pcm16(self._upsampler.process(pcm_8k))
+        return base64.b64encode(pcm_24k.tobytes()).decode("ascii")
+
+    def pcm16_to_ulaw(self, payload: str) -> str:
+        """24 kHz pcm16 (from OpenAI) -> 8 kHz µ-law (to Twilio)."""
+        raw = self._odd_byte + base64.b64decode(payload)
+        # A delta may end mid-sample; carry the odd byte into the next one
+        whole = len(raw) - len(raw) % 2
+        self._odd_byte = raw[whole:]
+        pcm_24k = np.frombuffer(raw[:whole], dtype="<i2").astype(np.float64)
+        pcm_8k = _to_pcm16(self._downsampler.process(pcm_24k))
+        return base64.b64encode(pcm16_to_ulaw(pcm_8k).tobytes()).decode("ascii")
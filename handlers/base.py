@@ -1,6 +1,5 @@
 """Base voice handler with shared functionality."""
 
-import json
 import base64
 import asyncio
 import websockets
@@ -8,14 +7,36 @@ from fastapi import WebSocket
 from fastapi.websockets import WebSocketDisconnect
 from twilio.rest import Client
 from config import (
-    OPENAI_API_KEY,
     TWILIO_ACCOUNT_SID,
     TWILIO_AUTH_TOKEN,
     LOG_EVENT_TYPES,
     SHOW_TIMING_MATH,
+    VALIDATE_AUDIO_DELTAS,
+    VAD_GATE_ENABLED,
+    LOCAL_BARGE_IN_ENABLED,
+    LOCAL_BARGE_IN_CONFIRM_MS,
+    OPENAI_AUDIO_FORMAT,
+    SPECULATIVE_PRECONNECT_BUDGET,
+    UPSTREAM_QUEUE_MAX_FRAMES,
+    DOWNSTREAM_QUEUE_MAX_FRAMES,
+    TRANSFER_HANDOFF_TIMEOUT_S,
+    SESSION_READY_TIMEOUT_S,
+    TOOL_PREFETCH_ENABLED,
 )
+import time
+import inspect
 import traceback
-from tools import get_tool_implementation
+from tools import get_tool_implementation, get_tool_timeout, get_tool_reconciler
+from tools.executor import ToolExecutor, tool_error
+from . import codec
+from .audio import PcmTranscoder
+from .codec import TwilioEnvelopes
+from .function_args import ArgumentPrefetcher
+from .media import InputAudioBatcher
+from .playback import PlaybackClock, MarkLedger
+from .queues import MediaQueue
+from .realtime import realtime_pool, wait_for_event
+from .vad import VoiceActivityGate, SpeechOnsetDetector
 
 
 class BaseVoiceHandler:
@@ -26,55 +47,189 @@ class BaseVoiceHandler:
         self.active_connections = {
             "voice": {
                 "ws": None,  # Will be set during handle_media_stream
-                "current_agent": None,  # Will be set during handle_media_stream
                 "stream_sid": None,
                 "latest_media_timestamp": 0,
             }
         }
-        self.mark_queue = []
+        self.mark_ledger = MarkLedger()
+        # Twilio stays on µ-law; a pcm16 session is transcoded in process
+        self.transcoder = PcmTranscoder() if OPENAI_AUDIO_FORMAT == "pcm16" else None
+        self.input_audio_batcher = InputAudioBatcher(
+            transcode=self.transcoder.ulaw_to_pcm16 if self.transcoder else None
+        )
+        self.vad_gate = VoiceActivityGate() if VAD_GATE_ENABLED else None
+        self.onset_detector = (
+            SpeechOnsetDetector() if LOCAL_BARGE_IN_ENABLED else None
+        )
+        # Assistant item cut off by the last barge-in; late deltas for it are dropped
+        self.interrupted_item = None
+        # When a local barge-in fired and is waiting for the server's speech_started
+        self.local_barge_in_at = None
+        # Resumes the assistant if that confirmation never comes
+        self.barge_in_confirm_task = None
+        # Response being generated on the active socket (response.created..done)
+        self.active_response_id = None
+        self.upstream_queue = MediaQueue("twilio->openai", UPSTREAM_QUEUE_MAX_FRAMES)
+        self.downstream_queue = MediaQueue(
+            "openai->twilio", DOWNSTREAM_QUEUE_MAX_FRAMES
+        )
+        # Current agent and transfer history; set during handle_media_stream
+        self.call_session = None
         self.last_assistant_item = None
-        self.response_start_timestamp_twilio = None
-        self.latest_media_timestamp = 0
+        self.playback_clock = PlaybackClock()
         self.stream_sid = None
+        self.envelopes = TwilioEnvelopes(None)
         self.openai_ws = None
+        # Background session for the predicted next agent: (agent_name, task -> ws)
+        self.speculative_session = None
+        self.speculation_budget = SPECULATIVE_PRECONNECT_BUDGET
+        # In-flight new-socket agent transfer, run beside the OpenAI receive loop
+        self.transfer_task = None
+        # In-flight tool calls, cancelled on barge-in and hangup
+        self.tool_executor = ToolExecutor()
+        # Prefetch-safe tools started from streamed arguments, claimed on .done
+        self.prefetcher = (
+            ArgumentPrefetcher(self.tool_executor) if TOOL_PREFETCH_ENABLED else None
+        )
+        # (predicate, future) pairs resolved by events on the active OpenAI socket
+        self._event_waiters = []
         self.twilio_client = Client(TWILIO_ACCOUNT_SID, TWILIO_AUTH_TOKEN)
 
+    async def run_media_pipeline(self, openai_ws):
+        """Run both directions of the call as independent reader/writer tasks.
+
+        Twilio ingest and OpenAI egress are joined by ``upstream_queue``, OpenAI
+        ingest and Twilio egress by ``downstream_queue``, so a slow peer only
+        backs up its own queue instead of stalling reads from the other side.
+        """
+        try:
+            await asyncio.gather(
+                self.receive_from_twilio(openai_ws),
+                self.forward_to_openai(openai_ws),
+                self.send_to_twilio(openai_ws),
+                self.forward_to_twilio(),
+            )
+        finally:
+            if self.transfer_task and not self.transfer_task.done():
+                self.transfer_task.cancel()
+            if self.barge_in_confirm_task:
+                self.barge_in_confirm_task.cancel()
+            self.tool_executor.cancel_all()
+            await self._discard_speculative_session()
+            print("Media queue stats:", self.upstream_queue.stats())
+            print("Media queue stats:", self.downstream_queue.stats())
+            if self.prefetcher:
+                self.prefetcher.clear()
+                print("Tool prefetch stats:", self.prefetcher.stats())
+            if self.call_session and self.call_session.history:
+                # Aggregated over every call this process has handled
+                print(
+                    "Transfer timing summary:",
+                    self.agent_manager.transfer_stats.timing_summary(),
+                )
+
     async def receive_from_twilio(self, openai_ws):
-        """Receive audio data from Twilio and send it to the OpenAI Realtime API."""
+        """Receive events from Twilio and queue caller audio for OpenAI."""
         try:
             async for message in self.websocket.iter_text():
-                data = json.loads(message)
-                current_ws = self.active_connections.get("voice", {}).get(
-                    "ws", openai_ws
-                )
+                data = codec.loads(message)
 
-                if data["event"] == "media" and current_ws.open:
+                if data["event"] == "media":
                     if "voice" in self.active_connections:
                         self.active_connections["voice"]["latest_media_timestamp"] = (
                             int(data["media"]["timestamp"])
                         )
-                    audio_append = {
-                        "type": "input_audio_buffer.append",
-                        "audio": data["media"]["payload"],
-                    }
-                    await current_ws.send(json.dumps(audio_append))
+                    payload = data["media"]["payload"]
+                    if self.onset_detector and self.onset_detector.process(payload):
+                        self.handle_local_speech_onset()
+                    frames = (
+                        self.vad_gate.process(payload) if self.vad_gate else (payload,)
+                    )
+                    for frame in frames:
+                        self.upstream_queue.put_audio(("audio", frame))
                 elif data["event"] == "start":
                     self.stream_sid = data["start"]["streamSid"]
+                    self.envelopes = TwilioEnvelopes(self.stream_sid)
                     if "voice" in self.active_connections:
                         self.active_connections["voice"]["stream_sid"] = self.stream_sid
                     print(f"Incoming stream has started {self.stream_sid}")
-                    self.response_start_timestamp_twilio = None
+                    self.playback_clock.reset()
                     if "voice" in self.active_connections:
                         self.active_connections["voice"]["latest_media_timestamp"] = 0
                     self.last_assistant_item = None
                 elif data["event"] == "mark":
-                    if self.mark_queue:
-                        self.mark_queue.pop(0)
+                    acked = self.mark_ledger.acknowledge(data["mark"]["name"])
+                    if acked and acked[0] == self.playback_clock.item_id:
+                        self.playback_clock.on_mark_acked(acked[1])
+                elif data["event"] == "stop":
+                    print(f"Incoming stream has stopped {self.stream_sid}")
+                    if self.vad_gate:
+                        print(
+                            f"VAD gate suppressed {self.vad_gate.suppression_ratio:.0%} of inbound frames"
+                        )
+                    self.upstream_queue.put_control(("stop", None))
         except WebSocketDisconnect:
             print("Client disconnected.")
-            current_ws = self.active_connections.get("voice", {}).get("ws")
-            if current_ws and current_ws.open:
-                await current_ws.close()
+        finally:
+            self.upstream_queue.put_control(("close", None))
+
+    async def forward_to_openai(self, openai_ws):
+        """Drain queued caller audio into the current OpenAI connection."""
+        while True:
+            kind, payload = await self.upstream_queue.get()
+            current_ws = self.active_connections.get("voice", {}).get("ws", openai_ws)
+            try:
+                if kind == "audio":
+                    if current_ws.open and self.input_audio_batcher.add(payload):
+                        await self.input_audio_batcher.flush(current_ws)
+                elif kind == "event":
+                    # Serialized client event queued by the Twilio side (barge-in)
+                    if current_ws.open:
+                        await current_ws.send(payload)
+                elif kind == "stop":
+                    await self.input_audio_batcher.flush(current_ws)
+                elif kind == "close":
+                    if current_ws and current_ws.open:
+                        await current_ws.close()
+                    return
+            except websockets.exceptions.ConnectionClosed:
+                # The socket may be swapped out by an agent transfer; keep draining
+                print("OpenAI connection closed while forwarding caller audio")
+
+    async def forward_to_twilio(self):
+        """Drain queued media, mark and clear events into the Twilio websocket.
+
+        Assistant audio is counted on the playback clock, and marks placed,
+        here as it is written rather than when it is queued: the queue may
+        still drop it on overflow, and dropped audio was never heard.
+        """
+        while True:
+            entry = await self.downstream_queue.get()
+            if entry is None:
+                return
+            kind, payload = entry
+            try:
+                if kind == "media":
+                    item_id, audio_payload = payload
+                    if not self.playback_clock.started:
+                        # A new item is playing; any local barge-in the
+                        # server never confirmed is stale by now
+                        self.local_barge_in_at = None
+                        if SHOW_TIMING_MATH:
+                            print(
+                                f"Starting playback clock for new response item: {item_id}"
+                            )
+                    byte_offset = self.playback_clock.on_audio_sent(item_id, audio_payload)
+                    await self.websocket.send_text(self.envelopes.media(audio_payload))
+                    if self.mark_ledger.due(item_id, byte_offset):
+                        await self.send_mark()
+                elif kind == "mark":
+                    await self.send_mark()
+                elif kind == "clear":
+                    await self.websocket.send_text(self.envelopes.clear())
+            except Exception as e:
+                print(f"Error sending to Twilio: {e}")
+                return
 
     async def send_to_twilio(self, openai_ws):
         """Receive events from the OpenAI Realtime API, send audio back to Twilio."""
@@ -85,16 +240,34 @@ class BaseVoiceHandler:
                         "ws", openai_ws
                     )
                     async for openai_message in current_ws:
-                        response = json.loads(openai_message)
+                        response = codec.loads(openai_message)
                         if response["type"] in LOG_EVENT_TYPES:
                             print(f"Received event: {response['type']}", response)
+                        if self._event_waiters:
+                            self._dispatch_event_waiters(response)
+                        if response["type"] == "response.created":
+                            self.active_response_id = response.get("response", {}).get("id")
+                        elif response["type"] == "response.done":
+                            self.active_response_id = None
+                        if (
+                            self.prefetcher
+                            and response["type"] in ArgumentPrefetcher.EVENT_TYPES
+                        ):
+                            self.prefetcher.observe(response)
 
                         if (
                             response.get("type")
                             == "response.function_call_arguments.done"
                         ):
                             print("Function call detected in voice stream, handling...")
-                            await self.handle_function_call(response, "voice")
+                            if response.get("name") == "transferAgents":
+                                # Runs beside this loop so the handoff line keeps
+                                # playing and the events it waits on still arrive;
+                                # the loop moves to the new socket once the old
+                                # one is closed.
+                                self.start_transfer(response, "voice")
+                            else:
+                                await self.handle_function_call(response, "voice")
                             # Check if connection changed during function call
                             if current_ws != self.active_connections["voice"]["ws"]:
                                 print("Connection changed, restarting message loop")
@@ -103,42 +276,52 @@ class BaseVoiceHandler:
                         if (
                             response.get("type") == "response.audio.delta"
                             and "delta" in response
+                            and response.get("item_id") != self.interrupted_item
                         ):
                             try:
-                                audio_payload = base64.b64encode(
-                                    base64.b64decode(response["delta"])
-                                ).decode("utf-8")
-                                audio_delta = {
-                                    "event": "media",
-                                    "streamSid": self.stream_sid,
-                                    "media": {"payload": audio_payload},
-                                }
-                                await self.websocket.send_json(audio_delta)
-
-                                if self.response_start_timestamp_twilio is None:
-                                    self.response_start_timestamp_twilio = (
-                                        self.latest_media_timestamp
+                                # When Twilio and OpenAI share g711_ulaw the base64
+                                # delta is forwarded untouched.
+                                audio_payload = response["delta"]
+                                if VALIDATE_AUDIO_DELTAS:
+                                    self._validate_audio_payload(audio_payload)
+                                if self.transcoder:
+                                    audio_payload = self.transcoder.pcm16_to_ulaw(
+                                        audio_payload
                                     )
-                                    if SHOW_TIMING_MATH:
-                                        print(
-                                            f"Setting start timestamp for new response: {self.response_start_timestamp_twilio}ms"
-                                        )
+                                self.downstream_queue.put_audio(
+                                    ("media", (response.get("item_id"), audio_payload))
+                                )
 
                                 if response.get("item_id"):
                                     self.last_assistant_item = response["item_id"]
 
-                                await self.send_mark()
-
                             except Exception as e:
                                 print(f"Error processing audio data: {e}")
 
+                        if response.get("type") == "response.audio.done":
+                            # Mark the end of the response so playback completion is known
+                            self.downstream_queue.put_control(("mark", None))
+
                         if response.get("type") == "input_audio_buffer.speech_started":
                             print("Speech started detected.")
-                            if self.last_assistant_item:
+                            if self.local_barge_in_at is not None:
+                                print(
+                                    "Server confirmed local barge-in "
+                                    f"{(time.monotonic() - self.local_barge_in_at) * 1000:.0f}ms later"
+                                )
+                                self.local_barge_in_at = None
+                                if self.barge_in_confirm_task:
+                                    self.barge_in_confirm_task.cancel()
+                                    self.barge_in_confirm_task = None
+                            elif self.last_assistant_item:
                                 print(
                                     f"Interrupting response with id: {self.last_assistant_item}"
                                 )
-                                await self.handle_speech_started_event()
+                                self.handle_speech_started_event()
+                    else:
+                        # Closed normally without an agent transfer replacing it
+                        if current_ws == self.active_connections["voice"]["ws"]:
+                            return
 
                 except websockets.exceptions.ConnectionClosed:
                     print(
@@ -155,49 +338,132 @@ class BaseVoiceHandler:
             print(f"Error in send_to_twilio: {e}")
             traceback.print_exc()
             raise
+        finally:
+            # Let forward_to_twilio finish once everything queued is sent
+            self.downstream_queue.put_control(None)
 
-    async def send_mark(self):
-        """Send mark event to Twilio."""
-        if self.stream_sid:
-            mark_event = {
-                "event": "mark",
-                "streamSid": self.stream_sid,
-                "mark": {"name": "responsePart"},
-            }
-            await self.websocket.send_json(mark_event)
-            self.mark_queue.append("responsePart")
-
-    async def _send_function_result(self, result, call_id):
-        """Send function call result back to OpenAI."""
-        if isinstance(result, dict):
-            result = json.dumps(result)
+    @staticmethod
+    def _validate_audio_payload(audio_payload):
+        """Check that an audio delta is well-formed base64 before forwarding it."""
+        try:
+            base64.b64decode(audio_payload, validate=True)
+        except ValueError as e:
+            raise ValueError(f"Invalid base64 audio delta: {e}") from e
 
+    async def send_mark(self):
+        """Write a mark event to Twilio at the current playback byte offset."""
+        item_id = self.playback_clock.item_id
+        byte_offset = self.playback_clock.bytes_sent
+        if self.stream_sid and self.mark_ledger.has_unmarked_audio(item_id, byte_offset):
+            name = self.mark_ledger.record(item_id, byte_offset)
+            await self.websocket.send_text(self.envelopes.mark(name))
+
+    def _expect_event(self, predicate):
+        """Future resolved with the next active-socket event matching predicate.
+
+        Register before sending whatever triggers the event, then await it with
+        _wait_for_event.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._event_waiters.append((predicate, future))
+        return future
+
+    def _dispatch_event_waiters(self, event):
+        for predicate, future in self._event_waiters:
+            if not future.done() and predicate(event):
+                future.set_result(event)
+        self._event_waiters = [
+            (predicate, future)
+            for predicate, future in self._event_waiters
+            if not future.done()
+        ]
+
+    @staticmethod
+    async def _wait_for_event(future, timeout):
+        """Wait for an expected event; None if it did not arrive in time."""
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def start_transfer(self, event_json, identifier):
+        """Run a transferAgents call as a background task."""
+        if self.transfer_task and not self.transfer_task.done():
+            print("Warning: transfer already in progress, ignoring transferAgents call")
+            return
+        self.transfer_task = asyncio.create_task(
+            self.handle_function_call(event_json, identifier)
+        )
+
+    async def _send_function_result(self, result, call_id, ws=None, respond=True):
+        """Send function call result back to OpenAI.
+
+        With respond=False the output is recorded without asking for a new
+        response (the caller is talking, e.g. after a barge-in).
+        """
+        ws = ws or self.openai_ws
         result_json = {
             "type": "conversation.item.create",
             "item": {
                 "type": "function_call_output",
-                "output": result,
+                "output": (
+                    result if isinstance(result, codec.RawJSON) else codec.dumps(result)
+                ),
                 "call_id": call_id,
             },
         }
         try:
-            await self.openai_ws.send(json.dumps(result_json))
-            await self.openai_ws.send(json.dumps({"type": "response.create"}))
+            if not ws.open:
+                return
+            await ws.send(codec.dumps(result_json))
+            if respond:
+                await ws.send(codec.response_create())
         except Exception as e:
             print(f"Failed to send function call result: {e}")
             traceback.print_exc()
 
+    async def _run_tool_call(
+        self, ws, name, call_id, tool_impl, arguments, prefetched=None
+    ):
+        """Run one tool through the executor and send its output on ws.
+
+        ``prefetched`` is a speculative run of the same call to wait on instead.
+        A cancelled tool with side effects reports what it actually did.
+        """
+        reconcile = get_tool_reconciler(name)
+        try:
+            if prefetched is not None:
+                result = await prefetched
+            else:
+                result = await self.tool_executor.run(
+                    name, tool_impl, arguments, get_tool_timeout(name), reconcile
+                )
+        except asyncio.CancelledError:
+            print(f"Tool {name} cancelled")
+            settled = None
+            if reconcile is not None:
+                settled = await self.tool_executor.settle(name, reconcile, arguments)
+            await self._send_function_result(
+                settled
+                or tool_error(name, "cancelled", "The caller interrupted this request."),
+                call_id,
+                ws,
+                respond=False,
+            )
+            raise
+        await self._send_function_result(result, call_id, ws)
+
     async def handle_function_call(self, event_json, identifier):
         """Handle function calls from the AI."""
         try:
             ws = self.active_connections[identifier]["ws"]
-            current_agent = self.active_connections[identifier]["current_agent"]
+            current_agent = self.call_session.agent
             name = event_json.get("name", "")
             call_id = event_json.get("call_id", "")
             arguments = event_json.get("arguments", "{}")
             print(f"Handling function call: {name} with arguments: {arguments}")
 
-            function_call_args = json.loads(arguments)
+            function_call_args = codec.loads(arguments)
 
             if name == "transferAgents":
                 new_agent_name = function_call_args["destination_agent"]
@@ -219,141 +485,429 @@ class BaseVoiceHandler:
                 print(f"Transferring to {new_agent_name} because: {rationale}")
                 print(f"Context: {context}")
 
-                # Keep old connection open until new one is ready
-                old_ws = ws
-
-                try:
-                    # First send success response through old connection
-                    result = json.dumps(
-                        {
-                            "status": "success",
-                            "message": f"Transferring to {new_agent_name}: {rationale}",
-                        }
+                if (
+                    self.agent_manager.get_transfer_mode(
+                        current_agent["name"], new_agent_name
                     )
-                    result_json = {
-                        "type": "conversation.item.create",
-                        "item": {
-                            "type": "function_call_output",
-                            "output": result,
-                            "call_id": call_id,
-                        },
-                    }
-                    await old_ws.send(json.dumps(result_json))
-                    await old_ws.send(json.dumps({"type": "response.create"}))
-
-                    # Wait a moment for the response to be sent
-                    await asyncio.sleep(0.1)
-
-                    # Create new connection with new agent
-                    new_ws = await websockets.connect(
-                        f"wss://api.openai.com/v1/realtime?model={new_agent['model']}",
-                        extra_headers={
-                            "Authorization": f"Bearer {OPENAI_API_KEY}",
-                            "OpenAI-Beta": "realtime=v1",
-                        },
+                    == "session_update"
+                ):
+                    await self._switch_agent_in_session(
+                        identifier, new_agent, call_id, rationale, context, event_json
                     )
+                    return
 
-                    # Update active connection before initializing
-                    self.active_connections[identifier] = {
-                        "ws": new_ws,
-                        "current_agent": new_agent,
-                        "stream_sid": self.active_connections[identifier].get(
-                            "stream_sid"
+                await self._switch_agent_new_socket(
+                    identifier, new_agent, call_id, rationale, context, event_json
+                )
+                return
+
+            # Handle other function calls using the tool registry; they run
+            # as tasks so audio keeps flowing while a tool works
+            else:
+                tool_impl = get_tool_implementation(name)
+                if tool_impl:
+                    prefetched = (
+                        self.prefetcher.claim(call_id, function_call_args)
+                        if self.prefetcher
+                        else None
+                    )
+                    # Tools that key their side effects by call id receive it
+                    if "call_id" in inspect.signature(tool_impl).parameters:
+                        function_call_args["call_id"] = call_id
+                    self.tool_executor.spawn(
+                        call_id,
+                        self._run_tool_call(
+                            ws,
+                            name,
+                            call_id,
+                            tool_impl,
+                            function_call_args,
+                            prefetched,
                         ),
-                        "latest_media_timestamp": self.active_connections[
-                            identifier
-                        ].get("latest_media_timestamp", 0),
-                    }
+                    )
 
-                    # Initialize the new session
-                    await self.agent_manager.initialize_session(new_ws, new_agent_name)
-
-                    # Wait for session to be fully initialized
-                    await asyncio.sleep(0.2)
-
-                    # Start conversation with new agent
-                    initial_message = {
-                        "type": "conversation.item.create",
-                        "item": {
-                            "type": "message",
-                            "role": "user",
-                            "content": [
-                                {
-                                    "type": "input_text",
-                                    "text": f"Hi, I was transferred here because: {rationale}. Context: {context}",
-                                }
-                            ],
-                        },
-                    }
-                    await new_ws.send(json.dumps(initial_message))
-                    await new_ws.send(json.dumps({"type": "response.create"}))
+        except Exception as e:
+            print(f"Error handling function call: {e}")
+            print(f"Full event_json: {event_json}")
+            traceback.print_exc()
 
-                    # Close old connection only after new one is confirmed working
-                    try:
-                        await old_ws.close()
-                    except:
-                        pass
+    async def _switch_agent_new_socket(
+        self, identifier, new_agent, call_id, rationale, context, event_json
+    ):
+        """Hand the call to new_agent on a fresh OpenAI socket.
+
+        The new session is prepared while the outgoing agent speaks its handoff
+        line; the switch happens once that line's response.done arrives and the
+        new session has confirmed its session.updated.
+        """
+        # Keep old connection open until new one is ready
+        old_ws = self.active_connections[identifier]["ws"]
+        current_agent = self.call_session.agent
+        new_agent_name = new_agent["name"]
+        new_ws = None
+        phases = {}
+        started = time.monotonic()
+
+        # The response carrying the function call finishes on its own; the
+        # handoff line is the next response on this socket
+        handoff_done = self._expect_event(
+            lambda event: event.get("type") == "response.done"
+            and event.get("response", {}).get("id") != event_json.get("response_id")
+        )
+        prepare = asyncio.create_task(
+            self._prepare_agent_session(new_agent_name, phases)
+        )
+        try:
+            # First send success response through old connection
+            result = codec.dumps(
+                {
+                    "status": "success",
+                    "message": f"Transferring to {new_agent_name}: {rationale}",
+                }
+            )
+            result_json = {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "function_call_output",
+                    "output": result,
+                    "call_id": call_id,
+                },
+            }
+            await old_ws.send(codec.dumps(result_json))
+            await old_ws.send(codec.response_create())
 
-                    print(f"Successfully switched to {new_agent_name}")
-                    return
+            # Hand any batched caller audio to the outgoing agent
+            await self.input_audio_batcher.flush(old_ws)
 
-                except Exception as e:
-                    print(f"Error during agent transition: {e}")
-                    traceback.print_exc()
+            if (
+                await self._wait_for_event(handoff_done, TRANSFER_HANDOFF_TIMEOUT_S)
+                is None
+            ):
+                print(
+                    f"Handoff response not done after {TRANSFER_HANDOFF_TIMEOUT_S}s, transferring anyway"
+                )
+            phases["handoff_response"] = (time.monotonic() - started) * 1000
 
-                    # Restore old connection if something went wrong
-                    self.active_connections[identifier] = {
-                        "ws": old_ws,
-                        "current_agent": current_agent,
-                        "stream_sid": self.active_connections[identifier].get(
-                            "stream_sid"
-                        ),
-                        "latest_media_timestamp": self.active_connections[
-                            identifier
-                        ].get("latest_media_timestamp", 0),
-                    }
+            new_ws, preinitialized = await prepare
 
-                    if "new_ws" in locals():
-                        try:
-                            await new_ws.close()
-                        except:
-                            pass
-                    return
+            self.active_connections[identifier] = {
+                "ws": new_ws,
+                "stream_sid": self.active_connections[identifier].get("stream_sid"),
+                "latest_media_timestamp": self.active_connections[identifier].get(
+                    "latest_media_timestamp", 0
+                ),
+            }
 
-            # Handle other function calls using the tool registry
-            else:
-                tool_impl = get_tool_implementation(name)
-                if tool_impl:
-                    try:
-                        result = await tool_impl(**function_call_args)
-                        result_json = {
-                            "type": "conversation.item.create",
-                            "item": {
-                                "type": "function_call_output",
-                                "output": json.dumps(result),
-                                "call_id": call_id,
-                            },
+            # Start conversation with new agent
+            initial_message = {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "message",
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": f"Hi, I was transferred here because: {rationale}. Context: {context}",
                         }
-                        await ws.send(json.dumps(result_json))
-                        await ws.send(json.dumps({"type": "response.create"}))
-                    except Exception as e:
-                        print(f"Error executing {name}: {e}")
-                        traceback.print_exc()
+                    ],
+                },
+            }
+            await new_ws.send(codec.dumps(initial_message))
+            await new_ws.send(codec.response_create())
+
+            # Close old connection only after new one is confirmed working
+            try:
+                await old_ws.close()
+            except:
+                pass
+
+            phases["total"] = (time.monotonic() - started) * 1000
+            self.call_session.record_transfer(new_agent, rationale, context)
+            print(
+                f"Successfully switched to {new_agent_name}"
+                + (" (pre-initialized)" if preinitialized else "")
+            )
+            self._record_transfer(current_agent["name"], new_agent_name, phases)
+            self.schedule_speculative_preconnect(new_agent)
 
         except Exception as e:
-            print(f"Error handling function call: {e}")
-            print(f"Full event_json: {event_json}")
+            print(f"Error during agent transition: {e}")
             traceback.print_exc()
+            handoff_done.cancel()
+            prepare.cancel()
+
+            # Restore old connection if something went wrong
+            self.active_connections[identifier] = {
+                "ws": old_ws,
+                "stream_sid": self.active_connections[identifier].get("stream_sid"),
+                "latest_media_timestamp": self.active_connections[identifier].get(
+                    "latest_media_timestamp", 0
+                ),
+            }
 
-    async def handle_speech_started_event(self):
-        """Handle interruption when the caller's speech starts."""
-        if self.mark_queue and self.response_start_timestamp_twilio is not None:
-            elapsed_time = (
-                self.latest_media_timestamp - self.response_start_timestamp_twilio
+            if new_ws is not None:
+                try:
+                    await new_ws.close()
+                except:
+                    pass
+
+    async def _prepare_agent_session(self, agent_name, phases):
+        """Ready session for agent_name: the speculative one if it matches, else a new one.
+
+        Returns (ws, preinitialized).
+        """
+        ws = await self._take_speculative_session(agent_name)
+        if ws is not None:
+            return ws, True
+        return await self._open_agent_session(agent_name, phases), False
+
+    def _record_transfer(self, from_agent_name, to_agent_name, phases):
+        self.agent_manager.transfer_stats.record(from_agent_name, to_agent_name)
+        self.agent_manager.transfer_stats.record_timing(
+            from_agent_name, to_agent_name, phases
+        )
+        print(
+            f"Transfer timing {from_agent_name} -> {to_agent_name}: "
+            + ", ".join(f"{phase} {ms:.0f}ms" for phase, ms in phases.items())
+        )
+
+    async def _switch_agent_in_session(
+        self, identifier, new_agent, call_id, rationale, context, event_json
+    ):
+        """Hand the call to new_agent on the same OpenAI socket via session.update.
+
+        The conversation so far stays in the session, so no reconnect or
+        context rebuild is needed. The new agent's response is requested once
+        the response carrying the transferAgents call is done; the server
+        rejects a response.create while another response is active.
+        """
+        ws = self.active_connections[identifier]["ws"]
+        current_agent = self.call_session.agent
+        phases = {}
+        started = time.monotonic()
+        response_id = event_json.get("response_id")
+        call_done = self._expect_event(
+            lambda event: event.get("type") == "response.done"
+            and event.get("response", {}).get("id") == response_id
+        )
+        try:
+            result = codec.dumps(
+                {
+                    "status": "success",
+                    "message": f"Transferring to {new_agent['name']}: {rationale}",
+                }
             )
+            result_json = {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "function_call_output",
+                    "output": result,
+                    "call_id": call_id,
+                },
+            }
+            await ws.send(codec.dumps(result_json))
+
+            await self.agent_manager.switch_session_agent(ws, new_agent["name"])
+
+            # The new agent picks up from here with the full history available
+            handoff_message = {
+                "type": "conversation.item.create",
+                "item": {
+                    "type": "message",
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "input_text",
+                            "text": f"Hi, I was transferred here because: {rationale}. Context: {context}",
+                        }
+                    ],
+                },
+            }
+            await ws.send(codec.dumps(handoff_message))
+
+            # response.done may already have been handled before this task ran
+            if response_id and self.active_response_id == response_id:
+                if (
+                    await self._wait_for_event(call_done, TRANSFER_HANDOFF_TIMEOUT_S)
+                    is None
+                ):
+                    print(
+                        f"Transfer response not done after {TRANSFER_HANDOFF_TIMEOUT_S}s, switching anyway"
+                    )
+            else:
+                call_done.cancel()
+            phases["handoff_response"] = (time.monotonic() - started) * 1000
+
+            await ws.send(codec.response_create())
+            self.call_session.record_transfer(new_agent, rationale, context)
+
+            phases["total"] = (time.monotonic() - started) * 1000
+            print(f"Successfully switched to {new_agent['name']} (same session)")
+            self._record_transfer(current_agent["name"], new_agent["name"], phases)
+            self.schedule_speculative_preconnect(new_agent)
+        except Exception as e:
+            print(f"Error during in-session agent switch: {e}")
+            traceback.print_exc()
+            call_done.cancel()
+
+    def schedule_speculative_preconnect(self, agent):
+        """Start initializing a session for agent's most likely next agent in the background."""
+        next_agent_name = self.agent_manager.transfer_stats.most_likely(
+            agent["name"], agent.get("downstream_agents", [])
+        )
+        if not next_agent_name:
+            return
+        if (
+            self.agent_manager.get_transfer_mode(agent["name"], next_agent_name)
+            == "session_update"
+        ):
+            # The handoff will stay on the current socket; nothing to warm up
+            return
+        if self.speculative_session and self.speculative_session[0] == next_agent_name:
+            return
+        if self.speculation_budget <= 0:
+            return
+        self.speculation_budget -= 1
+        task = asyncio.create_task(self._preconnect_agent(next_agent_name))
+        previous, self.speculative_session = self.speculative_session, (
+            next_agent_name,
+            task,
+        )
+        if previous:
+            asyncio.create_task(self._close_speculative_session(previous))
+
+    async def _preconnect_agent(self, agent_name):
+        """Speculatively open a session for agent_name (see _open_agent_session)."""
+        ws = await self._open_agent_session(agent_name)
+        print(f"Pre-initialized session for likely next agent {agent_name}")
+        return ws
+
+    async def _open_agent_session(self, agent_name, phases=None):
+        """Open and fully initialize a session for agent_name without starting a response.
+
+        Pooled sockets have already seen session.created; this waits for the
+        session.updated confirming the agent's configuration. Durations of the
+        "connect" and "session_ready" phases are written into phases if given.
+        """
+        agent = self.agent_manager.get_agent(agent_name)
+        started = time.monotonic()
+        ws = await realtime_pool.acquire(agent["model"])
+        connected = time.monotonic()
+        try:
+            await self.agent_manager.initialize_session(
+                ws, agent_name, start_response=False
+            )
+            try:
+                await wait_for_event(ws, "session.updated", SESSION_READY_TIMEOUT_S)
+            except asyncio.TimeoutError:
+                # Events on a socket are processed in order, so the update
+                # still lands before anything sent after it
+                print(
+                    f"No session.updated for {agent_name} after {SESSION_READY_TIMEOUT_S}s, continuing"
+                )
+        except BaseException:
+            await ws.close()
+            raise
+        if phases is not None:
+            phases["connect"] = (connected - started) * 1000
+            phases["session_ready"] = (time.monotonic() - connected) * 1000
+        return ws
+
+    async def _take_speculative_session(self, agent_name):
+        """Claim the speculative session if it is for agent_name, else discard it."""
+        if not self.speculative_session or self.speculative_session[0] != agent_name:
+            await self._discard_speculative_session()
+            return None
+        _, task = self.speculative_session
+        self.speculative_session = None
+        try:
+            ws = await task
+        except Exception as e:
+            print(f"Speculative session for {agent_name} failed: {e}")
+            return None
+        return ws if ws.open else None
+
+    async def _discard_speculative_session(self):
+        """Close the speculative session, if any."""
+        session, self.speculative_session = self.speculative_session, None
+        if session:
+            await self._close_speculative_session(session)
+
+    @staticmethod
+    async def _close_speculative_session(session):
+        _, task = session
+        if not task.done():
+            task.cancel()
+            return
+        if not task.cancelled() and task.exception() is None:
+            try:
+                await task.result().close()
+            except Exception:
+                pass
+
+    def handle_local_speech_onset(self):
+        """Barge in as soon as the caller starts talking over assistant audio.
+
+        Runs ahead of the server's input_audio_buffer.speech_started: playback
+        stops at once and the response is cancelled. If the server does not
+        confirm within LOCAL_BARGE_IN_CONFIRM_MS the onset was a false
+        positive and a new response is requested so the assistant carries on.
+        """
+        if not (self.last_assistant_item and self._assistant_audio_pending()):
+            return
+        print(f"Local barge-in, interrupting response with id: {self.last_assistant_item}")
+        self.local_barge_in_at = time.monotonic()
+        self.handle_speech_started_event(cancel_response=True)
+        if self.barge_in_confirm_task:
+            self.barge_in_confirm_task.cancel()
+        self.barge_in_confirm_task = asyncio.create_task(
+            self._resume_unconfirmed_barge_in(self.local_barge_in_at)
+        )
+
+    async def _resume_unconfirmed_barge_in(self, barge_in_at):
+        await asyncio.sleep(LOCAL_BARGE_IN_CONFIRM_MS / 1000)
+        # Confirmed, or superseded by a newer barge-in or a new response
+        if self.local_barge_in_at != barge_in_at or self.active_response_id:
+            return
+        print(
+            f"Local barge-in not confirmed within {LOCAL_BARGE_IN_CONFIRM_MS}ms, resuming"
+        )
+        self.local_barge_in_at = None
+        self._queue_openai_event(codec.response_create())
+
+    def _queue_openai_event(self, message: str):
+        """Send a serialized client event via forward_to_openai, in order with caller audio."""
+        self.upstream_queue.put_control(("event", message))
+
+    def _assistant_audio_pending(self) -> bool:
+        """Whether assistant audio is queued for Twilio or not yet acknowledged.
+
+        Checked against the playback clock rather than outstanding marks, so
+        audio written before the first mark is placed can still be interrupted.
+        """
+        return (
+            bool(self.downstream_queue.audio_count)
+            or self.playback_clock.has_unacked_audio
+        )
+
+    def handle_speech_started_event(self, cancel_response=False):
+        """Handle interruption when the caller's speech starts.
+
+        Events for OpenAI are queued rather than sent here, so neither receive
+        loop waits on the OpenAI socket. ``cancel_response`` also cancels the
+        response in progress; the server does that itself for its own
+        speech_started.
+        """
+        if self._assistant_audio_pending():
+            cancelled = self.tool_executor.cancel_all()
+            if self.prefetcher:
+                self.prefetcher.clear()
+            if cancelled:
+                print(f"Barge-in cancelled {len(cancelled)} in-flight tool call(s)")
+            elapsed_time = self.playback_clock.played_ms()
             if SHOW_TIMING_MATH:
                 print(
-                    f"Calculating elapsed time for truncation: {self.latest_media_timestamp} - {self.response_start_timestamp_twilio} = {elapsed_time}ms"
+                    f"Calculating played audio for truncation: acked {self.playback_clock.acked_ms}ms, sent {self.playback_clock.sent_ms}ms, played {elapsed_time}ms"
                 )
 
             if self.last_assistant_item:
@@ -362,30 +916,25 @@ class BaseVoiceHandler:
                         f"Truncating item with ID: {self.last_assistant_item}, Truncated at: {elapsed_time}ms"
                     )
                 try:
-                    # Get current WebSocket connection
-                    current_ws = self.active_connections["voice"]["ws"]
-
-                    # Only attempt to send truncate event if connection is still open
-                    if current_ws.open:
-                        truncate_event = {
-                            "type": "conversation.item.truncate",
-                            "item_id": self.last_assistant_item,
-                            "content_index": 0,
-                            "audio_end_ms": elapsed_time,
-                        }
-                        await current_ws.send(json.dumps(truncate_event))
-
-                    # Send clear event to Twilio
-                    await self.websocket.send_json(
-                        {"event": "clear", "streamSid": self.stream_sid}
-                    )
+                    # Drop assistant audio not yet sent and tell Twilio to clear its buffer
+                    self.downstream_queue.clear_audio()
+                    self.downstream_queue.put_control(("clear", None))
+                    self.interrupted_item = self.last_assistant_item
+
+                    if cancel_response and self.active_response_id:
+                        self._queue_openai_event(codec.response_cancel())
+                    truncate_event = {
+                        "type": "conversation.item.truncate",
+                        "item_id": self.last_assistant_item,
+                        "content_index": 0,
+                        "audio_end_ms": elapsed_time,
+                    }
+                    self._queue_openai_event(codec.dumps(truncate_event))
 
-                except websockets.exceptions.ConnectionClosed:
-                    print("WebSocket closed during speech interruption - continuing")
                 except Exception as e:
                     print(f"Error during speech interruption: {e}")
                     traceback.print_exc()
 
-            self.mark_queue.clear()
+            self.mark_ledger.clear()
             self.last_assistant_item = None
-            self.response_start_timestamp_twilio = None
+            self.playback_clock.reset()
@@ -0,0 +1,88 @@
+"""JSON codec and pre-serialized envelopes for the media hot path.
+
+Uses orjson when it is installed and falls back to the stdlib json module
+otherwise. Both return/accept ``str`` so callers can hand the result straight
+to ``websocket.send``/``send_text``.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+if orjson is not None:
+    CODEC_NAME = "orjson"
+
+    def loads(message):
+        """Parse a JSON message (str or bytes)."""
+        return orjson.loads(message)
+
+    def dumps(obj) -> str:
+        """Serialize an object to a compact JSON string."""
+        return orjson.dumps(obj).decode("utf-8")
+
+else:
+    CODEC_NAME = "json"
+
+    def loads(message):
+        """Parse a JSON message (str or bytes)."""
+        return json.loads(message)
+
+    def dumps(obj) -> str:
+        """Serialize an object to a compact JSON string."""
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+class RawJSON(str):
+    """A string that already holds serialized JSON, to be sent as is."""
+
+
+# Base64 payloads never need JSON escaping, so they are spliced in verbatim.
+_INPUT_AUDIO_APPEND_PREFIX = '{"type":"input_audio_buffer.append","audio":"'
+_RESPONSE_CREATE = '{"type":"response.create"}'
+_RESPONSE_CANCEL = '{"type":"response.cancel"}'
+
+
+def input_audio_append(payload: str) -> str:
+    """Serialized input_audio_buffer.append event for a base64 audio payload."""
+    return _INPUT_AUDIO_APPEND_PREFIX + payload + '"}'
+
+
+def response_create() -> str:
+    """Serialized response.create event."""
+    return _RESPONSE_CREATE
+
+
+def response_cancel() -> str:
+    """Serialized response.cancel event."""
+    return _RESPONSE_CANCEL
+
+
+class TwilioEnvelopes:
+    """Pre-serialized Twilio media, mark and clear events for one stream.
+
+    The constant parts of each envelope are built once per streamSid; only the
+    payload (or mark name) is spliced in per message.
+    """
+
+    def __init__(self, stream_sid):
+        self.stream_sid = stream_sid
+        sid = dumps(stream_sid)
+        self._media_prefix = '{"event":"media","streamSid":' + sid + ',"media":{"payload":"'
+        self._mark_prefix = '{"event":"mark","streamSid":' + sid + ',"mark":{"name":'
+        self._clear = '{"event":"clear","streamSid":' + sid + "}"
+
+    def media(self, payload: str) -> str:
+        """Twilio media event carrying a base64 µ-law payload."""
+        return self._media_prefix + payload + '"}}'
+
+    def mark(self, name: str) -> str:
+        """Twilio mark event with the given name."""
+        return self._mark_prefix + dumps(name) + "}}"
+
+    def clear(self) -> str:
+        """Twilio clear event."""
+        return self._clear
@@ -0,0 +1,155 @@
+"""Speculative tool execution from streamed function-call arguments."""
+
+from tools import get_tool_implementation, get_tool_timeout, get_prefetch_requirements
+from . import codec
+
+
+class IncrementalJSONObject:
+    """Top-level members of a JSON object, parsed as its text streams in.
+
+    Each character is scanned once. A member is parsed as soon as its value is
+    known to be complete: at the closing quote of a string, the closing bracket
+    of an array or object, or the delimiter after a number or literal.
+    """
+
+    def __init__(self):
+        self.members = {}
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = None
+        self._in_value = False
+
+    def feed(self, delta: str) -> bool:
+        """Append a chunk of the argument text. Returns True if a member completed."""
+        start = len(self._text)
+        self._text += delta
+        completed = False
+        for i in range(start, len(self._text)):
+            char = self._text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._in_value:
+                        completed |= self._complete(i + 1)
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._member_start = i + 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0 and self._in_value:
+                    completed |= self._complete(i)
+                elif self._depth == 1 and self._in_value:
+                    completed |= self._complete(i + 1)
+            elif self._depth == 1:
+                if char == ":":
+                    self._in_value = True
+                elif char == ",":
+                    if self._in_value:
+                        completed |= self._complete(i)
+                    self._member_start = i + 1
+        return completed
+
+    def _complete(self, end: int) -> bool:
+        self._in_value = False
+        try:
+            self.members.update(codec.loads("{" + self._text[self._member_start : end] + "}"))
+        except ValueError:
+            return False
+        return True
+
+
+class ArgumentPrefetcher:
+    """Starts prefetch-safe tools while their arguments are still streaming.
+
+    Function calls are registered from response.output_item.added; their
+    response.function_call_arguments.delta events feed an
+    IncrementalJSONObject, and the tool is started through the call's
+    ToolExecutor once its required arguments are known. When .done arrives the
+    speculative run is claimed if it was started with exactly the final
+    arguments, and cancelled otherwise.
+    """
+
+    EVENT_TYPES = ("response.output_item.added", "response.function_call_arguments.delta")
+
+    def __init__(self, executor):
+        self.executor = executor
+        self._calls = {}  # call_id -> pending call state
+        self.started = 0
+        self.confirmed = 0
+        self.discarded = 0
+
+    def observe(self, event: dict):
+        """Track an output_item.added or function_call_arguments.delta event."""
+        if event["type"] == "response.output_item.added":
+            item = event.get("item") or {}
+            if item.get("type") != "function_call":
+                return
+            required = get_prefetch_requirements(item.get("name"))
+            if required is not None:
+                self._calls[item.get("call_id")] = {
+                    "name": item["name"],
+                    "required": required,
+                    "parser": IncrementalJSONObject(),
+                    "arguments": None,
+                    "task": None,
+                }
+            return
+
+        call_id = event.get("call_id")
+        call = self._calls.get(call_id)
+        if call is None or call["task"] is not None:
+            return
+        parser = call["parser"]
+        if parser.feed(event.get("delta", "")) and all(
+            key in parser.members for key in call["required"]
+        ):
+            name = call["name"]
+            call["arguments"] = dict(parser.members)
+            call["task"] = self.executor.spawn(
+                f"prefetch:{call_id}",
+                self.executor.run(
+                    name,
+                    get_tool_implementation(name),
+                    dict(call["arguments"]),
+                    get_tool_timeout(name),
+                ),
+            )
+            self.started += 1
+            print(f"Prefetching {name} with {call['arguments']}")
+
+    def claim(self, call_id: str, arguments: dict):
+        """The speculative task for call_id if it ran with these arguments, else None."""
+        call = self._calls.pop(call_id, None)
+        if call is None or call["task"] is None:
+            return None
+        task = call["task"]
+        if call["arguments"] == arguments and not task.cancelled():
+            self.confirmed += 1
+            return task
+        task.cancel()
+        self.discarded += 1
+        print(f"Discarded prefetched {call['name']}: final arguments differ")
+        return None
+
+    def clear(self):
+        """Drop every pending call and cancel its speculative run."""
+        for call in self._calls.values():
+            if call["task"] is not None:
+                call["task"].cancel()
+        self._calls.clear()
+
+    def stats(self) -> dict:
+        return {
+            "started": self.started,
+            "confirmed": self.confirmed,
+            "discarded": self.discarded,
+        }
@@ -1,9 +1,8 @@
 """Inbound voice call handler: Human recruiter reach out to Donna to provide offer; Donna will provide information about the candidate"""
 
-import asyncio
 import websockets
-from config import OPENAI_API_KEY
 from .base import BaseVoiceHandler
+from .realtime import realtime_pool
 
 
 class InboundVoiceHandler(BaseVoiceHandler):
@@ -14,19 +13,13 @@ class InboundVoiceHandler(BaseVoiceHandler):
 
         try:
             # Get initial OpenAI connection for main agent
-            initial_agent = self.agent_manager.get_agent("main_agent")
-            self.openai_ws = await websockets.connect(
-                f"wss://api.openai.com/v1/realtime?model={initial_agent['model']}",
-                extra_headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "OpenAI-Beta": "realtime=v1",
-                },
-            )
+            self.call_session = self.agent_manager.new_call_session("main_agent")
+            initial_agent = self.call_session.agent
+            self.openai_ws = await realtime_pool.acquire(initial_agent["model"])
 
             # Initialize active connections with main agent
             self.active_connections["voice"] = {
                 "ws": self.openai_ws,
-                "current_agent": initial_agent,
                 "stream_sid": None,
                 "latest_media_timestamp": 0,
             }
@@ -34,6 +27,9 @@ class InboundVoiceHandler(BaseVoiceHandler):
             # Initialize the session
             await self.agent_manager.initialize_session(self.openai_ws, "main_agent")
 
+            # Warm up the agent this one most likely hands off to
+            self.schedule_speculative_preconnect(initial_agent)
+
             # Start bidirectional communication
             await self._handle_stream()
 
@@ -46,12 +42,8 @@ class InboundVoiceHandler(BaseVoiceHandler):
     async def _handle_stream(self):
         """Handle bidirectional stream between Twilio and OpenAI."""
         try:
-            # Create tasks for receiving from Twilio and sending to Twilio
-            receive_task = self.receive_from_twilio(self.openai_ws)
-            send_task = self.send_to_twilio(self.openai_ws)
-
-            # Run both tasks concurrently
-            await asyncio.gather(receive_task, send_task)
+            # Run the Twilio and OpenAI readers/writers concurrently
+            await self.run_media_pipeline(self.openai_ws)
 
         except Exception as e:
             print(f"Error in stream handling: {e}")
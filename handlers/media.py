@@ -0,0 +1,53 @@
+"""Helpers for the Twilio <-> OpenAI media path."""
+
+import base64
+from config import INPUT_AUDIO_BATCH_MS
+from .codec import input_audio_append
+
+# g711_ulaw at 8 kHz: one byte per sample, eight samples per millisecond
+ULAW_BYTES_PER_MS = 8
+
+
+class InputAudioBatcher:
+    """Coalesces inbound Twilio media frames into fewer input_audio_buffer.append events.
+
+    Twilio delivers a 20 ms frame at a time; forwarding each one costs a
+    websocket send and a json.dumps. Frames are joined until the window is
+    full and then sent to OpenAI as a single append.
+    """
+
+    def __init__(self, window_ms: int = INPUT_AUDIO_BATCH_MS, transcode=None):
+        self.window_bytes = max(window_ms, 0) * ULAW_BYTES_PER_MS
+        # Optional payload conversion applied per batch (e.g. µ-law -> pcm16)
+        self.transcode = transcode
+        self._buffer = bytearray()
+        self._pending_payload = None
+
+    def add(self, payload: str) -> bool:
+        """Buffer a base64 µ-law payload. Returns True when the batch should be flushed."""
+        if not self.window_bytes:
+            # Batching disabled: keep the payload as-is and flush right away
+            self._pending_payload = payload
+            return True
+        self._buffer += base64.b64decode(payload)
+        return len(self._buffer) >= self.window_bytes
+
+    def drain(self):
+        """Return the buffered audio as a base64 string and reset the buffer."""
+        if self._pending_payload is not None:
+            payload, self._pending_payload = self._pending_payload, None
+            return payload
+        if not self._buffer:
+            return None
+        payload = base64.b64encode(self._buffer).decode("ascii")
+        self._buffer.clear()
+        return payload
+
+    async def flush(self, openai_ws):
+        """Send any buffered audio to OpenAI as one input_audio_buffer.append."""
+        payload = self.drain()
+        if payload is None or openai_ws is None or not openai_ws.open:
+            return
+        if self.transcode:
+            payload = self.transcode(payload)
+        await openai_ws.send(input_audio_append(payload))
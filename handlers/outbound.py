@@ -1,15 +1,14 @@
 """Outbound voice call handler: Agent Donna reach out to human recruiter for offer negotiation with competing offers"""
 
 import json
-import asyncio
 import websockets
 from config import (
-    OPENAI_API_KEY,
     PHONE_NUMBER_FROM,
     DOMAIN,
     SYSTEM_MESSAGE,
 )
 from .base import BaseVoiceHandler
+from .realtime import realtime_pool
 
 
 class OutboundVoiceHandler(BaseVoiceHandler):
@@ -20,19 +19,15 @@ class OutboundVoiceHandler(BaseVoiceHandler):
 
         try:
             # Get negotiation agent for outbound calls
-            initial_agent = self.agent_manager.get_agent("negotiation_agent")
-            self.openai_ws = await websockets.connect(
-                f"wss://api.openai.com/v1/realtime?model={initial_agent['model']}",
-                extra_headers={
-                    "Authorization": f"Bearer {OPENAI_API_KEY}",
-                    "OpenAI-Beta": "realtime=v1",
-                },
+            self.call_session = self.agent_manager.new_call_session(
+                "negotiation_agent"
             )
+            initial_agent = self.call_session.agent
+            self.openai_ws = await realtime_pool.acquire(initial_agent["model"])
 
             # Initialize active connections
             self.active_connections["voice"] = {
                 "ws": self.openai_ws,
-                "current_agent": initial_agent,
                 "stream_sid": None,
                 "latest_media_timestamp": 0,
             }
@@ -42,6 +37,9 @@ class OutboundVoiceHandler(BaseVoiceHandler):
                 self.openai_ws, "negotiation_agent"
             )
 
+            # Warm up the agent this one most likely hands off to
+            self.schedule_speculative_preconnect(initial_agent)
+
             # Start bidirectional communication
             await self._handle_stream()
 
@@ -94,12 +92,8 @@ class OutboundVoiceHandler(BaseVoiceHandler):
     async def _handle_stream(self):
         """Handle bidirectional stream between Twilio and OpenAI."""
         try:
-            # Create tasks for receiving from Twilio and sending to Twilio
-            receive_task = self.receive_from_twilio(self.openai_ws)
-            send_task = self.send_to_twilio(self.openai_ws)
-
-            # Run both tasks concurrently
-            await asyncio.gather(receive_task, send_task)
+            # Run the Twilio and OpenAI readers/writers concurrently
+            await self.run_media_pipeline(self.openai_ws)
 
         except Exception as e:
             print(f"Error in stream handling: {e}")
@@ -0,0 +1,134 @@
+"""Tracking of how much assistant audio the caller has actually heard."""
+
+import time
+from collections import deque
+from config import MARK_INTERVAL_MS
+from .media import ULAW_BYTES_PER_MS
+
+
+def base64_decoded_length(payload: str) -> int:
+    """Number of bytes a base64 string decodes to, without decoding it."""
+    length = len(payload)
+    if not length:
+        return 0
+    padding = 2 if payload.endswith("==") else 1 if payload.endswith("=") else 0
+    return length * 3 // 4 - padding
+
+
+class PlaybackClock:
+    """Per-call clock for the assistant audio item currently playing on Twilio.
+
+    Counts the µ-law bytes written to the Twilio socket for the current item
+    and reconciles that with the byte offsets acknowledged by returned ``mark``
+    events. Twilio plays audio in real time, so between acknowledgements the
+    position advances with the wall clock, capped at what has been sent.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Forget the current item (new response, truncation or clear)."""
+        self.item_id = None
+        self.bytes_sent = 0
+        self.bytes_acked = 0
+        self._started_at = None
+        self._acked_at = None
+
+    @property
+    def started(self) -> bool:
+        return self._started_at is not None
+
+    def on_audio_sent(self, item_id, payload: str) -> int:
+        """Record a base64 audio payload written to Twilio. Returns the new byte offset."""
+        if item_id != self.item_id:
+            self.reset()
+            self.item_id = item_id
+        if self._started_at is None:
+            self._started_at = time.monotonic()
+        self.bytes_sent += base64_decoded_length(payload)
+        return self.bytes_sent
+
+    def on_mark_acked(self, byte_offset: int):
+        """Twilio has played all audio up to byte_offset of the current item."""
+        if byte_offset > self.bytes_acked:
+            self.bytes_acked = min(byte_offset, self.bytes_sent)
+            self._acked_at = time.monotonic()
+
+    @property
+    def has_unacked_audio(self) -> bool:
+        """Whether audio has been written past the last acknowledged mark."""
+        return self.bytes_sent > self.bytes_acked
+
+    @property
+    def sent_ms(self) -> int:
+        return self.bytes_sent // ULAW_BYTES_PER_MS
+
+    @property
+    def acked_ms(self) -> int:
+        return self.bytes_acked // ULAW_BYTES_PER_MS
+
+    def played_ms(self) -> int:
+        """Best estimate of the audio position the caller has heard, in ms."""
+        if self._started_at is None:
+            return 0
+        if self._acked_at is not None:
+            anchor_ms, anchor_at = self.acked_ms, self._acked_at
+        else:
+            anchor_ms, anchor_at = 0, self._started_at
+        elapsed_ms = int((time.monotonic() - anchor_at) * 1000)
+        return max(self.acked_ms, min(anchor_ms + elapsed_ms, self.sent_ms))
+
+
+class MarkLedger:
+    """Outstanding Twilio marks, each mapped to a byte offset in an assistant item.
+
+    Marks are placed every ``interval_ms`` of forwarded audio (and at response
+    boundaries by the caller) rather than after every delta. Twilio echoes
+    marks back in order once the audio before them has played, so
+    acknowledgements are matched from the left of the deque.
+    """
+
+    def __init__(self, interval_ms: int = MARK_INTERVAL_MS):
+        self.interval_bytes = max(interval_ms, 0) * ULAW_BYTES_PER_MS
+        self._pending = deque()
+        self._sequence = 0
+        self._last_item_id = None
+        self._last_offset = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def due(self, item_id, byte_offset: int) -> bool:
+        """Whether enough audio has been sent since the last mark to place another."""
+        last_offset = self._last_offset if item_id == self._last_item_id else 0
+        return byte_offset - last_offset >= self.interval_bytes
+
+    def has_unmarked_audio(self, item_id, byte_offset: int) -> bool:
+        """Whether audio has been sent past the last mark for this item."""
+        last_offset = self._last_offset if item_id == self._last_item_id else 0
+        return byte_offset > last_offset
+
+    def record(self, item_id, byte_offset: int) -> str:
+        """Register a new mark at byte_offset of item_id and return its unique name."""
+        self._sequence += 1
+        name = f"m{self._sequence}"
+        self._pending.append((name, item_id, byte_offset))
+        self._last_item_id = item_id
+        self._last_offset = byte_offset
+        return name
+
+    def acknowledge(self, name: str):
+        """Consume an acknowledged mark. Returns (item_id, byte_offset) or None if unknown."""
+        if not any(entry[0] == name for entry in self._pending):
+            return None
+        while self._pending:
+            pending_name, item_id, byte_offset = self._pending.popleft()
+            if pending_name == name:
+                return item_id, byte_offset
+
+    def clear(self):
+        """Drop all outstanding marks (Twilio discards them on clear)."""
+        self._pending.clear()
+        self._last_item_id = None
+        self._last_offset = 0
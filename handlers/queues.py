@@ -0,0 +1,86 @@
+"""Bounded queues that decouple the Twilio and OpenAI sides of a call."""
+
+import asyncio
+from collections import deque
+
+
+class MediaQueue:
+    """Bounded FIFO between a reader task and a writer task.
+
+    Audio items are bounded by ``max_audio``: when the writer falls behind,
+    the oldest queued audio is dropped to make room. Control items (marks,
+    clear, stop, ...) are never dropped and keep their position in the stream.
+    """
+
+    def __init__(self, name: str, max_audio: int):
+        self.name = name
+        self.max_audio = max(max_audio, 1)
+        self._items = deque()
+        self._audio_count = 0
+        self._ready = asyncio.Event()
+        self.high_water = 0
+        self.enqueued = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def audio_count(self) -> int:
+        """Number of audio items queued."""
+        return self._audio_count
+
+    def put_audio(self, item):
+        """Queue an audio item, dropping the oldest queued audio on overflow."""
+        if self._audio_count >= self.max_audio:
+            self._drop_oldest_audio()
+        self._append(True, item)
+        self._audio_count += 1
+
+    def put_control(self, item):
+        """Queue a control item. Control items are never dropped."""
+        self._append(False, item)
+
+    def clear_audio(self) -> int:
+        """Discard all queued audio (e.g. on barge-in). Returns the number dropped."""
+        if not self._audio_count:
+            return 0
+        dropped = self._audio_count
+        self._items = deque(entry for entry in self._items if not entry[0])
+        self._audio_count = 0
+        return dropped
+
+    async def get(self):
+        """Wait for and return the next item."""
+        while not self._items:
+            self._ready.clear()
+            await self._ready.wait()
+        is_audio, item = self._items.popleft()
+        if is_audio:
+            self._audio_count -= 1
+        return item
+
+    def stats(self) -> dict:
+        """Queue depth metrics."""
+        return {
+            "queue": self.name,
+            "depth": len(self._items),
+            "high_water": self.high_water,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+        }
+
+    def _append(self, is_audio: bool, item):
+        self._items.append((is_audio, item))
+        self.enqueued += 1
+        if len(self._items) > self.high_water:
+            self.high_water = len(self._items)
+        self._ready.set()
+
+    def _drop_oldest_audio(self):
+        for index, (is_audio, _) in enumerate(self._items):
+            if is_audio:
+                del self._items[index]
+                self._audio_count -= 1
+                self.dropped += 1
+                return
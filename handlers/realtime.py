@@ -0,0 +1,186 @@
+"""OpenAI Realtime API connections and a process-wide warm connection pool."""
+
+import time
+import asyncio
+from collections import defaultdict, deque
+import websockets
+from config import (
+    OPENAI_API_KEY,
+    REALTIME_POOL_SIZE,
+    REALTIME_POOL_IDLE_TTL_S,
+    REALTIME_POOL_HEALTH_INTERVAL_S,
+    SESSION_READY_TIMEOUT_S,
+)
+from . import codec
+
+REALTIME_URL = "wss://api.openai.com/v1/realtime?model={model}"
+
+
+async def connect_realtime(model: str):
+    """Open an authenticated Realtime API websocket for the given model."""
+    return await websockets.connect(
+        REALTIME_URL.format(model=model),
+        extra_headers={
+            "Authorization": f"Bearer {OPENAI_API_KEY}",
+            "OpenAI-Beta": "realtime=v1",
+        },
+    )
+
+
+async def wait_for_event(ws, event_type: str, timeout: float):
+    """Read ws until an event of event_type arrives and return it.
+
+    Events read before it are consumed, so only use this on a socket nothing
+    else is reading yet. Raises asyncio.TimeoutError after timeout seconds and
+    RuntimeError if the server reports an error first.
+    """
+
+    async def _read():
+        while True:
+            event = codec.loads(await ws.recv())
+            if event.get("type") == event_type:
+                return event
+            if event.get("type") == "error":
+                raise RuntimeError(f"error while waiting for {event_type}: {event}")
+
+    return await asyncio.wait_for(_read(), timeout)
+
+
+class RealtimeConnectionPool:
+    """Pre-connected, pre-authenticated Realtime sockets keyed by model.
+
+    Every socket handed out, pooled or not, has already received its
+    ``session.created`` event, so a caller only has to send ``session.update``.
+    ``acquire`` falls back to a cold connect when the pool for a model is
+    empty, and refills in the background either way. Idle sockets older than
+    ``idle_ttl`` or failing a ping are closed and replaced.
+    """
+
+    def __init__(
+        self,
+        target_size: int = REALTIME_POOL_SIZE,
+        idle_ttl: float = REALTIME_POOL_IDLE_TTL_S,
+        health_interval: float = REALTIME_POOL_HEALTH_INTERVAL_S,
+        connect=connect_realtime,
+    ):
+        self.target_size = target_size
+        self.idle_ttl = idle_ttl
+        self.health_interval = health_interval
+        self._connect = connect
+        self._idle = defaultdict(deque)  # model -> deque of (ws, connected_at)
+        self._connecting = defaultdict(int)
+        self._models = set()
+        self._maintenance_task = None
+        self._refill_tasks = set()
+        self.hits = 0
+        self.misses = 0
+
+    def start(self, models):
+        """Start warming sockets for the given models (call from a running event loop)."""
+        self._models.update(models)
+        for model in self._models:
+            self._schedule_refill(model)
+        if self.target_size and self._maintenance_task is None:
+            self._maintenance_task = asyncio.create_task(self._maintain())
+
+    async def acquire(self, model: str):
+        """Take a warm socket for model, or connect a new one if none is idle."""
+        self._models.add(model)
+        idle = self._idle[model]
+        ws = None
+        while idle:
+            candidate, connected_at = idle.popleft()
+            if candidate.open and time.monotonic() - connected_at < self.idle_ttl:
+                ws = candidate
+                break
+            await self._discard(candidate)
+        self._schedule_refill(model)
+        if ws is not None:
+            self.hits += 1
+            return ws
+        self.misses += 1
+        return await self._warm_connection(model)
+
+    async def close(self):
+        """Stop maintenance and close every idle socket."""
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        for task in list(self._refill_tasks):
+            task.cancel()
+        for idle in self._idle.values():
+            while idle:
+                ws, _ = idle.popleft()
+                await self._discard(ws)
+
+    def stats(self) -> dict:
+        return {
+            "idle": {model: len(idle) for model, idle in self._idle.items()},
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _schedule_refill(self, model: str):
+        if not self.target_size:
+            return
+        task = asyncio.create_task(self._refill(model))
+        self._refill_tasks.add(task)
+        task.add_done_callback(self._refill_tasks.discard)
+
+    async def _refill(self, model: str):
+        while len(self._idle[model]) + self._connecting[model] < self.target_size:
+            self._connecting[model] += 1
+            try:
+                ws = await self._warm_connection(model)
+            except Exception as e:
+                print(f"Realtime pool: failed to warm a connection for {model}: {e}")
+                return
+            finally:
+                self._connecting[model] -= 1
+            self._idle[model].append((ws, time.monotonic()))
+
+    async def _warm_connection(self, model: str):
+        ws = await self._connect(model)
+        try:
+            await wait_for_event(ws, "session.created", SESSION_READY_TIMEOUT_S)
+        except BaseException:
+            await self._discard(ws)
+            raise
+        return ws
+
+    async def _maintain(self):
+        while True:
+            await asyncio.sleep(self.health_interval)
+            for model in list(self._models):
+                await self._check_idle(model)
+                self._schedule_refill(model)
+
+    async def _check_idle(self, model: str):
+        """Close idle sockets that expired or no longer answer pings."""
+        idle = self._idle[model]
+        for _ in range(len(idle)):
+            if not idle:  # drained by acquire while we were pinging
+                break
+            ws, connected_at = idle.popleft()
+            healthy = ws.open and time.monotonic() - connected_at < self.idle_ttl
+            if healthy:
+                try:
+                    pong = await ws.ping()
+                    await asyncio.wait_for(pong, self.health_interval / 2)
+                except Exception:
+                    healthy = False
+            if healthy:
+                idle.append((ws, connected_at))
+            else:
+                await self._discard(ws)
+
+    @staticmethod
+    async def _discard(ws):
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+
+# Keyed by model; calls and transfers on the same model draw from it
+realtime_pool = RealtimeConnectionPool()
@@ -0,0 +1,118 @@
+"""Local energy-based voice activity gate for inbound caller audio."""
+
+from collections import deque
+from config import (
+    VAD_THRESHOLD_DBFS,
+    VAD_HANGOVER_MS,
+    VAD_PREROLL_MS,
+    VAD_SILENCE_KEEP_EVERY,
+    LOCAL_BARGE_IN_THRESHOLD_DBFS,
+    LOCAL_BARGE_IN_MIN_SPEECH_MS,
+)
+from .audio import ulaw_bytes, ulaw_energy_dbfs
+from .media import ULAW_BYTES_PER_MS
+
+
+class VoiceActivityGate:
+    """Suppresses silent Twilio frames before they are forwarded to OpenAI.
+
+    A frame is speech when its energy is above ``threshold_dbfs``. After
+    speech, frames keep flowing for ``hangover_ms`` so the server-side VAD
+    still sees the trailing silence it needs to end the turn (keep this above
+    its silence_duration_ms). Silent frames are buffered for ``preroll_ms`` and
+    released ahead of the first speech frame so word onsets are not clipped.
+    With ``keep_every`` > 0, one in every ``keep_every`` silent frames is still
+    forwarded instead of dropping them all.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = VAD_THRESHOLD_DBFS,
+        hangover_ms: int = VAD_HANGOVER_MS,
+        preroll_ms: int = VAD_PREROLL_MS,
+        keep_every: int = VAD_SILENCE_KEEP_EVERY,
+    ):
+        self.threshold_dbfs = threshold_dbfs
+        self.hangover_bytes = hangover_ms * ULAW_BYTES_PER_MS
+        self.preroll_bytes = preroll_ms * ULAW_BYTES_PER_MS
+        self.keep_every = keep_every
+        self._preroll = deque()
+        self._preroll_size = 0
+        self._hangover_left = 0
+        self._silent_count = 0
+        self.frames_in = 0
+        self.frames_out = 0
+
+    def process(self, payload: str) -> list:
+        """Feed one base64 µ-law frame. Returns the frames to forward, in order."""
+        ulaw = ulaw_bytes(payload)
+        self.frames_in += 1
+
+        if ulaw_energy_dbfs(ulaw) >= self.threshold_dbfs:
+            frames = [buffered for buffered, _ in self._preroll]
+            frames.append(payload)
+            self._clear_preroll()
+            self._hangover_left = self.hangover_bytes
+            self._silent_count = 0
+        elif self._hangover_left > 0:
+            self._hangover_left -= len(ulaw)
+            frames = [payload]
+        else:
+            self._silent_count += 1
+            if self.keep_every and self._silent_count % self.keep_every == 0:
+                frames = [payload]
+            else:
+                self._buffer_preroll(payload, len(ulaw))
+                frames = []
+
+        self.frames_out += len(frames)
+        return frames
+
+    @property
+    def suppression_ratio(self) -> float:
+        """Fraction of inbound frames that were not forwarded."""
+        if not self.frames_in:
+            return 0.0
+        return 1.0 - self.frames_out / self.frames_in
+
+    def _buffer_preroll(self, payload: str, size: int):
+        self._preroll.append((payload, size))
+        self._preroll_size += size
+        while self._preroll_size > self.preroll_bytes and self._preroll:
+            _, dropped = self._preroll.popleft()
+            self._preroll_size -= dropped
+
+    def _clear_preroll(self):
+        self._preroll.clear()
+        self._preroll_size = 0
+
+
+class SpeechOnsetDetector:
+    """Detects the caller starting to talk from the inbound µ-law stream.
+
+    Fires once ``min_speech_ms`` of consecutive audio is above
+    ``threshold_dbfs``. The threshold sits well above the gate's so line
+    noise and faint echo of the assistant do not trigger a barge-in.
+    """
+
+    def __init__(
+        self,
+        threshold_dbfs: float = LOCAL_BARGE_IN_THRESHOLD_DBFS,
+        min_speech_ms: int = LOCAL_BARGE_IN_MIN_SPEECH_MS,
+    ):
+        self.threshold_dbfs = threshold_dbfs
+        self.min_speech_bytes = min_speech_ms * ULAW_BYTES_PER_MS
+        self._speech_bytes = 0
+
+    def process(self, payload: str) -> bool:
+        """Feed one base64 µ-law frame. Returns True on the frame where speech onset is detected."""
+        ulaw = ulaw_bytes(payload)
+        if ulaw_energy_dbfs(ulaw) < self.threshold_dbfs:
+            self._speech_bytes = 0
+            return False
+        was_below = self._speech_bytes < self.min_speech_bytes
+        self._speech_bytes += len(ulaw)
+        return was_below and self._speech_bytes >= self.min_speech_bytes
+
+    def reset(self):
+        self._speech_bytes = 0
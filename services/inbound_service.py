@@ -5,10 +5,11 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from twilio.twiml.voice_response import VoiceResponse, Connect
 from handlers.inbound import InboundVoiceHandler
 from agents.manager import AgentManager
+from services.lifespan import call_service_lifespan
 from config import INBOUND_PORT
 
-app = FastAPI()
 agent_manager = AgentManager()
+app = FastAPI(lifespan=call_service_lifespan(agent_manager))
 
 
 @app.get("/", response_class=JSONResponse)
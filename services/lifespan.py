@@ -0,0 +1,36 @@
+"""Startup and shutdown of the process-wide resources both call services use."""
+
+from contextlib import asynccontextmanager
+from agents.budget import print_session_payload_report
+from handlers.realtime import realtime_pool
+from tools import executor as tool_executor
+from tools.log_sink import log_sink
+from tools.salary_index import salary_benchmarks
+from tools.availability import candidate_calendar
+from tools.recruiter_directory import recruiter_directory
+
+
+def call_service_lifespan(agent_manager):
+    """FastAPI lifespan that warms shared resources and releases them on shutdown."""
+
+    @asynccontextmanager
+    async def lifespan(app):
+        # Pre-connect Realtime sockets for every agent model
+        realtime_pool.start({agent["model"] for agent in agent_manager.agents.values()})
+        # Load the salary benchmark index in the background
+        salary_benchmarks.warm()
+        # Index the candidate's calendar files before the first call
+        await candidate_calendar.refresh()
+        # Index the recruiter directory and reload it when the file changes
+        recruiter_directory.start()
+        print_session_payload_report(agent_manager)
+        try:
+            yield
+        finally:
+            await realtime_pool.close()
+            tool_executor.shutdown()
+            # Write out any queued recruiter/negotiation log records
+            await log_sink.close()
+            await recruiter_directory.close()
+
+    return lifespan
@@ -5,10 +5,11 @@ from fastapi import FastAPI, WebSocket, BackgroundTasks
 from fastapi.responses import JSONResponse
 from handlers.outbound import OutboundVoiceHandler
 from agents.manager import AgentManager
+from services.lifespan import call_service_lifespan
 from config import OUTBOUND_PORT
 
-app = FastAPI()
 agent_manager = AgentManager()
+app = FastAPI(lifespan=call_service_lifespan(agent_manager))
 
 
 @app.get("/", response_class=JSONResponse)
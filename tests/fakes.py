@@ -0,0 +1,82 @@
+"""In-memory stand-ins for the Twilio and OpenAI Realtime websockets."""
+
+import asyncio
+import base64
+import json
+
+import websockets.exceptions
+from fastapi.websockets import WebSocketDisconnect
+
+
+class FakeRealtimeSocket:
+    """Records client events; yields server events pushed by the test.
+
+    Like the server, it answers every session.update with session.updated.
+    """
+
+    def __init__(self, name="ws"):
+        self.name = name
+        self.sent = []
+        self.open = True
+        self._events = asyncio.Queue()
+
+    def push(self, event):
+        self._events.put_nowait(event)
+
+    def sent_types(self):
+        return [message["type"] for message in self.sent]
+
+    async def send(self, message):
+        if not self.open:
+            raise websockets.exceptions.ConnectionClosedOK(None, None)
+        event = json.loads(message)
+        self.sent.append(event)
+        if event["type"] == "session.update":
+            self.push({"type": "session.updated"})
+
+    async def recv(self):
+        event = await self._events.get()
+        if event is None:
+            self.open = False
+            raise websockets.exceptions.ConnectionClosedOK(None, None)
+        return json.dumps(event)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return await self.recv()
+        except websockets.exceptions.ConnectionClosedOK:
+            raise StopAsyncIteration
+
+    async def close(self):
+        if self.open:
+            self.open = False
+            self._events.put_nowait(None)
+
+
+class FakeTwilioSocket:
+    """Yields Twilio events pushed by the test (None hangs up); records sends."""
+
+    def __init__(self):
+        self.sent = []
+        self._events = asyncio.Queue()
+
+    def push(self, event):
+        self._events.put_nowait(event)
+
+    async def iter_text(self):
+        while True:
+            event = await self._events.get()
+            if event is None:
+                raise WebSocketDisconnect()
+            yield json.dumps(event)
+
+    async def send_text(self, message):
+        self.sent.append(json.loads(message))
+
+
+def ulaw_frame(silent=True, size=160):
+    """Base64 µ-law audio: digital silence, or a loud constant signal."""
+    return base64.b64encode(bytes([0xFF if silent else 0x10]) * size).decode()
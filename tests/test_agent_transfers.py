@@ -0,0 +1,134 @@
+import asyncio
+import json
+
+import pytest
+
+import handlers.base as base
+from agents.manager import AgentManager
+from fakes import FakeRealtimeSocket, FakeTwilioSocket
+from handlers.base import BaseVoiceHandler
+
+
+def transfer_call(destination, response_id="resp_transfer"):
+    return {
+        "type": "response.function_call_arguments.done",
+        "response_id": response_id,
+        "name": "transferAgents",
+        "call_id": "call_transfer",
+        "arguments": json.dumps(
+            {
+                "destination_agent": destination,
+                "rationale_for_transfer": "caller is a recruiter",
+                "conversation_context": "Sam from Acme",
+            }
+        ),
+    }
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """Sockets handed out by the realtime pool, in order."""
+    opened = []
+
+    async def acquire(model):
+        ws = FakeRealtimeSocket(name=f"pooled{len(opened)}")
+        opened.append(ws)
+        return ws
+
+    monkeypatch.setattr(base.realtime_pool, "acquire", acquire)
+    return opened
+
+
+class Call:
+    """A call on main_agent running the full media pipeline over fake sockets."""
+
+    def __init__(self, mode, speculation_budget=0):
+        manager = AgentManager()
+        manager.get_transfer_mode = lambda *_: mode
+        self.twilio = FakeTwilioSocket()
+        self.handler = BaseVoiceHandler(self.twilio, manager)
+        self.handler.call_session = manager.new_call_session("main_agent")
+        self.handler.speculation_budget = speculation_budget
+        self.ws = FakeRealtimeSocket(name="initial")
+        self.handler.openai_ws = self.ws
+        self.handler.active_connections["voice"] = {
+            "ws": self.ws,
+            "stream_sid": None,
+            "latest_media_timestamp": 0,
+        }
+        self.twilio.push({"event": "start", "start": {"streamSid": "MZ1"}})
+        self.task = asyncio.create_task(self.handler.run_media_pipeline(self.ws))
+
+    @property
+    def active_ws(self):
+        return self.handler.active_connections["voice"]["ws"]
+
+    async def hang_up(self):
+        self.twilio.push(None)
+        await self.active_ws.close()
+        await asyncio.wait_for(self.task, 2)
+
+
+async def settle():
+    await asyncio.sleep(0.05)
+
+
+def test_new_socket_transfer_waits_for_handoff_line(pool):
+    async def run():
+        call = Call("new_socket")
+        call.ws.push(transfer_call("authentication_agent"))
+        call.ws.push({"type": "response.done", "response": {"id": "resp_transfer"}})
+        await settle()
+        # The outgoing agent is still speaking its handoff line
+        assert call.active_ws is call.ws
+        assert pool[0].sent_types() == ["session.update", "conversation.item.create"]
+
+        call.ws.push({"type": "response.done", "response": {"id": "resp_handoff"}})
+        await settle()
+        assert call.active_ws is pool[0] and not call.ws.open
+        assert pool[0].sent_types()[-2:] == ["conversation.item.create", "response.create"]
+        assert call.handler.call_session.agent_name == "authentication_agent"
+        assert call.handler.call_session.transfer_context == "Sam from Acme"
+        await call.hang_up()
+
+    asyncio.run(run())
+
+
+def test_transfer_claims_speculative_session(pool):
+    async def run():
+        call = Call("new_socket", speculation_budget=1)
+        call.handler.schedule_speculative_preconnect(call.handler.call_session.agent)
+        await settle()
+        predicted = call.handler.speculative_session[0]
+        assert len(pool) == 1
+
+        call.ws.push(transfer_call(predicted))
+        await settle()
+        call.ws.push({"type": "response.done", "response": {"id": "resp_handoff"}})
+        await settle()
+        assert call.active_ws is pool[0]
+        assert len(pool) == 1
+        assert call.handler.call_session.agent_name == predicted
+        await call.hang_up()
+
+    asyncio.run(run())
+
+
+def test_in_session_switch_waits_for_transfer_response(pool):
+    async def run():
+        call = Call("session_update")
+        call.ws.push({"type": "response.created", "response": {"id": "resp_transfer"}})
+        call.ws.push(transfer_call("authentication_agent"))
+        await settle()
+        assert "session.update" in call.ws.sent_types()
+        assert "response.create" not in call.ws.sent_types()
+
+        call.ws.push({"type": "response.done", "response": {"id": "resp_transfer"}})
+        await settle()
+        assert call.ws.sent_types()[-1] == "response.create"
+        assert call.active_ws is call.ws
+        assert call.handler.call_session.agent_name == "authentication_agent"
+        assert pool == []
+        await call.hang_up()
+
+    asyncio.run(run())
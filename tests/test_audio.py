@@ -0,0 +1,71 @@
+import base64
+
+import numpy as np
+
+from handlers.audio import (
+    Downsampler,
+    PcmTranscoder,
+    Upsampler,
+    pcm16_to_ulaw,
+    ulaw_energy_dbfs,
+    ulaw_to_pcm16,
+)
+
+
+def tone(freq, rate, samples, amplitude=8000.0):
+    return amplitude * np.sin(2 * np.pi * freq * np.arange(samples) / rate)
+
+
+def test_every_ulaw_code_round_trips():
+    codes = np.arange(256, dtype=np.uint8)
+    decoded = ulaw_to_pcm16(codes)
+    # 0x7F and 0xFF both decode to zero; G.711 encodes zero as 0xFF
+    expected = np.where(codes == 0x7F, 0xFF, codes)
+    assert np.array_equal(pcm16_to_ulaw(decoded), expected)
+
+
+def test_known_ulaw_values():
+    assert ulaw_to_pcm16(np.array([0xFF, 0x00, 0x80], dtype=np.uint8)).tolist() == [
+        0,
+        -32124,
+        32124,
+    ]
+    assert ulaw_energy_dbfs(np.full(160, 0xFF, dtype=np.uint8)) == float("-inf")
+    assert -1 < ulaw_energy_dbfs(np.full(160, 0x80, dtype=np.uint8)) < 0
+
+
+def test_resamplers_change_the_rate_across_frames():
+    up, down = Upsampler(), Downsampler()
+    signal = tone(440, 8000, 800)
+    upsampled = np.concatenate([up.process(signal[i : i + 160]) for i in range(0, 800, 160)])
+    assert len(upsampled) == 2400
+    downsampled = np.concatenate(
+        [down.process(upsampled[i : i + 480]) for i in range(0, 2400, 480)]
+    )
+    assert len(downsampled) == 800
+
+
+def test_upsampled_tone_is_continuous_between_frames():
+    up = Upsampler()
+    signal = tone(440, 8000, 800)
+    chunked = np.concatenate([up.process(signal[i : i + 160]) for i in range(0, 800, 160)])
+    assert np.allclose(chunked, Upsampler().process(signal))
+
+
+def test_downsampler_rejects_out_of_band_tone():
+    down = Downsampler()
+    passed = down.process(tone(1000, 24000, 4800))[200:]
+    rejected = Downsampler().process(tone(9000, 24000, 4800))[200:]
+    assert np.abs(passed).max() > 7000
+    assert np.abs(rejected).max() < 200
+
+
+def test_transcoder_carries_odd_bytes_between_deltas():
+    transcoder = PcmTranscoder()
+    pcm = tone(440, 24000, 480).astype("<i2").tobytes()
+    first = transcoder.pcm16_to_ulaw(base64.b64encode(pcm[:101]).decode())
+    second = transcoder.pcm16_to_ulaw(base64.b64encode(pcm[101:]).decode())
+    assert len(base64.b64decode(first)) + len(base64.b64decode(second)) == 160
+
+    inbound = base64.b64encode(bytes([0xFF]) * 160).decode()
+    assert len(base64.b64decode(transcoder.ulaw_to_pcm16(inbound))) == 160 * 3 * 2
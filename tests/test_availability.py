@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from tools.availability import BusyIndex, CandidateCalendar
+
+TZ = ZoneInfo("America/Los_Angeles")
+# A Monday morning
+NOW = datetime(2030, 3, 4, 8, 0, tzinfo=TZ)
+
+
+def calendar(**kwargs):
+    return CandidateCalendar(paths=[], tz="America/Los_Angeles", **kwargs)
+
+
+def test_is_available_applies_minimum_notice():
+    cal = calendar(min_notice_hours=12)
+    too_soon = NOW.replace(hour=10)
+    assert not cal.is_available(too_soon, 30, now=NOW)
+    assert cal.is_available(too_soon + timedelta(days=1), 30, now=NOW)
+    assert cal.free_slots(30, days=[too_soon.date()], now=NOW) == []
+
+
+def epoch(hour, minute=0, day=NOW):
+    return int(day.replace(hour=hour, minute=minute).timestamp())
+
+
+def test_busy_index_merges_and_finds_overlaps():
+    index = BusyIndex([(epoch(10), epoch(11)), (epoch(9), epoch(10)), (epoch(13), epoch(12))])
+    assert len(index) == 1
+    assert index.is_free(epoch(11), epoch(12))
+    assert not index.is_free(epoch(10, 30), epoch(11, 30))
+    starts, ends = index.overlapping(epoch(8), epoch(9, 30))
+    assert starts.tolist() == [epoch(9)] and ends.tolist() == [epoch(11)]
+
+
+def test_free_slots_skip_busy_blocks_and_weekends():
+    cal = calendar(working_hours="09:00-12:00", min_notice_hours=0)
+    cal.index = BusyIndex([(epoch(9), epoch(10, 15))])
+    saturday = (NOW + timedelta(days=5)).date()
+    slots = cal.free_slots(60, days=[NOW.date(), saturday], now=NOW, per_day=3)
+    assert [slot.strftime("%H:%M") for slot in slots] == ["10:30", "11:00"]
+
+
+def test_free_slots_respect_already_booked_meetings():
+    cal = calendar(working_hours="09:00-11:00", min_notice_hours=0)
+    booked = [(epoch(9), epoch(10))]
+    slots = cal.free_slots(30, days=[NOW.date()], now=NOW, also_busy=booked)
+    assert [slot.strftime("%H:%M") for slot in slots] == ["10:00", "10:30"]
+    assert not cal.is_available(NOW.replace(hour=10, minute=45), 30, now=NOW)
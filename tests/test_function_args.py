@@ -0,0 +1,99 @@
+import asyncio
+import json
+
+from handlers.function_args import ArgumentPrefetcher, IncrementalJSONObject
+
+
+def test_members_complete_as_their_values_close():
+    parser = IncrementalJSONObject()
+    assert not parser.feed('{"role": "Soft')
+    assert parser.feed('ware Engineer", "years": 1')
+    assert parser.members == {"role": "Software Engineer"}
+    # A number is only known to be complete at the next delimiter
+    assert parser.feed("2, ")
+    assert parser.members["years"] == 12
+    assert parser.feed('"tags": ["a", "}"], "meta": {"x": [1]}}')
+    assert parser.members == {
+        "role": "Software Engineer",
+        "years": 12,
+        "tags": ["a", "}"],
+        "meta": {"x": [1]},
+    }
+
+
+def test_escaped_quotes_do_not_end_a_string():
+    parser = IncrementalJSONObject()
+    parser.feed('{"name": "Sam \\"the')
+    assert parser.members == {}
+    parser.feed(' recruiter\\""}')
+    assert parser.members == {"name": 'Sam "the recruiter"'}
+
+
+class RecordingExecutor:
+    """Runs nothing; remembers which tools the prefetcher started."""
+
+    def __init__(self):
+        self.runs = []
+
+    async def run(self, name, func, arguments, timeout):
+        self.runs.append((name, arguments))
+        return {"name": name}
+
+    def spawn(self, call_id, coro):
+        return asyncio.ensure_future(coro)
+
+
+def stream(prefetcher, name, arguments, call_id="call_1"):
+    prefetcher.observe(
+        {
+            "type": "response.output_item.added",
+            "item": {"type": "function_call", "name": name, "call_id": call_id},
+        }
+    )
+    text = json.dumps(arguments)
+    for i in range(0, len(text), 7):
+        prefetcher.observe(
+            {
+                "type": "response.function_call_arguments.delta",
+                "call_id": call_id,
+                "delta": text[i : i + 7],
+            }
+        )
+
+
+SALARY_ARGS = {"role": "Software Engineer", "location": "Seattle", "yearsOfExperience": 5}
+
+
+def test_prefetch_starts_once_required_arguments_are_known():
+    async def run():
+        executor = RecordingExecutor()
+        prefetcher = ArgumentPrefetcher(executor)
+        stream(prefetcher, "checkIndustrySalary", SALARY_ARGS)
+        task = prefetcher.claim("call_1", dict(SALARY_ARGS))
+        assert task is not None and await task == {"name": "checkIndustrySalary"}
+        assert executor.runs == [("checkIndustrySalary", SALARY_ARGS)]
+        assert prefetcher.stats() == {"started": 1, "confirmed": 1, "discarded": 0}
+
+    asyncio.run(run())
+
+
+def test_prefetch_is_discarded_when_final_arguments_differ():
+    async def run():
+        prefetcher = ArgumentPrefetcher(RecordingExecutor())
+        stream(prefetcher, "checkIndustrySalary", SALARY_ARGS)
+        final = dict(SALARY_ARGS, yearsOfExperience=6)
+        assert prefetcher.claim("call_1", final) is None
+        assert prefetcher.stats()["discarded"] == 1
+
+    asyncio.run(run())
+
+
+def test_tools_with_side_effects_are_not_prefetched():
+    async def run():
+        executor = RecordingExecutor()
+        prefetcher = ArgumentPrefetcher(executor)
+        stream(prefetcher, "transferAgents", {"destination_agent": "main_agent"})
+        assert prefetcher.claim("call_1", {"destination_agent": "main_agent"}) is None
+        assert executor.runs == []
+
+    asyncio.run(run())
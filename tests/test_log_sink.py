@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+from tools import log_sink as log_sink_module
+from tools.log_sink import JsonlLogSink
+
+
+def test_periodic_fsync_syncs_every_file_on_close(tmp_path, monkeypatch):
+    synced = []
+    real_fsync = log_sink_module.os.fsync
+
+    def fsync(fd):
+        synced.append(fd)
+        real_fsync(fd)
+
+    monkeypatch.setattr(log_sink_module.os, "fsync", fsync)
+    sink = JsonlLogSink(
+        directory=tmp_path, flush_interval=0.01, fsync="periodic", fsync_interval=1e9
+    )
+
+    async def run():
+        sink.write("recruiter", {"n": 1})
+        await asyncio.sleep(0.05)
+        assert synced == []
+        sink.write("negotiation", {"n": 2})
+        await sink.close()
+
+    asyncio.run(run())
+    assert len(synced) == 2
+    lines = [json.loads(line) for path in tmp_path.iterdir() for line in path.open()]
+    assert sorted(record["n"] for record in lines) == [1, 2]
+
+
+def test_close_drops_later_writes(tmp_path):
+    sink = JsonlLogSink(directory=tmp_path, flush_interval=0.01, fsync="never")
+
+    async def run():
+        assert sink.write("recruiter", {"n": 1})
+        await sink.close()
+        assert not sink.write("recruiter", {"n": 2})
+
+    asyncio.run(run())
+    assert sink.stats()["written"] == 1 and sink.dropped == 1
@@ -0,0 +1,46 @@
+import asyncio
+
+from handlers.queues import MediaQueue
+
+
+async def drain(queue):
+    return [await queue.get() for _ in range(len(queue))]
+
+
+def test_overflow_drops_the_oldest_audio_only():
+    async def run():
+        queue = MediaQueue("test", max_audio=2)
+        queue.put_audio("a1")
+        queue.put_control("mark")
+        queue.put_audio("a2")
+        queue.put_audio("a3")
+        assert queue.dropped == 1 and queue.audio_count == 2
+        return await drain(queue)
+
+    assert asyncio.run(run()) == ["mark", "a2", "a3"]
+
+
+def test_clear_audio_keeps_control_items_in_order():
+    async def run():
+        queue = MediaQueue("test", max_audio=10)
+        queue.put_audio("a1")
+        queue.put_control("mark")
+        queue.put_audio("a2")
+        queue.put_control("clear")
+        assert queue.clear_audio() == 2
+        assert queue.audio_count == 0
+        return await drain(queue)
+
+    assert asyncio.run(run()) == ["mark", "clear"]
+
+
+def test_get_waits_for_the_next_item():
+    async def run():
+        queue = MediaQueue("test", max_audio=1)
+        waiter = asyncio.create_task(queue.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        queue.put_audio("a1")
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(run()) == "a1"
@@ -0,0 +1,125 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from tools import scheduling
+from tools.executor import ToolExecutor
+from tools.meeting_store import MeetingStore, MeetingConflict
+
+TZ = ZoneInfo("America/Los_Angeles")
+START = datetime(2030, 3, 4, 9, 0, tzinfo=TZ)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = MeetingStore(tmp_path / "meetings.db")
+    monkeypatch.setattr(scheduling, "meeting_store", store)
+    return store
+
+
+def schedule(call_id, date_time="2030-03-04T10:00:00-08:00", email="recruiter@example.com"):
+    return scheduling.scheduleMeeting(
+        date_time, 45, "video", "Sam", "Acme", email, "initial_screening", call_id=call_id
+    )
+
+
+def test_retry_under_new_call_id_is_already_scheduled(store):
+    first = schedule("c1")
+    retry = schedule("c2", email="Recruiter@Example.com ")
+    assert first["status"] == "scheduled"
+    assert retry["status"] == "already_scheduled"
+    assert retry["meetingId"] == first["meetingId"]
+
+
+def test_other_participant_in_same_slot_conflicts(store):
+    schedule("c1")
+    assert schedule("c2", email="someone@else.com")["status"] == "conflict"
+
+
+def test_concurrent_threads_never_double_book(store):
+    slots = [START + timedelta(minutes=15 * i) for i in range(16)]
+
+    def book(i):
+        try:
+            return store.book(f"t{i}", slots[i % len(slots)], 30)[1]
+        except MeetingConflict:
+            return False
+
+    with ThreadPoolExecutor(16) as pool:
+        booked = sum(pool.map(book, range(200)))
+    rows = sorted(store.busy_between(0, 2**40))
+    assert booked == len(rows)
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(rows, rows[1:]))
+
+
+def _book_from_process(path, worker):
+    store = MeetingStore(path)
+    booked = 0
+    for j in range(25):
+        slot = START + timedelta(minutes=15 * ((worker * 7 + j) % 32))
+        try:
+            booked += store.book(f"p{worker}-{j}", slot, 30)[1]
+        except MeetingConflict:
+            pass
+    return booked
+
+
+def test_concurrent_processes_never_double_book(tmp_path):
+    path = tmp_path / "meetings.db"
+    with multiprocessing.get_context("spawn").Pool(4) as pool:
+        booked = sum(pool.starmap(_book_from_process, [(path, w) for w in range(4)]))
+    rows = sorted(MeetingStore(path).busy_between(0, 2**40))
+    assert booked == len(rows) > 0
+    assert all(end <= next_start for (_, end), (next_start, _) in zip(rows, rows[1:]))
+
+
+def _slow_schedule(**arguments):
+    time.sleep(0.3)
+    return scheduling.scheduleMeeting(**arguments)
+
+
+ARGUMENTS = {
+    "dateTime": "2030-03-04T10:00:00-08:00",
+    "duration": 45,
+    "format": "video",
+    "participantName": "Sam",
+    "participantOrg": "Acme",
+    "participantEmail": "recruiter@example.com",
+    "meetingType": "initial_screening",
+    "call_id": "c1",
+}
+
+
+def test_timed_out_booking_reports_what_was_committed(store):
+    executor = ToolExecutor(ThreadPoolExecutor(2))
+    result = asyncio.run(
+        executor.run(
+            "scheduleMeeting", _slow_schedule, ARGUMENTS, 0.2, scheduling.find_scheduled_meeting
+        )
+    )
+    assert result["status"] == "scheduled"
+
+
+def test_cancelled_booking_reports_what_was_committed(store):
+    executor = ToolExecutor(ThreadPoolExecutor(2))
+
+    async def cancel_midway():
+        task = asyncio.create_task(
+            executor.run(
+                "scheduleMeeting", _slow_schedule, ARGUMENTS, 5, scheduling.find_scheduled_meeting
+            )
+        )
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return await executor.settle(
+            "scheduleMeeting", scheduling.find_scheduled_meeting, ARGUMENTS
+        )
+
+    assert asyncio.run(cancel_midway())["status"] == "scheduled"
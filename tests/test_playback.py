@@ -0,0 +1,65 @@
+import base64
+
+from handlers import playback
+from handlers.playback import MarkLedger, PlaybackClock, base64_decoded_length
+
+
+def ulaw(ms):
+    return base64.b64encode(b"\xff" * (ms * 8)).decode()
+
+
+def test_base64_decoded_length():
+    for size in range(8):
+        payload = base64.b64encode(b"x" * size).decode()
+        assert base64_decoded_length(payload) == size
+
+
+def test_marks_are_placed_per_interval_and_item():
+    ledger = MarkLedger(interval_ms=100)
+    assert not ledger.due("item_a", 799)
+    assert ledger.due("item_a", 800)
+    first = ledger.record("item_a", 800)
+    assert not ledger.due("item_a", 1599)
+    assert not ledger.has_unmarked_audio("item_a", 800)
+    assert ledger.has_unmarked_audio("item_a", 900)
+    # Offsets restart with a new item
+    assert ledger.due("item_b", 800)
+    second = ledger.record("item_a", 1600)
+    assert first != second and len(ledger) == 2
+
+
+def test_acknowledging_a_mark_consumes_earlier_ones():
+    ledger = MarkLedger(interval_ms=100)
+    ledger.record("item_a", 800)
+    second = ledger.record("item_a", 1600)
+    assert ledger.acknowledge(second) == ("item_a", 1600)
+    assert len(ledger) == 0
+    assert ledger.acknowledge(second) is None
+
+
+def test_played_position_follows_wall_clock_between_acks(monkeypatch):
+    now = [10.0]
+    monkeypatch.setattr(playback.time, "monotonic", lambda: now[0])
+    clock = PlaybackClock()
+    assert clock.played_ms() == 0 and not clock.started
+
+    clock.on_audio_sent("item_a", ulaw(500))
+    now[0] += 0.25
+    assert clock.played_ms() == 250
+    now[0] += 1.0
+    # Never ahead of what was written to Twilio
+    assert clock.played_ms() == 500
+
+    clock.on_mark_acked(300 * 8)
+    assert clock.acked_ms == 300 and clock.has_unacked_audio
+    now[0] += 0.125
+    assert clock.played_ms() == 425
+
+
+def test_new_item_restarts_the_clock():
+    clock = PlaybackClock()
+    clock.on_audio_sent("item_a", ulaw(200))
+    clock.on_mark_acked(200 * 8)
+    assert not clock.has_unacked_audio
+    assert clock.on_audio_sent("item_b", ulaw(100)) == 800
+    assert clock.sent_ms == 100 and clock.acked_ms == 0
@@ -0,0 +1,43 @@
+import asyncio
+
+from tools import authentication
+from tools.recruiter_directory import WEIGHTS, RecruiterDirectory, RecruiterDirectoryWatcher
+
+
+def test_unavailable_directory_is_not_cached(monkeypatch):
+    monkeypatch.setattr(authentication, "recruiter_directory", RecruiterDirectoryWatcher(""))
+    cache = authentication.verifyRecruiterCredentials.cache
+    cache.clear()
+
+    result = asyncio.run(authentication.verifyRecruiterCredentials("Sam Lee", "Acme", "SWE"))
+    assert result["status"] == "unavailable" and not result["verified"]
+    assert cache.stats()["entries"] == 0
+
+
+DIRECTORY = RecruiterDirectory(
+    [
+        {"full_name": "Samantha Lee", "company": "Acme Inc", "position": "Recruiter"},
+        {"full_name": "Samuel Leeds", "company": "Globex LLC", "position": "Sourcer"},
+        {"full_name": "Jordan Park", "company": "Acme", "position": "Talent Partner"},
+    ]
+)
+
+
+def test_company_suffixes_are_ignored():
+    assert DIRECTORY.match_companies("ACME, Inc.") == [("acme", 1.0)]
+    assert DIRECTORY.match_companies("Initech") == []
+
+
+def test_lookup_tolerates_misspelled_names():
+    match = DIRECTORY.lookup("Samanta Lee", "Acme")
+    assert match["entry"]["full_name"] == "Samantha Lee"
+    assert match["company"] == 1.0 and 0.5 < match["name"] < 1.0
+    weighted = WEIGHTS["name"] * match["name"] + WEIGHTS["company"] * match["company"]
+    assert abs(match["confidence"] - weighted) <= 0.001
+
+
+def test_lookup_falls_back_to_names_for_unknown_companies():
+    match = DIRECTORY.lookup("Samuel Leeds", "Globex Corporation International")
+    assert match["entry"]["company"] == "Globex LLC"
+    assert match["name"] == 1.0 and match["company"] < 1.0
+    assert DIRECTORY.lookup("Zz", "Initech") is None
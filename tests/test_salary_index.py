@@ -0,0 +1,66 @@
+import asyncio
+import os
+import shutil
+import time
+from pathlib import Path
+
+from tools import negotiation
+from tools.salary_index import LazySalaryIndex
+
+DATASET = Path(__file__).resolve().parent / "fixtures" / "salary_benchmarks.csv"
+
+
+def touch(path, offset):
+    stamp = time.time() + offset
+    os.utime(path, (stamp, stamp))
+
+
+def test_retries_after_missing_dataset(tmp_path):
+    path = tmp_path / "salaries.csv"
+    benchmarks = LazySalaryIndex(str(path))
+
+    async def run():
+        assert await benchmarks.get() is None
+        shutil.copy(DATASET, path)
+        return await benchmarks.get()
+
+    assert asyncio.run(run()) is not None
+
+
+def test_reloads_when_dataset_changes(tmp_path):
+    path = tmp_path / "salaries.csv"
+    shutil.copy(DATASET, path)
+    benchmarks = LazySalaryIndex(str(path))
+    reloads = []
+    benchmarks.on_reload(lambda: reloads.append(benchmarks.index))
+
+    async def run():
+        first = await benchmarks.get()
+        assert await benchmarks.get() is first
+        touch(path, 5)
+        second = await benchmarks.get()
+        assert second is not None and second is not first
+
+    asyncio.run(run())
+    assert len(reloads) == 2
+
+
+def test_unconfigured_dataset_is_unavailable():
+    assert asyncio.run(LazySalaryIndex("").get()) is None
+
+
+def test_cached_tool_retries_until_dataset_loads(tmp_path, monkeypatch):
+    path = tmp_path / "salaries.csv"
+    monkeypatch.setattr(negotiation, "salary_benchmarks", LazySalaryIndex(str(path)))
+    negotiation.checkIndustrySalary.cache.clear()
+
+    async def run():
+        missing = await negotiation.checkIndustrySalary("Software Engineer", "San Francisco", 5)
+        shutil.copy(DATASET, path)
+        loaded = await negotiation.checkIndustrySalary("Software Engineer", "San Francisco", 5)
+        return missing, loaded
+
+    missing, loaded = asyncio.run(run())
+    assert missing["status"] == "unavailable"
+    assert loaded["p50"] > 0
+    negotiation.checkIndustrySalary.cache.clear()
@@ -0,0 +1,16 @@
+import agents.manager as manager_module
+from agents.budget import session_payload_budget
+from agents.manager import AgentManager
+
+
+def test_in_session_handoff_agents_get_dedup_delivery(monkeypatch):
+    monkeypatch.setattr(manager_module, "AGENT_TRANSFER_MODE", "session_update")
+    manager = AgentManager()
+    report = session_payload_budget(manager)
+
+    # scheduling_agent hands off to nobody, so keeps the configured mode
+    assert report["scheduling_agent"]["delivery"] == manager.payload_mode
+    assert report["main_agent"]["delivery"] == "dedup"
+    for name, row in report.items():
+        has_context_item = manager.session_payloads[name]["context_message"] is not None
+        assert has_context_item == (row["delivery"] == "full")
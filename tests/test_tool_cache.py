@@ -0,0 +1,88 @@
+import asyncio
+
+from tools import cache as tool_cache
+from tools.cache import cached_tool
+
+
+def counting_tool(ttl=60, max_entries=8, delay=0):
+    calls = []
+
+    @cached_tool(ttl=ttl, max_entries=max_entries)
+    async def lookup(role: str, years: int = 0):
+        calls.append((role, years))
+        await asyncio.sleep(delay)
+        return {"role": role, "years": years}
+
+    return lookup, calls
+
+
+def test_normalized_arguments_share_an_entry():
+    lookup, calls = counting_tool()
+
+    async def run():
+        await lookup("Software Engineer ", 5)
+        await lookup("software  engineer", years=5.0)
+
+    asyncio.run(run())
+    assert len(calls) == 1
+    assert lookup.cache.stats()["hits"] == 1
+
+
+def test_concurrent_calls_share_one_computation():
+    lookup, calls = counting_tool(delay=0.01)
+
+    async def run():
+        return await asyncio.gather(*(lookup("SRE", 3) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert lookup.cache.stats()["in_flight"] == 0
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    lookup, calls = counting_tool(ttl=10)
+    clock = [100.0]
+    monkeypatch.setattr(tool_cache.time, "monotonic", lambda: clock[0])
+
+    async def run():
+        await lookup("SRE")
+        clock[0] += 9
+        await lookup("SRE")
+        clock[0] += 2
+        await lookup("SRE")
+
+    asyncio.run(run())
+    assert len(calls) == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    lookup, calls = counting_tool(max_entries=2)
+
+    async def run():
+        await lookup("a")
+        await lookup("b")
+        await lookup("a")
+        await lookup("c")
+        await lookup("a")
+        await lookup("b")
+
+    asyncio.run(run())
+    assert calls == [("a", 0), ("b", 0), ("c", 0), ("b", 0)]
+
+
+def test_unavailable_results_are_not_cached():
+    calls = []
+
+    @cached_tool(ttl=60, max_entries=8)
+    async def lookup(role: str):
+        calls.append(role)
+        return {"status": "unavailable"}
+
+    async def run():
+        await lookup("SRE")
+        await lookup("SRE")
+
+    asyncio.run(run())
+    assert len(calls) == 2
+    assert lookup.cache.stats()["entries"] == 0
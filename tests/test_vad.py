@@ -0,0 +1,51 @@
+import base64
+
+from fakes import ulaw_frame
+from handlers.vad import SpeechOnsetDetector, VoiceActivityGate
+
+SILENCE = ulaw_frame(silent=True)
+SPEECH = ulaw_frame(silent=False)
+
+
+def gate(**kwargs):
+    defaults = {"threshold_dbfs": -45, "hangover_ms": 40, "preroll_ms": 40, "keep_every": 0}
+    return VoiceActivityGate(**{**defaults, **kwargs})
+
+
+def test_silence_is_suppressed():
+    vad = gate()
+    assert all(vad.process(SILENCE) == [] for _ in range(10))
+    assert vad.suppression_ratio == 1.0
+
+
+def test_preroll_is_released_ahead_of_speech():
+    vad = gate()
+    # Distinct near-silent frames (µ-law codes around zero)
+    frames = [
+        base64.b64encode(bytes([code]) * 160).decode() for code in (0xFF, 0x7F, 0xFE, 0x7E)
+    ]
+    for frame in frames:
+        vad.process(frame)
+    # 40 ms of preroll holds the last two 20 ms frames
+    assert vad.process(SPEECH) == frames[2:] + [SPEECH]
+
+
+def test_hangover_forwards_trailing_silence():
+    vad = gate()
+    vad.process(SPEECH)
+    assert vad.process(SILENCE) == [SILENCE]
+    assert vad.process(SILENCE) == [SILENCE]
+    assert vad.process(SILENCE) == []
+
+
+def test_keep_every_forwards_some_silence():
+    vad = gate(keep_every=3)
+    forwarded = [len(vad.process(SILENCE)) for _ in range(6)]
+    assert forwarded == [0, 0, 1, 0, 0, 1]
+
+
+def test_onset_fires_once_after_sustained_speech():
+    detector = SpeechOnsetDetector(threshold_dbfs=-30, min_speech_ms=60)
+    assert [detector.process(SPEECH) for _ in range(4)] == [False, False, True, False]
+    detector.process(SILENCE)
+    assert [detector.process(SPEECH) for _ in range(3)] == [False, False, True]
@@ -1,10 +1,15 @@
 """Tool registration and management."""
 
-from typing import Dict, Callable, Awaitable, Any
+from typing import Callable, Any
+from config import TOOL_TIMEOUT_S
 from tools.authentication import verifyRecruiterCredentials
 
 from tools.info_tesk import lookupCareerInfo, logRecruiterRequest
-from tools.scheduling import returnAvailableDateTime, scheduleMeeting
+from tools.scheduling import (
+    returnAvailableDateTime,
+    scheduleMeeting,
+    find_scheduled_meeting,
+)
 from tools.negotiation import checkCurrentOffer, checkIndustrySalary, logFinalOffer
 from agents.definitions import ALLOWED_CAREER_FIELDS
 
@@ -21,11 +26,54 @@ TOOL_REGISTRY = {
 }
 
 
-def get_tool_implementation(name: str) -> Callable[..., Awaitable[Any]]:
-    """Get the implementation for a tool by name."""
+# Per-tool timeouts in seconds; anything not listed uses TOOL_TIMEOUT_S
+TOOL_TIMEOUTS = {
+    "verifyRecruiterCredentials": 5,
+    "lookupCareerInfo": 5,
+    "checkCurrentOffer": 5,
+    "checkIndustrySalary": 5,
+    "scheduleMeeting": 15,
+}
+
+
+# Thread-pool tools with side effects keep running after a timeout or
+# cancellation; their reconciler is called with the same arguments once the
+# thread is done and returns what the call actually did (or None)
+TOOL_RECONCILERS = {
+    "scheduleMeeting": find_scheduled_meeting,
+}
+
+
+# Read-only tools whose result depends only on their arguments. The handler may
+# start them while the model is still streaming the arguments.
+PREFETCH_SAFE_TOOLS = {
+    "verifyRecruiterCredentials",
+    "lookupCareerInfo",
+    "returnAvailableDateTime",
+    "checkCurrentOffer",
+    "checkIndustrySalary",
+}
+
+
+def get_tool_implementation(name: str) -> Callable[..., Any]:
+    """Get the implementation for a tool by name.
+
+    Coroutine functions run on the event loop; plain functions are treated as
+    blocking and run in the tool executor's thread pool.
+    """
     return TOOL_REGISTRY.get(name)
 
 
+def get_tool_timeout(name: str) -> float:
+    """Timeout in seconds for a tool call."""
+    return TOOL_TIMEOUTS.get(name, TOOL_TIMEOUT_S)
+
+
+def get_tool_reconciler(name: str):
+    """Function reporting a side-effect tool's outcome after a timeout or cancel, or None."""
+    return TOOL_RECONCILERS.get(name)
+
+
 # Tool definitions for agents
 AUTHENTICATION_TOOLS = [
     {
@@ -273,6 +321,18 @@ NEGOTIATION_TOOLS = [
 ]
 
 
+def get_prefetch_requirements(name: str):
+    """Required argument names of a prefetch-safe tool, or None for other tools."""
+    return _PREFETCH_REQUIREMENTS.get(name)
+
+
+_PREFETCH_REQUIREMENTS = {
+    tool["name"]: tuple(tool["parameters"].get("required", ()))
+    for tool in AUTHENTICATION_TOOLS + INFO_DESK_TOOLS + SCHEDULING_TOOLS + NEGOTIATION_TOOLS
+    if tool["name"] in PREFETCH_SAFE_TOOLS
+}
+
+
 def get_tools_for_agent(agent_type: str) -> list:
     """Get the appropriate tools for an agent type."""
     if agent_type == "authentication_agent":
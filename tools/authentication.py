@@ -1,8 +1,44 @@
 """Authentication-related tools."""
 
+from typing import Dict, Any
+from tools.cache import cached_tool
+from tools.recruiter_directory import recruiter_directory, is_verified
 
+
+@cached_tool()
 async def verifyRecruiterCredentials(
     fullName: str, company: str, position: str
-) -> bool:
-    """Verifies the recruiter's credentials against our database"""
-    return True
+) -> Dict[str, Any]:
+    """Verifies the recruiter's credentials against our database
+
+    Returns:
+        Whether the recruiter is verified, the match confidence (0-1) and
+        the directory entry they were matched to
+    """
+    directory = await recruiter_directory.get()
+    if directory is None:
+        # Not cached: the directory may be configured or appear later
+        return {
+            "status": "unavailable",
+            "verified": False,
+            "confidence": 0.0,
+            "message": "Recruiter directory unavailable",
+        }
+    # position is the job being discussed, not the recruiter's own title
+    match = directory.lookup(fullName, company)
+    if match is None:
+        return {"verified": False, "confidence": 0.0}
+    entry = match["entry"]
+    return {
+        "verified": is_verified(match),
+        "confidence": match["confidence"],
+        "matched": {
+            "fullName": entry["full_name"],
+            "company": entry["company"],
+            "position": entry["position"],
+        },
+    }
+
+
+# A reloaded directory invalidates earlier answers
+recruiter_directory.on_reload(verifyRecruiterCredentials.cache.clear)
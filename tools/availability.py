@@ -0,0 +1,277 @@
+"""Candidate availability computed from local calendar files.
+
+Busy blocks are read from ICS (VEVENT DTSTART/DTEND or DURATION) and JSON
+(``[{"start": iso, "end": iso}, ...]`` or ``{"busy": [...]}``) files and
+merged into two sorted epoch-second arrays. Free slots are found by walking
+the candidate's working hours over a rolling window and bisecting into those
+arrays, so the cost depends on the days searched, not the calendar size.
+Recurring events (RRULE) are not expanded.
+"""
+
+import os
+import json
+import asyncio
+from datetime import datetime, date, time, timedelta, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import numpy as np
+from config import (
+    CALENDAR_PATHS,
+    CANDIDATE_TIMEZONE,
+    CANDIDATE_WORKING_HOURS,
+    AVAILABILITY_WINDOW_DAYS,
+    AVAILABILITY_MIN_NOTICE_HOURS,
+)
+
+SLOT_STEP_S = 30 * 60
+MAX_SLOTS = 6
+MAX_SLOTS_PER_DAY = 2
+
+
+class BusyIndex:
+    """Non-overlapping busy intervals as sorted start/end epoch-second arrays."""
+
+    def __init__(self, intervals=()):
+        merged = []
+        for start, end in sorted(intervals):
+            if end <= start:
+                continue
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+            else:
+                merged.append([start, end])
+        self.starts = np.array([s for s, _ in merged], dtype=np.int64)
+        self.ends = np.array([e for _, e in merged], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlapping(self, start: int, end: int):
+        """(starts, ends) of busy blocks overlapping [start, end)."""
+        first = int(np.searchsorted(self.ends, start, side="right"))
+        last = int(np.searchsorted(self.starts, end, side="left"))
+        return self.starts[first:last], self.ends[first:last]
+
+    def is_free(self, start: int, end: int) -> bool:
+        return not len(self.overlapping(start, end)[0])
+
+
+def _parse_ics_time(value: str, params: dict, default_tz) -> datetime:
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.combine(datetime.strptime(value, "%Y%m%d").date(), time(), default_tz)
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    tz = ZoneInfo(params["TZID"]) if "TZID" in params else default_tz
+    return datetime.strptime(value, "%Y%m%dT%H%M%S").replace(tzinfo=tz)
+
+
+def _parse_ics_duration(value: str) -> timedelta:
+    """Subset of RFC 5545 durations: P[nW][nD][T[nH][nM][nS]]."""
+    total, number = timedelta(), ""
+    units = {"W": "weeks", "D": "days", "H": "hours", "M": "minutes", "S": "seconds"}
+    for char in value.lstrip("+P"):
+        if char.isdigit():
+            number += char
+        elif char in units:
+            total += timedelta(**{units[char]: int(number or 0)})
+            number = ""
+    return total
+
+
+def read_ics(path: str, default_tz):
+    """Busy (start, end) epoch seconds for every VEVENT in an ICS file."""
+    with open(path, encoding="utf-8") as f:
+        raw = f.read().replace("\r\n", "\n")
+    # Unfold continuation lines
+    lines = raw.replace("\n ", "").replace("\n\t", "").split("\n")
+    intervals, event = [], None
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            event = {}
+        elif line == "END:VEVENT" and event is not None:
+            # Events marked free (TRANSP:TRANSPARENT) don't block time
+            if "DTSTART" in event and event.get("TRANSP", ("",))[0] != "TRANSPARENT":
+                start = _parse_ics_time(*event["DTSTART"], default_tz)
+                if "DTEND" in event:
+                    end = _parse_ics_time(*event["DTEND"], default_tz)
+                elif "DURATION" in event:
+                    end = start + _parse_ics_duration(event["DURATION"][0])
+                else:
+                    end = start + timedelta(days=1 if len(event["DTSTART"][0]) == 8 else 0)
+                intervals.append((int(start.timestamp()), int(end.timestamp())))
+            event = None
+        elif event is not None and ":" in line:
+            name_and_params, value = line.split(":", 1)
+            name, *param_list = name_and_params.split(";")
+            params = dict(p.split("=", 1) for p in param_list if "=" in p)
+            event[name.upper()] = (value.strip(), params)
+    return intervals
+
+
+def read_json(path: str, default_tz):
+    """Busy (start, end) epoch seconds from a JSON list of {"start", "end"}."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("busy", [])
+    intervals = []
+    for block in data:
+        start, end = (datetime.fromisoformat(block[key]) for key in ("start", "end"))
+        start = start if start.tzinfo else start.replace(tzinfo=default_tz)
+        end = end if end.tzinfo else end.replace(tzinfo=default_tz)
+        intervals.append((int(start.timestamp()), int(end.timestamp())))
+    return intervals
+
+
+def _parse_working_hours(spec: str):
+    opening, closing = (time.fromisoformat(part.strip()) for part in spec.split("-"))
+    return opening, closing
+
+
+class CandidateCalendar:
+    """Busy index over the candidate's calendar files, reloaded when they change."""
+
+    def __init__(
+        self,
+        paths=CALENDAR_PATHS,
+        tz: str = CANDIDATE_TIMEZONE,
+        working_hours: str = CANDIDATE_WORKING_HOURS,
+        window_days: int = AVAILABILITY_WINDOW_DAYS,
+        min_notice_hours: float = AVAILABILITY_MIN_NOTICE_HOURS,
+    ):
+        self.paths = list(paths)
+        self.tz = ZoneInfo(tz)
+        self.opening, self.closing = _parse_working_hours(working_hours)
+        self.window_days = window_days
+        self.min_notice = timedelta(hours=min_notice_hours)
+        self.index = BusyIndex()
+        self._mtimes = None
+        self._lock = asyncio.Lock()
+
+    async def refresh(self):
+        """Reload the calendar files in a worker thread if any of them changed."""
+        mtimes = tuple(
+            os.path.getmtime(path) if os.path.exists(path) else None
+            for path in self.paths
+        )
+        if mtimes == self._mtimes:
+            return
+        async with self._lock:
+            if mtimes != self._mtimes:
+                self.index = await asyncio.to_thread(self._load)
+                self._mtimes = mtimes
+
+    def _load(self) -> BusyIndex:
+        intervals = []
+        for path in self.paths:
+            if not os.path.exists(path):
+                print(f"Calendar file not found: {path}")
+                continue
+            try:
+                reader = read_json if path.endswith(".json") else read_ics
+                intervals.extend(reader(path, self.tz))
+            except Exception as e:
+                print(f"Failed to read calendar {path}: {e}")
+        index = BusyIndex(intervals)
+        print(f"Loaded {len(index)} busy blocks from {len(self.paths)} calendar file(s)")
+        return index
+
+    def free_slots(
+        self,
+        duration_min: int,
+        days=None,
+        now: datetime = None,
+        max_slots: int = MAX_SLOTS,
+        per_day: int = MAX_SLOTS_PER_DAY,
+        also_busy=(),
+    ):
+        """Start times (aware datetimes) of free working-hour slots.
+
+        Searches the rolling window, or only the given dates (candidate's
+        local calendar days) when ``days`` is set. ``also_busy`` holds extra
+        (start, end) epoch-second blocks, such as meetings already booked.
+        """
+        also_busy = sorted(also_busy)
+        now = now or datetime.now(self.tz)
+        earliest = int((now + self.min_notice).timestamp())
+        duration = int(duration_min) * 60
+        if days is None:
+            today = now.astimezone(self.tz).date()
+            days = [today + timedelta(days=offset) for offset in range(self.window_days + 1)]
+
+        slots = []
+        for day in days:
+            if day.weekday() >= 5:
+                continue
+            opening = int(datetime.combine(day, self.opening, self.tz).timestamp())
+            closing = int(datetime.combine(day, self.closing, self.tz).timestamp())
+            cursor = max(opening, earliest)
+            # Align to the slot grid measured from opening time
+            cursor = opening + -(-(cursor - opening) // SLOT_STEP_S) * SLOT_STEP_S
+            busy_starts, busy_ends = self.index.overlapping(cursor, closing)
+            busy = list(zip(busy_starts.tolist(), busy_ends.tolist()))
+            if also_busy:
+                busy = sorted(
+                    busy + [(s, e) for s, e in also_busy if s < closing and e > cursor]
+                )
+            found = 0
+            for busy_start, busy_end in busy + [(closing, closing)]:
+                while cursor + duration <= min(busy_start, closing) and found < per_day:
+                    slots.append(datetime.fromtimestamp(cursor, self.tz))
+                    found += 1
+                    cursor += SLOT_STEP_S
+                if found >= per_day:
+                    break
+                if busy_end > cursor:
+                    cursor = opening + -(-(busy_end - opening) // SLOT_STEP_S) * SLOT_STEP_S
+            if len(slots) >= max_slots:
+                return slots[:max_slots]
+        return slots
+
+    def window(self, now: datetime = None):
+        """(start, end) epoch seconds of the rolling search window."""
+        now = now or datetime.now(self.tz)
+        return int(now.timestamp()), int(
+            (now + timedelta(days=self.window_days + 1)).timestamp()
+        )
+
+    def is_available(
+        self, start: datetime, duration_min: int, now: datetime = None
+    ) -> bool:
+        """Whether [start, start + duration) is free and inside working hours.
+
+        As in free_slots, nothing sooner than the minimum notice is available.
+        """
+        now = now or datetime.now(self.tz)
+        local = start.astimezone(self.tz)
+        end = local + timedelta(minutes=int(duration_min))
+        if (
+            local < now + self.min_notice
+            or local.weekday() >= 5
+            or local.time() < self.opening
+            or end.date() != local.date()
+            or end.time() > self.closing
+        ):
+            return False
+        return self.index.is_free(int(local.timestamp()), int(end.timestamp()))
+
+
+def resolve_timezone(name: str, fallback):
+    try:
+        return ZoneInfo(name) if name else fallback
+    except (ZoneInfoNotFoundError, ValueError):
+        return fallback
+
+
+def parse_suggestion(value: str, tz):
+    """A suggested date (date) or date-time (aware datetime in tz if naive)."""
+    value = str(value).strip()
+    try:
+        if len(value) <= 10:
+            return date.fromisoformat(value)
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+
+
+candidate_calendar = CandidateCalendar()
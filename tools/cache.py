@@ -0,0 +1,121 @@
+"""TTL/LRU memoization for idempotent async tools.
+
+Arguments are normalized before keying (strings are whitespace- and
+case-folded), so "Software Engineer " and "software  engineer" share an entry.
+Concurrent calls with the same key share one computation (single-flight).
+Results with ``"status": "unavailable"`` (the tool's data source isn't loaded
+yet) are returned but not cached, so the next call retries.
+"""
+
+import time
+import asyncio
+import functools
+import inspect
+from collections import OrderedDict
+from config import TOOL_CACHE_TTL_S, TOOL_CACHE_MAX_ENTRIES
+
+
+def normalize_argument(value):
+    """Fold case and whitespace in strings; make numbers and containers hashable."""
+    if isinstance(value, str):
+        return " ".join(value.split()).casefold()
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize_argument(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, normalize_argument(item)) for key, item in value.items()))
+    return value
+
+
+def is_cacheable(result) -> bool:
+    return not (isinstance(result, dict) and result.get("status") == "unavailable")
+
+
+class ToolCache:
+    """LRU of (expires_at, result) entries plus in-flight computations."""
+
+    def __init__(self, func, ttl: float, max_entries: int):
+        self.func = func
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._signature = inspect.signature(func)
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *args, **kwargs):
+        bound = self._signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        return tuple(
+            (name, normalize_argument(value)) for name, value in bound.arguments.items()
+        )
+
+    async def call(self, *args, **kwargs):
+        key = self.key(*args, **kwargs)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if time.monotonic() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            del self._entries[key]
+
+        task = self._in_flight.get(key)
+        if task is None:
+            self.misses += 1
+            task = asyncio.create_task(self._compute(key, args, kwargs))
+            self._in_flight[key] = task
+        else:
+            self.hits += 1
+        # A caller cancelled by barge-in must not cancel the shared computation
+        return await asyncio.shield(task)
+
+    async def _compute(self, key, args, kwargs):
+        try:
+            result = await self.func(*args, **kwargs)
+        finally:
+            self._in_flight.pop(key, None)
+        # Failures are not cached
+        if not is_cacheable(result):
+            return result
+        self._entries[key] = (time.monotonic() + self.ttl, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return result
+
+    def invalidate(self, *args, **kwargs) -> bool:
+        """Drop the entry for these arguments. Returns whether one existed."""
+        return self._entries.pop(self.key(*args, **kwargs), None) is not None
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def cached_tool(ttl: float = TOOL_CACHE_TTL_S, max_entries: int = TOOL_CACHE_MAX_ENTRIES):
+    """Cache an idempotent async tool; the wrapper's ``cache`` is its ToolCache."""
+
+    def decorator(func):
+        cache = ToolCache(func, ttl, max_entries)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await cache.call(*args, **kwargs)
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,115 @@
+"""Runs tool implementations off the media path with timeouts and cancellation.
+
+Coroutine tools run as tasks on the event loop; plain functions (blocking I/O)
+run in a process-wide thread pool. A tool that fails, times out or is
+cancelled produces a structured error for the model instead of a result.
+"""
+
+import asyncio
+import functools
+import inspect
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from config import TOOL_EXECUTOR_THREADS
+
+# Blocking tools from every call share these threads
+_thread_pool = ThreadPoolExecutor(
+    max_workers=TOOL_EXECUTOR_THREADS, thread_name_prefix="tool"
+)
+
+
+def tool_error(name: str, error: str, message: str) -> dict:
+    """Function call output reporting that a tool did not produce a result."""
+    return {"status": "error", "tool": name, "error": error, "message": message}
+
+
+class ToolExecutor:
+    """In-flight tool calls for one phone call.
+
+    ``spawn`` tracks a task per function call id so everything still running
+    can be cancelled at once on barge-in or hangup.
+    """
+
+    def __init__(self, thread_pool: ThreadPoolExecutor = _thread_pool):
+        self._thread_pool = thread_pool
+        self._tasks = {}  # call_id -> asyncio.Task
+
+    def __len__(self):
+        return len(self._tasks)
+
+    async def run(self, name: str, func, arguments: dict, timeout: float, reconcile=None):
+        """Call func(**arguments), returning its result or a tool_error dict.
+
+        A thread-pool tool that times out keeps running in its thread; only
+        the wait for it is abandoned. For a tool with side effects pass
+        ``reconcile``: after a timeout the tool is given up to ``timeout``
+        more to finish and the reconciler's answer is returned instead of an
+        error when it finds the side effect; on cancellation the tool is
+        likewise allowed to finish before CancelledError propagates, so a
+        following ``settle`` sees its outcome.
+        """
+        try:
+            inspect.signature(func).bind(**arguments)
+        except TypeError as e:
+            print(f"Invalid arguments for {name}: {e}")
+            return tool_error(name, "invalid_arguments", str(e))
+        try:
+            if inspect.iscoroutinefunction(func):
+                pending = func(**arguments)
+            else:
+                loop = asyncio.get_running_loop()
+                pending = loop.run_in_executor(
+                    self._thread_pool, functools.partial(func, **arguments)
+                )
+            if reconcile is None:
+                return await asyncio.wait_for(pending, timeout)
+            pending = asyncio.ensure_future(pending)
+            return await asyncio.wait_for(asyncio.shield(pending), timeout)
+        except asyncio.TimeoutError:
+            print(f"Tool {name} timed out after {timeout}s")
+            if reconcile is not None:
+                await asyncio.wait({pending}, timeout=timeout)
+                settled = await self.settle(name, reconcile, arguments)
+                if settled is not None:
+                    return settled
+            return tool_error(name, "timeout", f"{name} did not finish within {timeout}s")
+        except asyncio.CancelledError:
+            if reconcile is not None and not pending.done():
+                await asyncio.wait({pending}, timeout=timeout)
+            raise
+        except Exception as e:
+            print(f"Error executing {name}: {e}")
+            traceback.print_exc()
+            return tool_error(name, "exception", str(e))
+
+    async def settle(self, name: str, reconcile, arguments: dict):
+        """What a timed-out or cancelled side-effect tool actually did, or None."""
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._thread_pool, functools.partial(reconcile, **arguments)
+            )
+        except Exception as e:
+            print(f"Could not reconcile {name}: {e}")
+            return None
+
+    def spawn(self, call_id: str, coro) -> asyncio.Task:
+        """Run coro as a task tracked under call_id until it finishes."""
+        task = asyncio.create_task(coro)
+        self._tasks[call_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(call_id, None))
+        return task
+
+    def cancel_all(self) -> list:
+        """Cancel every in-flight tool call; returns their call ids."""
+        cancelled = []
+        for call_id, task in list(self._tasks.items()):
+            if not task.done():
+                task.cancel()
+                cancelled.append(call_id)
+        return cancelled
+
+
+def shutdown():
+    """Stop the shared thread pool without waiting for running tools."""
+    _thread_pool.shutdown(wait=False, cancel_futures=True)
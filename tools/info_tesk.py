@@ -1,9 +1,11 @@
 """InfoDesk-related tools."""
 
 from typing import Dict, Any
-import json
 from datetime import datetime
-from pathlib import Path
+from agents.definitions import ALLOWED_CAREER_FIELDS
+from handlers import codec
+from handlers.codec import RawJSON
+from tools.log_sink import log_sink
 
 # Mock data for each possible field
 MOCK_CAREER_DATA = {
@@ -45,22 +47,52 @@ MOCK_CAREER_DATA = {
 }
 
 
-async def lookupCareerInfo(requestedFields: str) -> Dict[str, Any]:
+def _build_field_fragments(profile: Dict[str, Any]) -> Dict[str, str]:
+    """Serialize each allowed profile field once as a '"name":value' JSON fragment."""
+    return {
+        field: codec.dumps(field) + ":" + codec.dumps(profile[field])
+        for field in ALLOWED_CAREER_FIELDS
+        if field in profile
+    }
+
+
+# Built once at import; lookups only join the fragments that were asked for
+CAREER_FIELD_FRAGMENTS = _build_field_fragments(MOCK_CAREER_DATA)
+
+
+async def lookupCareerInfo(requestedFields) -> RawJSON:
     """Retrieves requested career information fields.
 
     Args:
-        requestedFields: Comma-separated string of fields to look up
+        requestedFields: List (or comma-separated string) of fields to look up
 
     Returns:
-        Dict containing the requested career information fields and their values
-
-    Raises:
-        ValueError: If requestedFields is empty or contains invalid fields
+        JSON object with only the requested fields, already serialized. Fields
+        outside ALLOWED_CAREER_FIELDS are listed under "invalidFields".
 
     Example:
-        requestedFields = "role,experience,skills"
+        requestedFields = ["role", "experience", "skills"]
     """
-    return MOCK_CAREER_DATA
+    if isinstance(requestedFields, str):
+        requestedFields = requestedFields.split(",")
+    fields = list(dict.fromkeys(str(field).strip() for field in requestedFields or ()))
+    fields = [field for field in fields if field]
+    if not fields:
+        return RawJSON(
+            '{"error":"No fields requested","allowedFields":'
+            + codec.dumps(ALLOWED_CAREER_FIELDS)
+            + "}"
+        )
+
+    fragments = [
+        CAREER_FIELD_FRAGMENTS[field]
+        for field in fields
+        if field in CAREER_FIELD_FRAGMENTS
+    ]
+    invalid = [field for field in fields if field not in CAREER_FIELD_FRAGMENTS]
+    if invalid:
+        fragments.append('"invalidFields":' + codec.dumps(invalid))
+    return RawJSON("{" + ",".join(fragments) + "}")
 
 
 async def logRecruiterRequest(
@@ -74,10 +106,10 @@ async def logRecruiterRequest(
     interviewTimeline: str = None,
     interviewProcess: str = None,
 ) -> None:
-    """Logs the recruiter's information request to a text file
+    """Logs the recruiter's information request
 
     Creates a structured log entry containing all recruiter request details
-    in JSON format and appends it to a log file.
+    and queues it for the daily recruiter_requests JSONL file.
     """
     log_entry = {
         "timestamp": datetime.utcnow().isoformat(),
@@ -97,13 +129,4 @@ async def logRecruiterRequest(
         },
     }
 
-    # Ensure the logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-
-    # Use the current date for the log file name
-    log_file = log_dir / f"recruiter_requests_{datetime.now().strftime('%Y-%m-%d')}.txt"
-
-    # Append the log entry to the file
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+    log_sink.write("recruiter_requests", log_entry)
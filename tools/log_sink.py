@@ -0,0 +1,179 @@
+"""Buffered, non-blocking JSONL log writer shared by every call in the process.
+
+``write`` only serializes the record and queues it; a background task writes
+queued records in batches from a worker thread, so logging never blocks the
+event loop. Files are named ``<stream>_<YYYY-MM-DD>.jsonl`` and roll over to
+``<stream>_<YYYY-MM-DD>.<n>.jsonl`` once they reach ``max_bytes``.
+"""
+
+import os
+import time
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from config import (
+    LOG_DIR,
+    LOG_SINK_QUEUE_MAX,
+    LOG_SINK_BATCH_SIZE,
+    LOG_SINK_FLUSH_INTERVAL_S,
+    LOG_SINK_FSYNC,
+    LOG_SINK_FSYNC_INTERVAL_S,
+    LOG_SINK_MAX_BYTES,
+)
+from handlers import codec
+
+
+class JsonlLogSink:
+    """Bounded queue of JSONL records drained by one background writer.
+
+    When the queue is full new records are dropped (and counted) rather than
+    making the caller wait. ``fsync`` is "always" (after every batch),
+    "periodic" (at most every ``fsync_interval`` seconds, and once more on
+    close) or "never".
+    """
+
+    def __init__(
+        self,
+        directory=LOG_DIR,
+        max_queue: int = LOG_SINK_QUEUE_MAX,
+        batch_size: int = LOG_SINK_BATCH_SIZE,
+        flush_interval: float = LOG_SINK_FLUSH_INTERVAL_S,
+        fsync: str = LOG_SINK_FSYNC,
+        fsync_interval: float = LOG_SINK_FSYNC_INTERVAL_S,
+        max_bytes: int = LOG_SINK_MAX_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+        self._queue = None
+        self._task = None
+        self._closing = False
+        self._last_fsync = 0.0
+        # Files written since the last periodic fsync
+        self._unsynced = set()
+        # stream -> (date, rollover index) of the file currently written
+        self._files = {}
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+
+    def start(self):
+        """Start the writer task (call from a running event loop)."""
+        if self._task is None:
+            self._queue = asyncio.Queue(self.max_queue)
+            self._task = asyncio.create_task(self._run())
+
+    def write(self, stream: str, record: dict) -> bool:
+        """Queue record for <stream>'s log file. Returns False if it was dropped.
+
+        Must be called from the event loop thread.
+        """
+        if self._closing:
+            self.dropped += 1
+            return False
+        self.start()
+        try:
+            self._queue.put_nowait((stream, codec.dumps(record)))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                print(f"Log sink queue full, {self.dropped} records dropped so far")
+            return False
+        return True
+
+    async def close(self):
+        """Write everything still queued, then stop the writer."""
+        if self._task is None:
+            return
+        self._closing = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        print("Log sink stats:", self.stats())
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "queued": self._queue.qsize() if self._queue else 0,
+        }
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            # Give a burst a moment to accumulate into one write
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            stop = batch[-1] is None
+            records = [item for item in batch if item is not None]
+            if records or stop:
+                try:
+                    # The final batch is always synced, so close() leaves
+                    # nothing in the page cache
+                    await asyncio.to_thread(self._write_batch, records, stop)
+                except Exception as e:
+                    print(f"Log sink failed to write {len(records)} records: {e}")
+            if stop:
+                return
+
+    def _write_batch(self, records, final: bool = False):
+        by_stream = {}
+        for stream, line in records:
+            by_stream.setdefault(stream, []).append(line)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        sync = self.fsync == "always" or (
+            self.fsync == "periodic"
+            and (final or time.monotonic() - self._last_fsync >= self.fsync_interval)
+        )
+        for stream, lines in by_stream.items():
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            path = self._path_for(stream, len(data))
+            with open(path, "ab") as f:
+                f.write(data)
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._unsynced.discard(path)
+                elif self.fsync == "periodic":
+                    self._unsynced.add(path)
+        if sync:
+            # Earlier batches inside the interval may have gone to other files
+            for path in self._unsynced:
+                with open(path, "ab") as f:
+                    os.fsync(f.fileno())
+            self._unsynced.clear()
+            self._last_fsync = time.monotonic()
+        if records:
+            self.written += len(records)
+            self.batches += 1
+
+    def _path_for(self, stream: str, incoming: int) -> Path:
+        """Current file for stream, rolling over on a new day or at max_bytes."""
+        today = datetime.now().strftime("%Y-%m-%d")
+        date, index = self._files.get(stream, (today, 0))
+        if date != today:
+            date, index = today, 0
+        while True:
+            suffix = f".{index}" if index else ""
+            path = self.directory / f"{stream}_{date}{suffix}.jsonl"
+            size = path.stat().st_size if path.exists() else 0
+            if not size or size + incoming <= self.max_bytes:
+                break
+            index += 1
+        self._files[stream] = (date, index)
+        return path
+
+
+log_sink = JsonlLogSink()
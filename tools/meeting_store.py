@@ -0,0 +1,174 @@
+"""Durable, conflict-checked meeting bookings in SQLite.
+
+The database runs in WAL mode so the inbound and outbound services (and every
+tool thread in each) can book concurrently: each booking is one BEGIN
+IMMEDIATE transaction that holds SQLite's write lock while it checks for the
+call id, checks for overlaps and inserts. Meetings are capped at
+``MAX_MEETING_MINUTES``, so an overlap check is a range scan of the start-time
+index over ``[start - cap, end)`` instead of a table scan.
+
+Booking is idempotent: a request with an already-booked Realtime function
+``call_id``, or for the same participant email and time as an existing
+meeting (a model retry arrives under a new call id), returns the original
+meeting rather than creating a second one or reporting a conflict with it.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from datetime import datetime, timezone
+from config import MEETINGS_DB_PATH
+
+MAX_MEETING_MINUTES = 8 * 60
+BUSY_TIMEOUT_MS = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    call_id TEXT NOT NULL UNIQUE,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    date_time TEXT NOT NULL,
+    duration INTEGER NOT NULL,
+    format TEXT,
+    meeting_type TEXT,
+    participant_name TEXT,
+    participant_org TEXT,
+    participant_email TEXT,
+    notes TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS meetings_start_ts ON meetings (start_ts);
+"""
+
+
+class MeetingConflict(Exception):
+    """The requested time overlaps an existing meeting."""
+
+    def __init__(self, meeting: dict):
+        super().__init__(f"Overlaps the meeting at {meeting['date_time']}")
+        self.meeting = meeting
+
+
+class MeetingStore:
+    """SQLite-backed meeting bookings; one connection per thread."""
+
+    def __init__(self, path=MEETINGS_DB_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Transactions are managed explicitly (BEGIN IMMEDIATE)
+            conn = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            with self._init_lock:
+                if not self._initialized:
+                    conn.executescript(SCHEMA)
+                    self._initialized = True
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _find_existing(conn, call_id, participant_email, start_ts, end_ts):
+        row = conn.execute(
+            "SELECT * FROM meetings WHERE call_id = ?", (call_id,)
+        ).fetchone()
+        if row is None and participant_email:
+            row = conn.execute(
+                "SELECT * FROM meetings WHERE start_ts = ? AND end_ts = ? "
+                "AND participant_email = ? COLLATE NOCASE",
+                (start_ts, end_ts, participant_email.strip()),
+            ).fetchone()
+        return dict(row) if row is not None else None
+
+    @staticmethod
+    def _overlap_query(columns: str) -> str:
+        return (
+            f"SELECT {columns} FROM meetings "
+            "WHERE start_ts > ? AND start_ts < ? AND end_ts > ? "
+            "ORDER BY start_ts"
+        )
+
+    def book(self, call_id: str, start: datetime, duration: int, **details) -> tuple:
+        """Insert a meeting; returns (meeting, created).
+
+        ``created`` is False when call_id, or the same participant email and
+        time, was already booked; the original meeting is returned. Raises
+        MeetingConflict on overlap with any other meeting.
+        """
+        duration = int(duration)
+        if not 0 < duration <= MAX_MEETING_MINUTES:
+            raise ValueError(f"duration must be between 1 and {MAX_MEETING_MINUTES} minutes")
+        start_ts = int(start.timestamp())
+        end_ts = start_ts + duration * 60
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            existing = self._find_existing(
+                conn, call_id, details.get("participant_email"), start_ts, end_ts
+            )
+            if existing is not None:
+                conn.execute("COMMIT")
+                return existing, False
+            conflict = conn.execute(
+                self._overlap_query("*") + " LIMIT 1",
+                (start_ts - MAX_MEETING_MINUTES * 60, end_ts, start_ts),
+            ).fetchone()
+            if conflict is not None:
+                conn.execute("COMMIT")
+                raise MeetingConflict(dict(conflict))
+            meeting = {
+                "call_id": call_id,
+                "start_ts": start_ts,
+                "end_ts": end_ts,
+                "date_time": start.isoformat(),
+                "duration": duration,
+                "format": details.get("format"),
+                "meeting_type": details.get("meeting_type"),
+                "participant_name": details.get("participant_name"),
+                "participant_org": details.get("participant_org"),
+                "participant_email": (details.get("participant_email") or "").strip()
+                or None,
+                "notes": details.get("notes"),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            cursor = conn.execute(
+                f"INSERT INTO meetings ({', '.join(meeting)}) "
+                f"VALUES ({', '.join('?' * len(meeting))})",
+                tuple(meeting.values()),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        return {"id": cursor.lastrowid, **meeting}, True
+
+    def find(self, call_id: str, participant_email: str, start: datetime, duration: int):
+        """The meeting booked under call_id or for this participant and time, or None."""
+        start_ts = int(start.timestamp())
+        return self._find_existing(
+            self._connect(), call_id, participant_email, start_ts, start_ts + int(duration) * 60
+        )
+
+    def busy_between(self, start_ts: int, end_ts: int) -> list:
+        """(start_ts, end_ts) of booked meetings overlapping [start_ts, end_ts)."""
+        rows = self._connect().execute(
+            self._overlap_query("start_ts, end_ts"),
+            (start_ts - MAX_MEETING_MINUTES * 60, end_ts, start_ts),
+        )
+        return [tuple(row) for row in rows]
+
+
+# Each service process has its own store over the same database file
+meeting_store = MeetingStore()
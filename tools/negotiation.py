@@ -1,7 +1,8 @@
-import json
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, Any
+from tools.cache import cached_tool
+from tools.log_sink import log_sink
+from tools.salary_index import salary_benchmarks
 from config import CURRENT_OFFER_COMPANY
 from config import CURRENT_OFFER_ROLE
 from config import CURRENT_OFFER_SALARY
@@ -9,6 +10,7 @@ from config import CURRENT_OFFER_EQUITY
 from config import CURRENT_OFFER_SIGNING_BONUS
 
 
+@cached_tool()
 async def checkCurrentOffer(company: str, role: str) -> Dict[str, Any]:
     """Checks the details of the current offer."""
     return {
@@ -21,6 +23,7 @@ async def checkCurrentOffer(company: str, role: str) -> Dict[str, Any]:
     }
 
 
+@cached_tool()
 async def checkIndustrySalary(
     role: str, location: str, yearsOfExperience: int
 ) -> Dict[str, Any]:
@@ -32,15 +35,27 @@ async def checkIndustrySalary(
         yearsOfExperience: Years of experience in the role
 
     Returns:
-        The industry salary range for the given role in the given location for the given years of experience.
+        Base salary percentiles (p25/p50/p75/p90) from the local benchmark
+        dataset, with the role, location and experience band they were
+        matched to.
     """
     print(
         f"Checking industry salary for {role} in {location} for {yearsOfExperience} years of experience"
     )
+    index = await salary_benchmarks.get()
+    if index is None:
+        return {
+            "status": "unavailable",
+            "message": "Salary benchmark data unavailable",
+        }
+    benchmark = index.lookup(role, location, yearsOfExperience)
+    if benchmark is None:
+        return {
+            "status": "not_found",
+            "message": f"No salary benchmark available for {role} in {location}",
+        }
     return {
-        "salary_min": 200000,
-        "salary_max": 500000,
-        "salary_average": 350000,
+        **benchmark,
         "currency": "USD",
         "role": role,
         "location": location,
@@ -81,15 +96,8 @@ async def logFinalOffer(originalOffer: dict, finalOffer: dict, nextSteps: str) -
         "next_steps": nextSteps,
     }
 
-    # Ensure the logs directory exists
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
+    log_sink.write("negotiation_outcomes", log_entry)
 
-    # Use the current date for the log file name
-    log_file = (
-        log_dir / f"negotiation_outcomes_{datetime.now().strftime('%Y-%m-%d')}.txt"
-    )
 
-    # Append the log entry to the file
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(json.dumps(log_entry, ensure_ascii=False, indent=2) + "\n\n")
+# A reloaded dataset invalidates earlier answers
+salary_benchmarks.on_reload(checkIndustrySalary.cache.clear)
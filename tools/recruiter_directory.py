@@ -0,0 +1,275 @@
+"""In-memory recruiter directory behind verifyRecruiterCredentials.
+
+The directory is a CSV or JSONL file of known recruiters with ``full_name``,
+``company`` and optionally ``position`` (their own job title, returned with a
+match but not scored: the tool's ``position`` argument is the job being
+discussed). It is indexed as:
+
+- an exact map from normalized company to entry ids,
+- a trigram index over company names, for misspelled or abbreviated companies,
+- a trigram index over recruiter names (numpy postings), used when the
+  company can't be matched.
+
+A lookup scores only the entries of the best-matching companies, or the top
+trigram candidates, so it stays well under a millisecond at hundreds of
+thousands of entries. The file is polled and re-indexed in a worker thread
+when it changes. No file is configured by default; without one the tool
+reports the directory as unavailable and verifies nobody.
+"""
+
+import os
+import csv
+import json
+import asyncio
+import numpy as np
+from config import (
+    RECRUITER_DIRECTORY_PATH,
+    RECRUITER_DIRECTORY_POLL_S,
+    RECRUITER_MATCH_THRESHOLD,
+)
+
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "plc", "gmbh"}
+# Companies considered per lookup, and their minimum similarity
+MAX_COMPANY_MATCHES = 3
+MIN_COMPANY_SIMILARITY = 0.6
+# Name-only candidates scored when no company matches
+MAX_NAME_CANDIDATES = 50
+# Confidence = weighted similarity of name and company
+WEIGHTS = {"name": 0.65, "company": 0.35}
+
+
+def _normalize(text) -> str:
+    cleaned = "".join(c if c.isalnum() else " " for c in str(text or "").casefold())
+    return " ".join(cleaned.split())
+
+
+def normalize_company(company) -> str:
+    tokens = _normalize(company).split()
+    while len(tokens) > 1 and tokens[-1] in COMPANY_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    """Dice coefficient of two trigram sets."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+class RecruiterDirectory:
+    """Indexes over a list of {"full_name", "company", "position"} entries."""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self._name_grams = []
+        name_postings, by_company = {}, {}
+        for entry_id, entry in enumerate(entries):
+            grams = trigrams(_normalize(entry["full_name"]))
+            self._name_grams.append(grams)
+            for gram in grams:
+                name_postings.setdefault(gram, []).append(entry_id)
+            by_company.setdefault(normalize_company(entry["company"]), []).append(entry_id)
+        self._name_postings = {
+            gram: np.array(ids, dtype=np.int32) for gram, ids in name_postings.items()
+        }
+        self._by_company = {
+            company: np.array(ids, dtype=np.int32) for company, ids in by_company.items()
+        }
+        self._company_names = list(by_company)
+        self._company_codes = {company: code for code, company in enumerate(by_company)}
+        self._entry_company = np.zeros(len(entries), dtype=np.int32)
+        for company, ids in self._by_company.items():
+            self._entry_company[ids] = self._company_codes[company]
+        self._company_grams = {company: trigrams(company) for company in self._by_company}
+        self._company_postings = {}
+        for company, grams in self._company_grams.items():
+            for gram in grams:
+                self._company_postings.setdefault(gram, []).append(company)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def load(cls, path: str) -> "RecruiterDirectory":
+        entries = []
+        for row in _read_rows(path):
+            if row.get("full_name") and row.get("company"):
+                entries.append(
+                    {
+                        "full_name": row["full_name"].strip(),
+                        "company": row["company"].strip(),
+                        "position": (row.get("position") or "").strip(),
+                    }
+                )
+        return cls(entries)
+
+    def match_companies(self, company: str):
+        """[(normalized company, similarity)] best first, exact match alone."""
+        wanted = normalize_company(company)
+        if wanted in self._by_company:
+            return [(wanted, 1.0)]
+        grams = trigrams(wanted)
+        candidates = {c for gram in grams for c in self._company_postings.get(gram, ())}
+        scored = sorted(
+            ((c, similarity(grams, self._company_grams[c])) for c in candidates),
+            key=lambda item: -item[1],
+        )
+        return [
+            item for item in scored[:MAX_COMPANY_MATCHES] if item[1] >= MIN_COMPANY_SIMILARITY
+        ]
+
+    def _name_candidates(self, grams: frozenset, company: str = None) -> np.ndarray:
+        """Entries sharing the most name trigrams, optionally only at ``company``.
+
+        Trigrams shared by more than 2% of entries are skipped when rarer ones
+        exist; they add little signal and dominate the cost.
+        """
+        postings = [self._name_postings[g] for g in grams if g in self._name_postings]
+        if not postings:
+            return np.zeros(0, dtype=np.int32)
+        common = max(MAX_NAME_CANDIDATES, len(self.entries) // 50)
+        postings = [p for p in postings if len(p) <= common] or postings
+        hits = np.concatenate(postings)
+        if company is not None:
+            hits = hits[self._entry_company[hits] == self._company_codes[company]]
+        ids, counts = np.unique(hits, return_counts=True)
+        if len(ids) > MAX_NAME_CANDIDATES:
+            ids = ids[np.argpartition(-counts, MAX_NAME_CANDIDATES)[:MAX_NAME_CANDIDATES]]
+        return ids
+
+    def lookup(self, full_name: str, company: str) -> dict:
+        """Best-matching entry and its confidence (0-1), or None if nothing is close."""
+        name_grams = trigrams(_normalize(full_name))
+
+        companies = self.match_companies(company)
+        if companies:
+            candidates = []
+            for matched, company_score in companies:
+                entry_ids = self._by_company[matched]
+                if len(entry_ids) > MAX_NAME_CANDIDATES:
+                    entry_ids = self._name_candidates(name_grams, company=matched)
+                candidates.extend((int(entry_id), company_score) for entry_id in entry_ids)
+        else:
+            company_grams = trigrams(normalize_company(company))
+            candidates = [
+                (
+                    int(entry_id),
+                    similarity(
+                        company_grams,
+                        self._company_grams[self._company_names[self._entry_company[entry_id]]],
+                    ),
+                )
+                for entry_id in self._name_candidates(name_grams)
+            ]
+
+        best, best_scores = None, None
+        for entry_id, company_score in candidates:
+            scores = {
+                "name": similarity(name_grams, self._name_grams[entry_id]),
+                "company": company_score,
+            }
+            scores["confidence"] = sum(WEIGHTS[key] * scores[key] for key in WEIGHTS)
+            if best_scores is None or scores["confidence"] > best_scores["confidence"]:
+                best, best_scores = entry_id, scores
+        if best is None:
+            return None
+        return {
+            "entry": self.entries[best],
+            **{key: round(value, 3) for key, value in best_scores.items()},
+        }
+
+
+class RecruiterDirectoryWatcher:
+    """Holds the current RecruiterDirectory and re-indexes it when the file changes."""
+
+    def __init__(
+        self,
+        path: str = RECRUITER_DIRECTORY_PATH,
+        poll_interval: float = RECRUITER_DIRECTORY_POLL_S,
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.directory = None
+        self._mtime = None
+        self._load_task = None
+        self._watch_task = None
+        self._reload_callbacks = []
+
+    def on_reload(self, callback):
+        """Call callback() after every reload (e.g. to clear cached lookups)."""
+        self._reload_callbacks.append(callback)
+
+    def start(self):
+        """Load in the background and start watching (call from a running event loop)."""
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._reload())
+        if self.path and self.poll_interval and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def get(self):
+        """The current directory, or None if the file is missing or unreadable."""
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._reload())
+        await asyncio.shield(self._load_task)
+        return self.directory
+
+    async def close(self):
+        if self._watch_task:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+    def _current_mtime(self):
+        if not self.path:
+            return None
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self._current_mtime() != self._mtime:
+                await self._reload()
+
+    async def _reload(self):
+        mtime = self._current_mtime()
+        if mtime is None:
+            if self.path:
+                print(f"Recruiter directory not found at {self.path}")
+            self.directory, self._mtime = None, None
+        else:
+            try:
+                directory = await asyncio.to_thread(RecruiterDirectory.load, self.path)
+            except Exception as e:
+                # Keep serving the previous directory until the file changes again
+                print(f"Failed to load recruiter directory {self.path}: {e}")
+                self._mtime = mtime
+                return
+            self.directory, self._mtime = directory, mtime
+            print(f"Loaded recruiter directory: {len(directory)} entries")
+        for callback in self._reload_callbacks:
+            callback()
+
+
+def is_verified(match) -> bool:
+    return match is not None and match["confidence"] >= RECRUITER_MATCH_THRESHOLD
+
+
+recruiter_directory = RecruiterDirectoryWatcher()
@@ -0,0 +1,319 @@
+"""Indexed compensation benchmarks behind checkIndustrySalary.
+
+The dataset is a CSV or JSONL file of individual data points with
+``role``, ``location``, ``years_of_experience`` and ``base_salary``. It is
+compiled once into one float32 array of salaries, sorted within each
+(role, location, experience band) group, plus a JSON map of group offsets.
+Both are cached next to the dataset; the array is memory-mapped on later
+loads, so even millions of rows cost little at startup. A query is a dict
+lookup and four interpolated reads from a sorted slice.
+
+Every row is also indexed under location "*" so a role can fall back to its
+all-locations benchmark.
+"""
+
+import os
+import csv
+import json
+import difflib
+import asyncio
+from bisect import bisect_right
+import numpy as np
+from config import SALARY_DATASET_PATH
+
+INDEX_VERSION = 1
+PERCENTILES = (25, 50, 75, 90)
+ANY_LOCATION = "*"
+
+# Lower bounds of the experience bands, in years
+EXPERIENCE_BANDS = (0, 2, 5, 8, 12, 16)
+EXPERIENCE_BAND_LABELS = ("0-1", "2-4", "5-7", "8-11", "12-15", "16+")
+
+ROLE_ABBREVIATIONS = {
+    "sr": "senior",
+    "jr": "junior",
+    "swe": "software engineer",
+    "sde": "software engineer",
+    "eng": "engineer",
+    "engr": "engineer",
+    "dev": "developer",
+    "mgr": "manager",
+    "ml": "machine learning",
+    "ai": "machine learning",
+    "pm": "product manager",
+    "em": "engineering manager",
+    "ds": "data scientist",
+    "sre": "site reliability engineer",
+}
+SENIORITY_WORDS = {"senior", "staff", "principal", "lead", "junior", "intern"}
+
+LOCATION_ALIASES = {
+    "sf": "san francisco",
+    "bay area": "san francisco",
+    "san francisco bay area": "san francisco",
+    "nyc": "new york",
+    "new york city": "new york",
+    "la": "los angeles",
+    "remote": ANY_LOCATION,
+    "anywhere": ANY_LOCATION,
+    "us": ANY_LOCATION,
+    "usa": ANY_LOCATION,
+    "united states": ANY_LOCATION,
+}
+# Metro areas without their own data borrow their nearest market's benchmark
+NEARBY_LOCATIONS = {
+    "oakland": "san francisco",
+    "san jose": "san francisco",
+    "palo alto": "san francisco",
+    "mountain view": "san francisco",
+    "sunnyvale": "san francisco",
+    "menlo park": "san francisco",
+    "brooklyn": "new york",
+    "jersey city": "new york",
+    "bellevue": "seattle",
+    "redmond": "seattle",
+    "cambridge": "boston",
+    "santa monica": "los angeles",
+}
+
+
+def _tokens(text: str):
+    cleaned = "".join(c if c.isalnum() else " " for c in str(text).casefold())
+    return cleaned.split()
+
+
+def normalize_role(role: str) -> str:
+    """Case-fold, strip punctuation and expand common abbreviations."""
+    return " ".join(ROLE_ABBREVIATIONS.get(token, token) for token in _tokens(role))
+
+
+def normalize_location(location: str) -> str:
+    """City part of a location, case-folded, with aliases resolved."""
+    city = " ".join(_tokens(str(location).split(",")[0]))
+    return LOCATION_ALIASES.get(city, city)
+
+
+def experience_band(years) -> int:
+    return max(bisect_right(EXPERIENCE_BANDS, float(years)) - 1, 0)
+
+
+def _read_rows(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+
+class SalaryIndex:
+    """Sorted salary slices keyed by (role, location, experience band)."""
+
+    def __init__(self, salaries: np.ndarray, groups: dict):
+        self.salaries = salaries
+        # "role|location|band" -> (start, end) into salaries
+        self.groups = groups
+        self.roles = sorted({key.split("|")[0] for key in groups})
+        self.locations = {key.split("|")[1] for key in groups}
+        self._role_set = set(self.roles)
+
+    @classmethod
+    def build(cls, path: str) -> "SalaryIndex":
+        """Compile the dataset at path into an index."""
+        roles, locations, bands, salaries = [], [], [], []
+        for row in _read_rows(path):
+            try:
+                salary = float(row["base_salary"])
+                band = experience_band(row["years_of_experience"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            role = normalize_role(row.get("role", ""))
+            location = normalize_location(row.get("location", ""))
+            for loc in {location, ANY_LOCATION}:
+                roles.append(role)
+                locations.append(loc)
+                bands.append(band)
+                salaries.append(salary)
+
+        if not salaries:
+            return cls(np.zeros(0, dtype=np.float32), {})
+
+        keys = np.array(
+            [f"{r}|{l}|{b}" for r, l, b in zip(roles, locations, bands)], dtype=object
+        )
+        key_ids, key_index = np.unique(keys, return_inverse=True)
+        values = np.asarray(salaries, dtype=np.float32)
+        # Group by key, salaries ascending within each group
+        order = np.lexsort((values, key_index))
+        counts = np.bincount(key_index, minlength=len(key_ids))
+        ends = np.cumsum(counts)
+        groups = {
+            str(key): (int(end - count), int(end))
+            for key, count, end in zip(key_ids, counts, ends)
+        }
+        return cls(values[order], groups)
+
+    @classmethod
+    def load(cls, path: str) -> "SalaryIndex":
+        """Load the cached index for path, rebuilding it if the dataset changed."""
+        array_path, groups_path = path + ".index.npy", path + ".index.json"
+        mtime = os.path.getmtime(path)
+        try:
+            with open(groups_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["version"] == INDEX_VERSION and meta["source_mtime"] == mtime:
+                salaries = np.load(array_path, mmap_mode="r")
+                groups = {key: tuple(span) for key, span in meta["groups"].items()}
+                return cls(salaries, groups)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        index = cls.build(path)
+        try:
+            np.save(array_path, index.salaries)
+            with open(groups_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"version": INDEX_VERSION, "source_mtime": mtime, "groups": index.groups},
+                    f,
+                )
+        except OSError as e:
+            print(f"Could not cache salary index next to {path}: {e}")
+        return index
+
+    def match_role(self, role: str):
+        """Closest role in the dataset, or None."""
+        wanted = normalize_role(role)
+        candidates = [wanted]
+        stripped = " ".join(t for t in wanted.split() if t not in SENIORITY_WORDS)
+        if stripped and stripped != wanted:
+            candidates.append(stripped)
+        for candidate in candidates:
+            if candidate in self._role_set:
+                return candidate
+        for candidate in candidates:
+            close = difflib.get_close_matches(candidate, self.roles, n=1, cutoff=0.75)
+            if close:
+                return close[0]
+        return None
+
+    def location_chain(self, location: str):
+        """Locations to try for a query, nearest first, ending with all locations."""
+        wanted = normalize_location(location)
+        chain = [wanted]
+        nearby = NEARBY_LOCATIONS.get(wanted)
+        if nearby:
+            chain.append(nearby)
+        chain.append(ANY_LOCATION)
+        return [loc for loc in dict.fromkeys(chain) if loc in self.locations]
+
+    def _percentile(self, start: int, end: int, q: float) -> float:
+        position = (end - start - 1) * q / 100
+        low = int(position)
+        high = min(low + 1, end - start - 1)
+        a, b = float(self.salaries[start + low]), float(self.salaries[start + high])
+        return a + (b - a) * (position - low)
+
+    def lookup(self, role: str, location: str, years_of_experience) -> dict:
+        """Salary percentiles for the best-matching (role, location, band), or None."""
+        matched_role = self.match_role(role)
+        if matched_role is None:
+            return None
+        band = experience_band(years_of_experience)
+        # Nearest experience band first
+        band_order = sorted(range(len(EXPERIENCE_BANDS)), key=lambda b: (abs(b - band), b))
+        for loc in self.location_chain(location):
+            for candidate_band in band_order:
+                span = self.groups.get(f"{matched_role}|{loc}|{candidate_band}")
+                if span:
+                    start, end = span
+                    result = {
+                        f"p{q}": round(self._percentile(start, end, q))
+                        for q in PERCENTILES
+                    }
+                    result.update(
+                        {
+                            "matched_role": matched_role,
+                            "matched_location": "all locations"
+                            if loc == ANY_LOCATION
+                            else loc,
+                            "experience_band": EXPERIENCE_BAND_LABELS[candidate_band],
+                            "sample_size": end - start,
+                        }
+                    )
+                    return result
+        return None
+
+
+class LazySalaryIndex:
+    """Loads the SalaryIndex in a worker thread on first use (or on warm()).
+
+    The dataset is reloaded when its mtime changes, and retried on the next
+    use while it is missing or failed to load.
+    """
+
+    def __init__(self, path: str = SALARY_DATASET_PATH):
+        self.path = path
+        self.index = None
+        self._mtime = None
+        self._loaded = False
+        self._task = None
+        self._lock = asyncio.Lock()
+        self._reload_callbacks = []
+
+    def on_reload(self, callback):
+        """Call callback() after every reload (e.g. to clear cached lookups)."""
+        self._reload_callbacks.append(callback)
+
+    def warm(self):
+        """Start loading in the background (call from a running event loop)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.refresh())
+
+    async def get(self):
+        """The loaded index, or None if the dataset is missing or unreadable."""
+        await self.refresh()
+        return self.index
+
+    def _current_mtime(self):
+        if not self.path:
+            return None
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+    def _is_current(self, mtime) -> bool:
+        return self._loaded and self.index is not None and mtime == self._mtime
+
+    async def refresh(self):
+        """Reload the dataset in a worker thread if it changed or isn't loaded."""
+        if not self.path:
+            return
+        mtime = self._current_mtime()
+        if self._is_current(mtime):
+            return
+        async with self._lock:
+            if not self._is_current(mtime):
+                self.index = await asyncio.to_thread(self._load)
+                self._mtime, self._loaded = mtime, True
+                for callback in self._reload_callbacks:
+                    callback()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            print(f"Salary dataset not found at {self.path}")
+            return None
+        try:
+            index = SalaryIndex.load(self.path)
+        except Exception as e:
+            print(f"Failed to load salary dataset {self.path}: {e}")
+            return None
+        print(
+            f"Loaded salary benchmarks: {len(index.salaries)} points, "
+            f"{len(index.groups)} groups"
+        )
+        return index
+
+
+salary_benchmarks = LazySalaryIndex()
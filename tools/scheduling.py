@@ -1,3 +1,10 @@
+import asyncio
+from datetime import datetime
+from typing import Dict, Any
+from tools.availability import candidate_calendar, resolve_timezone, parse_suggestion
+from tools.meeting_store import meeting_store, MeetingConflict
+
+
 async def returnAvailableDateTime(
     suggestedDates: list[str] = None,
     duration: int = 45,
@@ -11,18 +18,43 @@ async def returnAvailableDateTime(
         timeZone: Timezone for the meeting (default: America/Los_Angeles)
 
     Returns:
-        List of available datetime strings in ISO format
+        List of available datetime strings in ISO format, in timeZone. Free
+        suggested dates/times come first; if none are free, the earliest
+        open slots in the window are returned instead.
     """
+    await candidate_calendar.refresh()
+    tz = resolve_timezone(timeZone, candidate_calendar.tz)
+    duration = int(duration or 45)
+
+    window_start, window_end = candidate_calendar.window()
+    booked = await asyncio.to_thread(meeting_store.busy_between, window_start, window_end)
+
+    def not_booked(start):
+        begin = int(start.timestamp())
+        end = begin + duration * 60
+        return all(e <= begin or s >= end for s, e in booked)
+
+    slots = []
     if suggestedDates:
-        return suggestedDates[0]
-    return [
-        "2024-03-22T09:00:00-15:00",
-        "2024-03-22T10:30:00-13:00",
-        "2024-04-05T09:30:00-15:00",
-    ]
+        suggestions = [parse_suggestion(value, tz) for value in suggestedDates]
+        days = sorted({s for s in suggestions if s is not None and not isinstance(s, datetime)})
+        slots = [
+            s
+            for s in suggestions
+            if isinstance(s, datetime)
+            and candidate_calendar.is_available(s, duration)
+            and not_booked(s)
+        ]
+        if days:
+            slots.extend(
+                candidate_calendar.free_slots(duration, days=days, also_busy=booked)
+            )
+    if not slots:
+        slots = candidate_calendar.free_slots(duration, also_busy=booked)
+    return [slot.astimezone(tz).isoformat() for slot in slots]
 
 
-async def scheduleMeeting(
+def scheduleMeeting(
     dateTime: str,
     duration: int,
     format: str,
@@ -31,9 +63,12 @@ async def scheduleMeeting(
     participantEmail: str,
     meetingType: str,
     notes: str = None,
-) -> None:
+    call_id: str = None,
+) -> Dict[str, Any]:
     """Schedules a meeting at the given date and time.
 
+    Blocking (SQLite); runs in the tool executor's thread pool.
+
     Args:
         dateTime: Date and time in ISO format
         duration: Meeting duration in minutes
@@ -42,7 +77,75 @@ async def scheduleMeeting(
         participantOrg: Meeting participant's organization (if applicable)
         participantEmail: Meeting participant's email
         meetingType: Type of meeting
+        notes: Optional notes for the invite
+        call_id: Realtime function call id, supplied by the handler. Repeating
+            a call id, or the participant email and time, returns the original
+            booking
+
+    Returns:
+        The booking status, and the meeting or the one it conflicts with
     """
-    print(
-        f"Scheduling {format} {meetingType} meeting between you and {participantName} (email: {participantEmail}) for {dateTime} for {duration} minutes"
-    )
+    start = _meeting_start(dateTime)
+    if not candidate_calendar.index.is_free(
+        int(start.timestamp()), int(start.timestamp()) + int(duration) * 60
+    ):
+        return {
+            "status": "conflict",
+            "message": f"The candidate is busy at {dateTime}",
+        }
+    try:
+        meeting, created = meeting_store.book(
+            call_id or f"{participantEmail}|{start.isoformat()}",
+            start,
+            duration,
+            format=format,
+            meeting_type=meetingType,
+            participant_name=participantName,
+            participant_org=participantOrg,
+            participant_email=participantEmail,
+            notes=notes,
+        )
+    except MeetingConflict as e:
+        return {
+            "status": "conflict",
+            "message": str(e),
+            "conflicting_meeting": {
+                "dateTime": e.meeting["date_time"],
+                "duration": e.meeting["duration"],
+            },
+        }
+    if created:
+        print(
+            f"Scheduling {format} {meetingType} meeting between you and {participantName} (email: {participantEmail}) for {dateTime} for {duration} minutes"
+        )
+    return _meeting_result(meeting, "scheduled" if created else "already_scheduled")
+
+
+def find_scheduled_meeting(
+    dateTime: str, duration: int, participantEmail: str, call_id: str = None, **_
+):
+    """scheduleMeeting's result if that booking is in the store, else None.
+
+    Checked when a scheduleMeeting call timed out or was cancelled, since its
+    thread may have committed the booking anyway.
+    """
+    meeting = meeting_store.find(call_id, participantEmail, _meeting_start(dateTime), duration)
+    return _meeting_result(meeting, "scheduled") if meeting else None
+
+
+def _meeting_start(dateTime: str) -> datetime:
+    start = datetime.fromisoformat(dateTime.replace("Z", "+00:00"))
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=candidate_calendar.tz)
+    return start
+
+
+def _meeting_result(meeting: dict, status: str) -> Dict[str, Any]:
+    return {
+        "status": status,
+        "meetingId": meeting["id"],
+        "dateTime": meeting["date_time"],
+        "duration": meeting["duration"],
+        "format": meeting["format"],
+        "meetingType": meeting["meeting_type"],
+    }